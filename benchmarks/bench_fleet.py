@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# 机械臂集群控制的规模测试: 1~50 台模拟机械臂, 统计线程数、空闲 CPU、广播延迟与采集 CPU 占用
+# 模拟机械臂 (RobotArmSimulator) 运行在独立进程中, 本进程的 CPU 时间只包含集群控制本身
+# 运行: python benchmarks/bench_fleet.py
+import json
+import time
+import asyncio
+import threading
+import multiprocessing
+
+from blinx_robots.robot_arm_fleet import RobotArmFleet
+from blinx_robots.robot_arm_simulator import RobotArmSimulator
+
+ARM_COUNTS = [1, 5, 10, 20, 50]
+TELEMETRY_RATE = 20.0
+
+
+def run_servers(count, port_queue):
+    async def main():
+        simulators = [RobotArmSimulator(time_scale=0.0) for _ in range(count)]
+        port_queue.put([(await simulator.start())[1] for simulator in simulators])
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+async def measure(ports):
+    fleet = RobotArmFleet(command_timeout=5)
+    for i, port in enumerate(ports):
+        fleet.add_arm(f"arm{i}", '127.0.0.1', port)
+    async with fleet:
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        await asyncio.sleep(1.0)
+        idle_cpu = (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+
+        latencies = []
+        for _ in range(20):
+            start = time.perf_counter()
+            await fleet.broadcast("set_joint_degree_synchronize", 0, 0, 0, 0, 0, 0)
+            latencies.append(time.perf_counter() - start)
+        latencies.sort()
+
+        fleet.start_telemetry(rate=TELEMETRY_RATE)
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        await asyncio.sleep(2.0)
+        telemetry_cpu = (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+        await fleet.stop_telemetry()
+        return {
+            "arms": len(ports),
+            "threads": threading.active_count(),
+            "idle_cpu_percent": round(idle_cpu * 100, 2),
+            "broadcast_p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+            "broadcast_max_ms": round(latencies[-1] * 1000, 3),
+            "telemetry_cpu_percent": round(telemetry_cpu * 100, 2),
+            "telemetry_cpu_percent_per_arm": round(telemetry_cpu * 100 / len(ports), 3),
+        }
+
+
+def main():
+    results = []
+    for count in ARM_COUNTS:
+        port_queue = multiprocessing.Queue()
+        server_process = multiprocessing.Process(target=run_servers, args=(count, port_queue), daemon=True)
+        server_process.start()
+        try:
+            result = asyncio.run(measure(port_queue.get(timeout=10)))
+        finally:
+            server_process.terminate()
+            server_process.join()
+        results.append(result)
+        print(json.dumps(result, ensure_ascii=False))
+    return results
+
+
+if __name__ == '__main__':
+    main()
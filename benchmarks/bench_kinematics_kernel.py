@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# 对比预先展开的正解 / 雅可比内核与 roboticstoolbox 的计算耗时
+# 运行: python benchmarks/bench_kinematics_kernel.py
+import timeit
+
+import numpy as np
+
+from blinx_robots import robot_arm_kinematics as kinematics
+from blinx_robots.robot_arm_module import BlinxRobotArm, BlinxRobotArmDH
+
+
+def per_call_us(func, number):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for robot in (BlinxRobotArm(), BlinxRobotArmDH()):
+        q = rng.uniform(robot.qlim[0], robot.qlim[1], size=robot.n)
+        qs = rng.uniform(robot.qlim[0], robot.qlim[1], size=(10000, robot.n))
+        kinematics.chain_kernel(robot)
+
+        rows = [
+            ("fkine 单次", per_call_us(lambda: robot.fkine(q), 2000), per_call_us(lambda: robot.fkine_fast(q), 2000)),
+            ("jacob0 单次", per_call_us(lambda: robot.jacob0(q), 2000), per_call_us(lambda: robot.jacob0_fast(q), 2000)),
+            ("positive_solution 单次",
+             per_call_us(lambda: robot.fkine(q).rpy(order="zyx"), 2000),
+             per_call_us(lambda: kinematics.positive_solution(robot, np.degrees(q)), 2000)),
+            ("fkine 10000 组 (每组)",
+             per_call_us(lambda: [robot.fkine(x) for x in qs[:1000]], 1) / 1000,
+             per_call_us(lambda: robot.fkine_fast(qs), 3) / len(qs)),
+            ("jacob0 10000 组 (每组)",
+             per_call_us(lambda: [robot.jacob0(x) for x in qs[:1000]], 1) / 1000,
+             per_call_us(lambda: robot.jacob0_fast(qs), 3) / len(qs)),
+        ]
+        print(type(robot).__name__)
+        print(f"  {'':<26}{'toolbox(us)':>12}{'kernel(us)':>12}{'加速比':>8}")
+        for name, baseline, kernel in rows:
+            print(f"  {name:<26}{baseline:>12.2f}{kernel:>12.2f}{baseline / kernel:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
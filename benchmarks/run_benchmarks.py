@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+# SDK 性能基准测试: 导入耗时、正解、逆解 (成功率与耗时)、可达空间查询、伺服周期、命令编解码、与本地模拟器之间的往返延迟和吞吐量、急停发送耗时
+# 运行:
+#   python benchmarks/run_benchmarks.py                          # 输出结果并与 baseline.json 对比
+#   python benchmarks/run_benchmarks.py --output results.json    # 保存机器可读的结果
+#   python benchmarks/run_benchmarks.py --save-baseline          # 将本次结果保存为新的基线
+#   python benchmarks/run_benchmarks.py --add-missing            # 只把基线中缺少的指标加入基线, 已有的基线值不变
+# 存在超出容差的性能回退或基线中缺少的指标时以退出码 1 结束, 可直接用于 CI
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+
+import numpy as np
+
+from blinx_robots.robot_arm_interface import BlxRobotArm
+from blinx_robots.robot_arm_communication import SocketCommunication, FrameBuffer, encode_command
+from blinx_robots.robot_arm_simulator import RobotArmSimulator
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def metric(value, unit: str, better: str = "lower") -> dict:
+    return {"value": round(float(value), 4), "unit": unit, "better": better}
+
+
+def timings_us(func, args_list) -> np.ndarray:
+    timings = np.empty(len(args_list))
+    for i, args in enumerate(args_list):
+        start = time.perf_counter()
+        func(*args)
+        timings[i] = time.perf_counter() - start
+    return timings * 1e6
+
+
+def sample_joint_degrees(robot_model, count: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.degrees(rng.uniform(robot_model.qlim[0], robot_model.qlim[1], size=(count, robot_model.n)))
+
+
+def bench_import(repeats: int) -> dict:
+    """在新的解释器中导入 SDK 并创建 BlxRobotArm 的耗时, 不加载运动学模块"""
+    probe = (
+        "import time; start = time.perf_counter(); "
+        "from blinx_robots.robot_arm_interface import BlxRobotArm; "
+        "from blinx_robots.robot_arm_communication import SocketCommunication; "
+        "BlxRobotArm(SocketCommunication('127.0.0.1', 1234)); "
+        "print(time.perf_counter() - start)"
+    )
+    timings = [
+        float(subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout)
+        for _ in range(repeats)
+    ]
+    return {"import_ms_median": metric(np.median(timings) * 1e3, "ms")}
+
+
+def bench_kinematics(robot: BlxRobotArm, samples: int) -> dict:
+    joint_degrees = sample_joint_degrees(robot.blinx_robot_arm, samples)
+    robot.get_positive_solution(*joint_degrees[0])  # 预热, 加载运动学模块
+
+    fk_us = timings_us(lambda *q: robot.get_positive_solution(*q), joint_degrees.tolist())
+    # 批量正解的单位耗时与批量大小有关, 固定使用 10000 组关节角
+    batch_joint_degrees = sample_joint_degrees(robot.blinx_robot_arm, 10000, seed=1)
+    batch_start = time.perf_counter()
+    robot.get_positive_solution_batch(batch_joint_degrees)
+    batch_us = (time.perf_counter() - batch_start) * 1e6 / len(batch_joint_degrees)
+    poses = robot.get_positive_solution_batch(joint_degrees)
+
+    # 逆解: 工作空间内随机采样的可达位姿, 不提供参考关节角, 以正解校验结果
+    ik_results = []
+
+    def solve(*pose):
+        ik_results.append(json.loads(robot.get_inverse_solution(*pose)).get('data'))
+
+    ik_us = timings_us(solve, poses.tolist())
+    solved = [
+        i for i, q in enumerate(ik_results)
+        if q and np.allclose(robot.get_positive_solution_batch([q])[0, :3], poses[i, :3], atol=1e-4)
+    ]
+    return {
+        "fk_us_median": metric(np.median(fk_us), "us"),
+        "fk_us_p95": metric(np.percentile(fk_us, 95), "us"),
+        "fk_batch_us_per_pose": metric(batch_us, "us"),
+        "ik_success_rate": metric(len(solved) / samples, "ratio", "higher"),
+        "ik_us_median": metric(np.median(ik_us), "us"),
+        "ik_us_p95": metric(np.percentile(ik_us, 95), "us"),
+    }
+
+
+def bench_workspace(queries: int) -> dict:
+    """可达空间索引单次查询 (位置与接近方向) 的耗时"""
+    from blinx_robots import robot_arm_kinematics as kinematics
+    from blinx_robots.robot_arm_module import BlinxRobotArm
+    from blinx_robots.robot_arm_workspace import WorkspaceIndex, build_workspace_index
+
+    robot_model = BlinxRobotArm()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "workspace.npy")
+        build_workspace_index(robot_model, path, samples=400_000, voxel_size=0.02, seed=0)
+        index = WorkspaceIndex.load(path)
+        poses = kinematics.batch_positive_solution(robot_model, sample_joint_degrees(robot_model, queries, seed=2)).tolist()
+        query_us = timings_us(index.pose_reachable, [(pose,) for pose in poses])
+        del index
+    return {"workspace_query_us_median": metric(np.median(query_us), "us")}
+
+
+def bench_servo(steps: int) -> dict:
+    """笛卡尔伺服单个控制周期的关节增量计算耗时"""
+    from blinx_robots import robot_arm_kinematics as kinematics
+    from blinx_robots.robot_arm_module import BlinxRobotArm
+    from blinx_robots.robot_arm_servo import servo_step
+
+    robot_model = BlinxRobotArm()
+    kernel = kinematics.chain_kernel(robot_model)
+    qlim, speed = np.asarray(robot_model.qlim), np.radians(np.full(robot_model.n, 90.0))
+    q = np.radians(sample_joint_degrees(robot_model, steps, seed=3))
+    twist = np.array([0.02, -0.01, 0.03, 0.0, 0.1, 0.0])
+    step_us = timings_us(lambda x: servo_step(kernel, x, twist, 0.01, qlim, speed, limit_margin=np.radians(1.0)), [(x,) for x in q])
+    return {"servo_step_us_median": metric(np.median(step_us), "us")}
+
+
+def bench_codec(messages: int) -> dict:
+    payload = [50, 10.5, -20.25, 30.0, 40.125, -50.0, 60.5]
+    start = time.perf_counter()
+    for _ in range(messages):
+        encode_command("set_joint_angle_all_time", payload)
+    encode_us = (time.perf_counter() - start) * 1e6 / messages
+
+    # 回复流按 1460 字节 (典型 TCP 报文段) 切块写入, 覆盖半帧拼接
+    stream = json.dumps({"command": "get_joint_angle_all", "data": payload[1:]}).encode('utf-8') + b'\r\n'
+    stream *= messages
+    chunks = [stream[i:i + 1460] for i in range(0, len(stream), 1460)]
+    frame_buffer, decoded = FrameBuffer(), 0
+    start = time.perf_counter()
+    for chunk in chunks:
+        frame_buffer.feed(chunk)
+        for frame in frame_buffer.frames():
+            json.loads(frame)
+            decoded += 1
+    decode_us = (time.perf_counter() - start) * 1e6 / decoded
+    return {
+        "encode_us_per_message": metric(encode_us, "us"),
+        "decode_us_per_message": metric(decode_us, "us"),
+    }
+
+
+def bench_round_trip(requests: int, batch_size: int, latency: float) -> dict:
+    with RobotArmSimulator(time_scale=0.0, latency=latency) as simulator:
+        robot = BlxRobotArm(SocketCommunication(simulator.host, simulator.port), command_timeout=10)
+        robot.start_communication()
+        try:
+            robot.get_joint_degree_all()  # 预热, 建立连接
+            rtt_us = timings_us(robot.get_joint_degree_all, [()] * requests)
+
+            start = time.perf_counter()
+            for i in range(batch_size // 10):
+                robot.set_joint_degree_synchronize(i % 90, 0, 0, 0, 0, 0)
+            blocking_rate = (batch_size // 10) / (time.perf_counter() - start)
+
+            commands = [("set_joint_angle_all_time", [50, i % 90, 0, 0, 0, 0, 0]) for i in range(batch_size)]
+            start = time.perf_counter()
+            result = robot.wait_all(robot.submit_batch(commands))
+            pipelined_rate = batch_size / (time.perf_counter() - start)
+            if not result["status"]:
+                raise RuntimeError(f"批量命令执行失败: {result['failed_index']}")
+        finally:
+            robot.end_communication()
+            robot.task_executor.shutdown()
+    return {
+        "round_trip_us_median": metric(np.median(rtt_us), "us"),
+        "round_trip_us_p95": metric(np.percentile(rtt_us, 95), "us"),
+        "blocking_commands_per_second": metric(blocking_rate, "1/s", "higher"),
+        "pipelined_commands_per_second": metric(pipelined_rate, "1/s", "higher"),
+    }
+
+
+def bench_emergency_stop(triggers: int) -> dict:
+    """命令连接满负荷时, 通过专用急停通道发送急停帧的耗时"""
+    with RobotArmSimulator(time_scale=0.0) as simulator:
+        robot = BlxRobotArm(SocketCommunication(simulator.host, simulator.port), command_timeout=10)
+        robot.start_communication()
+        busy = threading.Event()
+
+        def flood():
+            while not busy.is_set():
+                robot.wait_all(robot.submit_batch([("set_joint_angle_all_time", [50, 1, 0, 0, 0, 0, 0])] * 200))
+
+        try:
+            if not robot.enable_emergency_stop_channel(heartbeat_interval=0.2):
+                raise RuntimeError("急停通道连接失败")
+            flood_thread = threading.Thread(target=flood)
+            flood_thread.start()
+            latencies = []
+            try:
+                for _ in range(triggers):
+                    if not robot.emergency_stop_channel.trigger():
+                        raise RuntimeError("急停帧发送失败")
+                    latencies.append(robot.emergency_stop_channel.last_latency)
+                    time.sleep(0.001)
+            finally:
+                busy.set()
+                flood_thread.join()
+        finally:
+            robot.end_communication()
+            robot.task_executor.shutdown()
+    latencies_us = np.array(latencies) * 1e6
+    return {
+        "estop_trigger_us_median": metric(np.median(latencies_us), "us"),
+        "estop_trigger_us_max": metric(np.max(latencies_us), "us"),
+    }
+
+
+def run(quick: bool = False) -> dict:
+    robot = BlxRobotArm(None)
+    scale = 0.2 if quick else 1.0
+    metrics = {}
+    metrics.update(bench_import(3 if quick else 10))
+    metrics.update(bench_kinematics(robot, int(500 * scale)))
+    metrics.update(bench_workspace(int(2000 * scale)))
+    metrics.update(bench_servo(int(2000 * scale)))
+    metrics.update(bench_codec(int(20000 * scale)))
+    metrics.update(bench_round_trip(int(1000 * scale), int(2000 * scale), latency=0.0))
+    metrics.update(bench_emergency_stop(int(500 * scale)))
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "metrics": metrics,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float):
+    """对比基线
+
+    :return: (超出容差的回退项 [(名称, 基线值, 当前值, 变化比例)], 基线中缺少的指标名称)
+    """
+    regressions, missing = [], []
+    for name, current in results["metrics"].items():
+        previous = baseline.get("metrics", {}).get(name)
+        if previous is None:
+            missing.append(name)
+            continue
+        if previous["value"] == 0:
+            continue
+        change = current["value"] / previous["value"] - 1.0
+        worse = change > tolerance if current["better"] == "lower" else change < -tolerance
+        if worse:
+            regressions.append((name, previous["value"], current["value"], change))
+    return regressions, missing
+
+
+def add_missing(results: dict, baseline: dict) -> list:
+    """将基线中缺少的指标加入基线, 已有的基线值不变
+
+    :return: 新加入的指标名称
+    """
+    metrics = baseline.setdefault("metrics", {})
+    added = [name for name in results["metrics"] if name not in metrics]
+    for name in added:
+        metrics[name] = results["metrics"][name]
+    return added
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="比邻星机械臂 SDK 性能基准测试")
+    parser.add_argument("--output", help="结果 JSON 文件")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="基线 JSON 文件")
+    parser.add_argument("--save-baseline", action="store_true", help="将本次结果保存为基线")
+    parser.add_argument("--add-missing", action="store_true", help="只把基线中缺少的指标加入基线")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="允许的性能变化比例, 默认 25%%")
+    parser.add_argument("--quick", action="store_true", help="减少采样数量, 用于快速检查")
+    args = parser.parse_args(argv)
+
+    results = run(args.quick)
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"基线已保存: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"基线文件不存在: {args.baseline}")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if args.add_missing:
+        added = add_missing(results, baseline)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+        print(f"已加入基线: {', '.join(added) if added else '无'}")
+    regressions, missing = compare(results, baseline, args.tolerance)
+    for name, previous, current, change in regressions:
+        print(f"性能回退: {name} {previous} -> {current} ({change:+.1%})")
+    for name in missing:
+        print(f"没有基线: {name}, 使用 --add-missing 加入基线或 --save-baseline 重新生成基线")
+    if not regressions and not missing:
+        print("与基线相比没有超出容差的性能回退")
+    return 1 if regressions or missing else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
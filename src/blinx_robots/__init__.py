@@ -0,0 +1,19 @@
+from loguru import logger
+
+# SDK 默认不输出日志, 也不在当前目录创建日志文件, 需要时调用 configure_logging
+logger.disable("blinx_robots")
+
+
+def configure_logging(log_file: str = "robot_arm_interface.log", level: str = "DEBUG", rotation: str = "10 MB", compression: str = "zip") -> int:
+    """开启 SDK 日志, 并输出到日志文件
+
+    :param log_file: 日志文件路径, 为 None 时只开启日志, 不添加文件输出
+    :param level: 日志文件记录的最低等级
+    :param rotation: 日志文件切分大小
+    :param compression: 切分后日志文件的压缩格式
+    :return: 日志文件输出的 handler id, 可用 logger.remove(handler_id) 移除
+    """
+    logger.enable("blinx_robots")
+    if log_file is None:
+        return None
+    return logger.add(log_file, rotation=rotation, level=level, compression=compression, enqueue=True)
@@ -0,0 +1,311 @@
+import json
+import asyncio
+
+from loguru import logger
+
+from blinx_robots.robot_arm_communication import FrameBuffer, encode_command
+from blinx_robots.robot_arm_dispatcher import ResponseDispatcher
+
+
+class AsyncBlxRobotArm(object):
+    """比邻星六轴机械臂 asyncio API
+
+    与 BlxRobotArm 提供相同的命令集, 但所有收发都运行在调用方的事件循环中:
+    一条 asyncio 长连接, 一个接收协程, 等待中的命令不占用线程.
+    """
+
+    def __init__(self, host: str, port: int, command_timeout: float = None):
+        self.host = host
+        self.port = port
+        self.command_timeout = command_timeout  # 等待命令响应的超时时间, 单位:秒, None 表示一直等待
+        self.robot_cmd_model = "SEQ"
+        self.response_dispatcher = ResponseDispatcher()
+        self._blinx_robot_arm = None
+        self._reader = None
+        self._writer = None
+        self._receiver_task = None
+
+    @property
+    def blinx_robot_arm(self):
+        """机械臂运动学模型, 第一次使用时创建"""
+        if self._blinx_robot_arm is None:
+            from blinx_robots.robot_arm_module import BlinxRobotArm
+            self._blinx_robot_arm = BlinxRobotArm()
+        return self._blinx_robot_arm
+
+    async def start_communication(self) -> None:
+        """机械臂开始连接, 并启动接收协程"""
+        logger.warning("建立机械臂 asyncio 连接...")
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._receiver_task = asyncio.ensure_future(self.command_receiver())
+
+    async def end_communication(self) -> None:
+        """机械臂结束连接"""
+        logger.warning("机械臂通讯关闭!")
+        if self._receiver_task is not None:
+            self._receiver_task.cancel()
+            try:
+                await self._receiver_task
+            except asyncio.CancelledError:
+                pass
+            self._receiver_task = None
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+            self._writer = None
+        self.response_dispatcher.fail_all(ConnectionError("机械臂通讯已关闭"))
+
+    async def __aenter__(self):
+        await self.start_communication()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.end_communication()
+
+    async def command_receiver(self) -> None:
+        """接收机械臂返回信息的协程"""
+        frame_buffer = FrameBuffer()
+        try:
+            while True:
+                data = await self._reader.read(4096)
+                if not data:
+                    raise ConnectionError("机械臂连接已断开")
+                frame_buffer.feed(data)
+                for frame in frame_buffer.frames():
+                    try:
+                        response = json.loads(frame)
+                    except ValueError:
+                        logger.error(f"无法解析的响应消息: {frame!r}")
+                        continue
+                    if not self.response_dispatcher.dispatch(response):
+                        logger.debug(f"未被认领的响应消息: {response}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"接收数据失败: {e}")
+            self.response_dispatcher.fail_all(ConnectionError(f"机械臂通讯中断: {e}"))
+
+    async def send_command(self, command: str, data: list = None) -> None:
+        """将命令写入连接, 不等待响应"""
+        if self._writer is None:
+            raise ConnectionError("机械臂未连接")
+        logger.debug(f"发送命令: {command} {data}")
+        self._writer.write(encode_command(command, data))
+        await self._writer.drain()
+
+    async def request(self, command: str, data: list = None, response_name: str = None) -> dict:
+        """发送命令并等待对应的响应
+
+        :param command: 命令名称
+        :param data: 命令参数
+        :param response_name: 响应消息中的命令名称, 默认与 command 相同
+        
+        :return success: 解析后的响应, 如 {"command": "move_in_place", "data": true}
+        :return failed: {"command": response_name, "data": false}
+        """
+        response_name = response_name or command
+        response_future = self.response_dispatcher.register(response_name)
+        sent = False
+        try:
+            await self.send_command(command, data)
+            sent = True
+            return await asyncio.wait_for(asyncio.wrap_future(response_future), self.command_timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"等待 {response_name} 命令响应超时!")
+        except Exception as e:
+            logger.error(f"等待 {response_name} 命令响应失败: {e}")
+        finally:
+            # 等待超时时 wait_for 已取消了 Future, 仍需从分发器中撤销; 已发出的命令之后还会收到迟到的响应
+            if response_future.cancelled() or not response_future.done():
+                self.response_dispatcher.discard(response_future, reply_expected=sent)
+        return {"command": response_name, "data": False}
+
+    async def set_robot_arm_init(self) -> str:
+        """机械臂初始化，将机械臂关节角度归零
+        
+        :return success: {"command": "set_joint_initialize", "status": true}
+        :return failed: {"command": "set_joint_initialize", "status": false}
+        """
+        logger.info("机械臂初始化!")
+        response = await self.request("set_joint_initialize", [0])
+        return json.dumps({"command": "set_joint_initialize", "status": bool(response.get('data'))})
+
+    async def set_joint_degree_by_number(self, joint_number: int, speed_percentage: int, joint_degree: float) -> str:
+        """设置指定的机械臂关节角度
+        
+        :param joint_number: 机械臂关节编号 1~6
+        :param speed_percentage: 机械臂关节运动速度百分比 1~100
+        :param joint_degree: 机械臂关节角度, 单位:度
+        
+        :return success: {"command": "set_joint_angle", "status": true}
+        :return failed: {"command": "set_joint_angle", "status": false}
+        """
+        response = await self.request("set_joint_angle", [joint_number, speed_percentage, joint_degree], "move_in_place")
+        return json.dumps({"command": "set_joint_angle", "status": bool(response.get('data'))})
+
+    async def set_robot_arm_home(self) -> str:
+        """机械臂回零
+        
+        :return success: {"command": "set_robot_arm_home", "status": true}
+        :return failed: {"command": "set_robot_arm_home", "status": false}
+        """
+        logger.warning("机械臂回零!")
+        response = await self.request("set_joint_angle_all", [100, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0], "move_in_place")
+        return json.dumps({"command": "set_robot_arm_home", "status": bool(response.get('data'))})
+
+    async def set_joint_degree_synchronize(self, *args, speed_percentage: int = 50) -> str:
+        """设置机械臂所有关节角度
+        
+        :param *args: 机械臂所有关节的角度 q1, q2, q3, q4, q5, q6, 单位:度
+        :param speed_percentage: 机械臂关节运动速度百分比 1~100
+        
+        :return success: {"command": "set_joint_angle_all_time", "status": true}
+        :return failed: {"command": "set_joint_angle_all_time", "status": false}
+        """
+        if len(args) != 6:
+            logger.error("关节超出范围!")
+            return json.dumps({"command": "set_joint_angle_all_time", "status": False})
+        payload = [speed_percentage]
+        payload.extend(args)
+        response = await self.request("set_joint_angle_all_time", payload, "move_in_place")
+        return json.dumps({"command": "set_joint_angle_all_time", "status": bool(response.get('data'))})
+
+    async def set_robot_arm_emergency_stop(self) -> str:
+        """机械臂紧急停止, 不等待命令执行结果
+        
+        :return success: {"command": "set_joint_emergency_stop", "status": true}
+        """
+        await self.send_command("set_joint_emergency_stop", [0])
+        logger.warning("机械臂紧急停止!")
+        return json.dumps({"command": "set_joint_emergency_stop", "status": True})
+
+    async def set_robot_end_tool(self, io: int, status: bool) -> str:
+        """设置机械臂 IO 口状态
+        
+        :param io: 机械臂 IO 口, 1~3
+        :param status: 机械臂 IO 口状态, True:打开, False:关闭
+        
+        :return success: {"command": "set_end_tool", "status": true}
+        :return failed: {"command": "set_end_tool", "status": false}
+        """
+        response = await self.request("set_end_tool", [io, status])
+        return json.dumps({"command": "set_end_tool", "status": bool(response.get('data'))})
+
+    async def set_robot_io_status(self, io: int, status: bool) -> str:
+        """设置机械臂扩展 IO 口状态
+        
+        :param io: 机械臂 IO 口编号, 1~4
+        :param status: 机械臂 IO 口状态, True:打开, False:关闭
+        
+        :return success: {"command": "set_io_status", "status": true}
+        :return failed: {"command": "set_io_status", "status": false}
+        """
+        response = await self.request("set_robot_io_interface", [io, status])
+        return json.dumps({"command": "set_io_status", "status": bool(response.get('data'))})
+
+    async def set_time_delay(self, delay_time: int) -> str:
+        """设置机械臂命令之间执行延时时间
+        
+        :return success: {"command": "set_time_delay", "status": true}
+        :return failed: {"command": "set_time_delay", "status": false}
+        """
+        if self.robot_cmd_model != "SEQ":
+            logger.error("INT 顺序模式不支持设置延时时间!")
+            return json.dumps({"command": "set_time_delay", "status": False})
+        if not 0 <= delay_time <= 3000:
+            logger.error("延时时间超出范围!")
+            return json.dumps({"command": "set_time_delay", "status": False})
+        await self.send_command("set_time_delay", [delay_time])
+        return json.dumps({"command": "set_time_delay", "status": True})
+
+    async def set_robot_cmd_mode(self, mode: str = "SEQ") -> str:
+        """设置机械臂命令执行模式
+            
+        :params mode: SEQ(顺序执行模式)、INT(立即执行模式)
+        :return success: {"command": "set_robot_mode", "status": true}
+        :return failed: {"command": "set_robot_mode", "status": false}
+        """
+        response = await self.request("set_robot_mode", [mode])
+        if response.get('data'):
+            self.robot_cmd_model = json.loads(await self.get_robot_cmd_mode()).get('data')
+            logger.warning(f"机械臂当前的命令执行模式: {self.robot_cmd_model}")
+            return json.dumps({"command": "set_robot_mode", "status": True})
+        logger.error("机械臂命令执行模式设置失败!")
+        return json.dumps({"command": "set_robot_mode", "status": False})
+
+    async def set_joint_degree_by_coordinate(self, *args, speed_percentage: int = 50) -> str:
+        """通过末端工具坐标与姿态，控制机械臂关节运动
+        
+        :param *args: 机械臂末端工具坐标与姿态: x, y, z, Rx, Py, Yz
+        :param speed_percentage: 机械臂关节运动速度百分比 1~100
+        
+        :return success: {"command": "set_joint_degree_by_coordinate", "status": true}
+        :return failed: {"command": "set_joint_degree_by_coordinate", "status": false}
+        """
+        inverse_solution = json.loads(await self.get_inverse_solution(*args)).get('data')
+        if not inverse_solution:
+            logger.error("获取机械臂逆解失败!")
+            return json.dumps({"command": "set_joint_degree_by_coordinate", "status": False})
+        status = json.loads(await self.set_joint_degree_synchronize(*inverse_solution, speed_percentage=speed_percentage)).get('status')
+        return json.dumps({"command": "set_joint_degree_by_coordinate", "status": status})
+
+    async def get_joint_degree_all(self) -> dict:
+        """获取机械臂所有关节角度
+        
+        :return: {"command": "get_joint_angle_all", "data": [10, 20, 30, 40, 50, 60]}
+        """
+        return await self.request("get_joint_angle_all")
+
+    async def get_robot_cmd_mode(self) -> str:
+        """获取机械臂命令执行模式
+        
+        :return: {"command": "get_robot_mode", "data": "SEQ"}
+        """
+        return json.dumps(await self.request("get_robot_mode"))
+
+    async def get_positive_solution(self, *args, current_pose: bool = False) -> str:
+        """获取机械臂正解
+        
+        :params args: 机械臂关节角度值 q1, q2, q3, q4, q5, q6, 单位:度
+        :params current_pose: 是否使用当前机械臂关节角度值
+        
+        :return success: {"command": "get_positive_solution", "data": [x, y, z, Rx, Py, Yz]}
+        :return failed: {"command": "get_positive_solution", "data": []}
+        """
+        if current_pose:
+            joint_angle_list = (await self.get_joint_degree_all()).get('data')
+        else:
+            joint_angle_list = list(args)
+        if joint_angle_list and len(joint_angle_list) == 6:
+            from blinx_robots import robot_arm_kinematics as kinematics
+            pose = kinematics.positive_solution(self.blinx_robot_arm, joint_angle_list)
+            return json.dumps({"command": "get_positive_solution", "data": pose})
+        logger.error("获取机械臂角度值失败!")
+        return json.dumps({"command": "get_positive_solution", "data": []})
+
+    async def get_inverse_solution(self, *args, current_pose: bool = False, q_seed: list = None) -> str:
+        """获取机械臂逆解, 求解在默认线程池中进行, 不阻塞事件循环
+        
+        :params *args: 机械臂 x, y, z, Rx, Py, Yz 坐标
+        :params current_pose: 是否使用当前机械臂关节角度值
+        :params q_seed: 参考关节角度 q1 ~ q6, 单位:度, 存在多组解时返回最接近参考值的一组
+        
+        :return success: {"command": "get_inverse_kinematics", "data": [q1, q2, q3, q4, q5, q6]}
+        :return failed: {"command": "get_inverse_kinematics", "data": []}
+        """
+        if current_pose:
+            pose = json.loads(await self.get_positive_solution(current_pose=True)).get('data')
+        else:
+            pose = list(args)
+        if not pose or len(pose) != 6:
+            logger.error("获取机械臂逆解失败!")
+            return json.dumps({"command": "get_inverse_kinematics", "data": []})
+        from blinx_robots import robot_arm_kinematics as kinematics
+        loop = asyncio.get_running_loop()
+        inverse_result = await loop.run_in_executor(None, kinematics.inverse_solution, self.blinx_robot_arm, pose, q_seed)
+        if not inverse_result:
+            logger.error("获取机械臂逆解失败!")
+        return json.dumps({"command": "get_inverse_kinematics", "data": inverse_result})
@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
+import json
 import socket
+import selectors
+import threading
 from retrying import retry
 
 
@@ -7,7 +10,106 @@ class CommunicationStrategy(ABC):
     @abstractmethod
     def connect(self):
         pass
-    
+
+    @abstractmethod
+    def send(self, data: bytes) -> None:
+        pass
+
+    @abstractmethod
+    def recv(self, bufsize: int = 1024) -> bytes:
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        pass
+
+    def send_if_connected(self, data: bytes) -> bool:
+        """只在连接已建立时发送, 不会为此建立连接; 默认不支持, 返回 False"""
+        return False
+
+    def recv_into(self, buffer: memoryview) -> int:
+        """将数据读入调用方提供的缓冲区, 返回读取的字节数"""
+        data = self.recv(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def wait_readable(self, timeout: float = None) -> bool:
+        """等待连接上有数据可读, 默认实现直接返回 True 由 recv 阻塞等待"""
+        return True
+
+
+def encode_command(command: str, data: list = None) -> bytes:
+    """将命令编码为机械臂协议帧: 紧凑的 JSON + \\r\\n
+
+    :param command: 命令名称, 如 set_joint_angle_all_time
+    :param data: 命令参数, 为 None 时不携带 data 字段
+    """
+    message = {"command": command} if data is None else {"command": command, "data": data}
+    return json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\r\n'
+
+
+class FrameBuffer(object):
+    """以 \\r\\n 分隔的增量帧缓冲区
+
+    数据通过 recv_into 直接写入复用的 bytearray, 跨多次读取的半帧保留在缓冲区中,
+    只有完整的帧才会被复制出来交给调用方解析.
+    """
+
+    DELIMITER = b'\r\n'
+
+    def __init__(self, capacity: int = 4096):
+        self._buffer = bytearray(capacity)
+        self._view = memoryview(self._buffer)
+        self._start = 0  # 未消费数据的起始位置
+        self._end = 0    # 已写入数据的结束位置
+        self._scan = 0   # 下一次查找分隔符的起始位置
+
+    def writable(self) -> memoryview:
+        """返回可写入的空闲区域, 空间不足时先整理再扩容"""
+        if self._end == len(self._buffer):
+            pending = self._end - self._start
+            if self._start > 0:
+                self._buffer[:pending] = self._buffer[self._start:self._end]
+                self._scan -= self._start
+                self._start, self._end = 0, pending
+            else:
+                buffer = bytearray(len(self._buffer) * 2)
+                buffer[:pending] = self._buffer
+                self._buffer, self._view = buffer, memoryview(buffer)
+        return self._view[self._end:]
+
+    def commit(self, nbytes: int) -> None:
+        """确认 writable 区域中新写入的字节数"""
+        self._end += nbytes
+
+    def feed(self, data: bytes) -> None:
+        """写入一段已读取的数据, 用于不支持 recv_into 的传输方式"""
+        view = memoryview(data)
+        while view:
+            writable = self.writable()
+            nbytes = min(len(writable), len(view))
+            writable[:nbytes] = view[:nbytes]
+            self.commit(nbytes)
+            view = view[nbytes:]
+
+    def frames(self):
+        """依次取出缓冲区中所有完整的帧 (不含分隔符, 跳过空帧)"""
+        delimiter_size = len(self.DELIMITER)
+        while True:
+            index = self._buffer.find(self.DELIMITER, self._scan, self._end)
+            if index < 0:
+                self._scan = max(self._start, self._end - delimiter_size + 1)
+                break
+            frame = bytes(self._view[self._start:index])
+            self._start = self._scan = index + delimiter_size
+            if frame.strip():
+                yield frame
+        if self._start == self._end:
+            self._start = self._end = self._scan = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
 
 # 机械臂连接方式
 class SocketCommunication(CommunicationStrategy):
@@ -15,17 +117,110 @@ class SocketCommunication(CommunicationStrategy):
         super().__init__()
         self.host = host
         self.port = port
+        self.client_socket = None
         self.client_socket_list = []
-    
+        self.connect_count = 0  # 成功建立连接的次数, 大于 1 说明发生过重连
+        self._connection_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._selector = selectors.DefaultSelector()
+        self._selector_socket = None
+
     @retry(stop_max_attempt_number=3, wait_fixed=1000)
     def connect(self):
         self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
         self.client_socket.connect((self.host, self.port))
+        self.connect_count += 1
         self.client_socket_list.append(self.client_socket)
-        return self.client_socket        
-    
+        return self.client_socket
+
+    @property
+    def connected(self) -> bool:
+        """长连接是否可用"""
+        return self.client_socket is not None
+
+    def get_connection(self) -> socket.socket:
+        """获取与机械臂的长连接, 连接不存在时建立连接
+
+        发送与接收共用同一条双工连接, 只在首次使用或连接断开后才重新握手
+        """
+        with self._connection_lock:
+            if self.client_socket is None:
+                self.connect()
+            return self.client_socket
+
+    def send(self, data: bytes) -> None:
+        """通过长连接发送数据, 多线程发送时保证每条命令完整写出"""
+        client = self.get_connection()
+        with self._send_lock:
+            try:
+                client.sendall(data)
+            except OSError:
+                self.close()
+                raise
+
+    def send_if_connected(self, data: bytes) -> bool:
+        """只在长连接已建立时发送, 不重新握手, 用于急停等不能等待连接重试的命令
+
+        :return: 数据是否已完整写出; 连接不存在或写入失败时返回 False
+        """
+        client = self.client_socket
+        if client is None:
+            return False
+        with self._send_lock:
+            try:
+                client.sendall(data)
+            except OSError:
+                self.close()
+                return False
+        return True
+
+    def recv(self, bufsize: int = 1024) -> bytes:
+        """从长连接读取数据, 对端关闭连接时抛出 ConnectionError"""
+        client = self.get_connection()
+        data = client.recv(bufsize)
+        if not data:
+            self.close()
+            raise ConnectionError("机械臂连接已断开")
+        return data
+
+    def recv_into(self, buffer: memoryview) -> int:
+        """从长连接直接读入缓冲区, 对端关闭连接时抛出 ConnectionError"""
+        client = self.get_connection()
+        nbytes = client.recv_into(buffer)
+        if not nbytes:
+            self.close()
+            raise ConnectionError("机械臂连接已断开")
+        return nbytes
+
+    def wait_readable(self, timeout: float = None) -> bool:
+        """等待长连接可读, 超时返回 False"""
+        client = self.get_connection()
+        if self._selector_socket is not client:
+            if self._selector_socket is not None:
+                self._selector.unregister(self._selector_socket)
+            self._selector.register(client, selectors.EVENT_READ)
+            self._selector_socket = client
+        return bool(self._selector.select(timeout))
+
+    def close(self) -> None:
+        """关闭长连接, 下次收发时会自动重连"""
+        with self._connection_lock:
+            client, self.client_socket = self.client_socket, None
+            if client is not None:
+                if self._selector_socket is client:
+                    self._selector.unregister(client)
+                    self._selector_socket = None
+                if client in self.client_socket_list:
+                    self.client_socket_list.remove(client)
+                try:
+                    client.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                client.close()
+
     def __enter__(self):
-        return self.connect()
-    
-    def __exit__(self):
-        self.client_socket_list.pop().close()
\ No newline at end of file
+        return self.get_connection()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,98 @@
+import json
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import Future
+
+from loguru import logger
+
+
+class ResponseDispatcher(object):
+    """机械臂命令响应分发器
+
+    调用方在发送命令前, 按响应的命令名称登记一个 Future;
+    接收线程解析出一条响应后, 直接交给同名的、最早登记的 Future.
+    同名命令按先进先出的顺序匹配, 不同命令之间互不干扰.
+    已发送但等待超时被撤销的命令, 其响应仍会迟到, 分发时先按名称丢弃这些迟到的响应,
+    避免把它们交给后面登记的调用方.
+    """
+
+    def __init__(self):
+        self._waiters = defaultdict(deque)
+        self._late_replies = defaultdict(int)  # 命令名称 -> 尚未收到的、已撤销命令的响应数量
+        self._lock = threading.Lock()
+
+    def register(self, command_name: str) -> Future:
+        """登记等待指定命令名称的响应
+
+        :param command_name: 响应消息中的命令名称, 如 move_in_place
+        :return: 收到响应后完成的 Future, 结果为解析后的响应字典
+        """
+        future = Future()
+        future.command_name = command_name
+        with self._lock:
+            self._waiters[command_name].append(future)
+        return future
+
+    def discard(self, future: Future, reply_expected: bool = True) -> None:
+        """撤销一个不再等待的 Future, 例如等待超时后
+
+        :param future: register 返回的 Future
+        :param reply_expected: 命令是否已经发出; 已发出的命令之后仍会收到响应, 该响应会被丢弃.
+                               命令未发送即被取消时为 False
+        """
+        with self._lock:
+            waiters = self._waiters.get(future.command_name)
+            if waiters and future in waiters:
+                waiters.remove(future)
+                if reply_expected:
+                    self._late_replies[future.command_name] += 1
+        future.cancel()
+
+    def dispatch(self, message) -> bool:
+        """将一条响应分发给等待它的 Future
+
+        :param message: 响应消息, 字符串或已解析的字典
+        :return: 是否有调用方在等待这条响应
+        """
+        if isinstance(message, str):
+            try:
+                message = json.loads(message)
+            except json.JSONDecodeError:
+                logger.error(f"无法解析的响应消息: {message}")
+                return False
+        if not isinstance(message, dict):
+            logger.error(f"无法识别的响应消息: {message}")
+            return False
+
+        command_name = message.get('command')
+        with self._lock:
+            if self._late_replies.get(command_name):
+                self._late_replies[command_name] -= 1
+                logger.warning(f"丢弃已超时命令的迟到响应: {message}")
+                return False
+            waiters = self._waiters.get(command_name)
+            while waiters:
+                future = waiters.popleft()
+                if future.set_running_or_notify_cancel():
+                    break
+            else:
+                return False
+        future.set_result(message)
+        return True
+
+    def fail_all(self, exception: BaseException) -> None:
+        """连接断开时, 让所有等待中的调用方立即返回"""
+        with self._lock:
+            pending = [future for waiters in self._waiters.values() for future in waiters]
+            self._waiters.clear()
+            self._late_replies.clear()
+        for future in pending:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(exception)
+
+    def pending_count(self, command_name: str = None) -> int:
+        """等待响应的调用方数量"""
+        with self._lock:
+            if command_name is not None:
+                return len(self._waiters.get(command_name, ()))
+            return sum(len(waiters) for waiters in self._waiters.values())
@@ -0,0 +1,187 @@
+import time
+import socket
+import selectors
+import threading
+
+from loguru import logger
+
+from blinx_robots.robot_arm_communication import FrameBuffer, encode_command
+
+
+class EmergencyStopChannel(object):
+    """专用的急停通道
+
+    与命令连接分开, 单独保持一条已建立的 TCP 连接, 急停帧预先编码好.
+    后台心跳线程定期发送查询命令确认连接可用, 断开时在后台重连, 触发急停时不会等待握手.
+    trigger 不经过命令队列, 可以在任意线程或信号处理函数中调用. 急停帧与心跳帧通过写锁串行写入,
+    心跳只尝试获取写锁, 急停正在写入时跳过这一次心跳; 急停最多等待一次心跳帧写完 (send_timeout).
+    """
+
+    STOP_FRAME = encode_command("set_joint_emergency_stop", [0])
+    HEARTBEAT_FRAME = encode_command("get_robot_mode")
+    HEARTBEAT_REPLY = b'"get_robot_mode"'
+
+    def __init__(self, host: str, port: int, heartbeat_interval: float = 1.0, heartbeat_timeout: float = None,
+                 send_timeout: float = 0.05):
+        """
+        :param host: 机械臂 IP 地址
+        :param port: 机械臂端口
+        :param heartbeat_interval: 心跳间隔, 单位:秒
+        :param heartbeat_timeout: 等待心跳响应的超时时间, 默认与心跳间隔相同, 超时后重连
+        :param send_timeout: 发送急停帧的超时时间, 单位:秒, 保证 trigger 不会长时间阻塞
+        """
+        self.host = host
+        self.port = port
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_interval if heartbeat_timeout is None else heartbeat_timeout
+        self.send_timeout = send_timeout
+        self.trigger_count = 0
+        self.reconnect_count = 0
+        self.last_latency = None  # 最近一次成功发送急停帧的耗时 (含等待写锁), 单位:秒
+        self.max_latency = 0.0    # 成功发送急停帧耗时的最大值, 单位:秒
+        self.last_heartbeat = None
+        self._socket = None
+        self._write_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._wake = threading.Event()  # 停止或急停通道需要重连时唤醒心跳线程
+        self._thread = None
+
+    @property
+    def healthy(self) -> bool:
+        """连接已建立且最近一次心跳没有超时"""
+        return (
+            self._socket is not None and self.last_heartbeat is not None
+            and time.monotonic() - self.last_heartbeat < self.heartbeat_interval + self.heartbeat_timeout
+        )
+
+    def start(self, wait: float = 1.0) -> bool:
+        """建立连接并启动心跳线程
+
+        :param wait: 等待首次连接成功的时间, 单位:秒
+        :return: 连接是否已建立
+        """
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._heartbeat, name="blinx-emergency-stop", daemon=True)
+            self._thread.start()
+        deadline = time.monotonic() + wait
+        while self._socket is None and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return self._socket is not None
+
+    def stop(self) -> None:
+        """停止心跳线程并关闭连接"""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def trigger(self) -> bool:
+        """立即发送急停帧
+
+        :return: 急停帧是否已完整写入连接; 连接不可用时返回 False, 调用方应通过其它连接再次尝试
+        """
+        client = self._socket
+        start = time.perf_counter()
+        if client is None or not self._write_lock.acquire(timeout=self.send_timeout):
+            return False
+        try:
+            client.sendall(self.STOP_FRAME)
+            latency = time.perf_counter() - start
+        except OSError:
+            # 急停帧可能只写出了一部分, 连接上的数据已不完整, 丢弃这条连接由心跳线程重新连接
+            self._drop(client)
+            return False
+        finally:
+            self._write_lock.release()
+        self.trigger_count += 1
+        self.last_latency = latency
+        if latency > self.max_latency:
+            self.max_latency = latency
+        return True
+
+    def _drop(self, client) -> None:
+        if self._socket is client:
+            self._socket = None
+        try:
+            client.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._wake.set()
+
+    def _connect(self) -> socket.socket:
+        client = socket.create_connection((self.host, self.port), timeout=self.heartbeat_timeout)
+        client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client.settimeout(self.send_timeout)
+        return client
+
+    def _heartbeat(self) -> None:
+        """维持连接: 定期发送心跳并等待响应, 连接异常时关闭并重连"""
+        selector = selectors.DefaultSelector()
+        client = None
+        while not self._stopped.is_set():
+            if client is not None and self._socket is not client:
+                # 急停帧写入失败, trigger 已丢弃这条连接
+                logger.error("急停通道写入失败, 重新连接")
+                selector.unregister(client)
+                client.close()
+                client = None
+            if client is None:
+                try:
+                    client = self._connect()
+                except OSError as e:
+                    logger.error(f"急停通道连接失败: {e}")
+                    self._stopped.wait(min(self.heartbeat_interval, 0.5))
+                    continue
+                selector.register(client, selectors.EVENT_READ)
+                frame_buffer = FrameBuffer(256)
+                if self.last_heartbeat is not None:
+                    self.reconnect_count += 1
+                    logger.warning("急停通道已重新连接")
+                self._socket = client
+            if not self._write_lock.acquire(blocking=False):
+                # 正在发送急停帧, 跳过这一次心跳
+                self._idle()
+                continue
+            try:
+                try:
+                    client.sendall(self.HEARTBEAT_FRAME)
+                finally:
+                    self._write_lock.release()
+                if not self._wait_heartbeat_reply(client, selector, frame_buffer):
+                    raise ConnectionError("心跳响应超时")
+                self.last_heartbeat = time.monotonic()
+            except OSError as e:
+                logger.error(f"急停通道异常, 重新连接: {e}")
+                self._socket = None
+                selector.unregister(client)
+                with self._write_lock:  # 不在急停帧写入过程中关闭连接
+                    client.close()
+                client = None
+                continue
+            self._idle()
+        self._socket = None
+        if client is not None:
+            selector.unregister(client)
+            client.close()
+        selector.close()
+
+    def _idle(self) -> None:
+        """等待下一次心跳, 停止或需要重连时提前返回"""
+        self._wake.wait(self.heartbeat_interval)
+        self._wake.clear()
+
+    def _wait_heartbeat_reply(self, client, selector, frame_buffer) -> bool:
+        deadline = time.monotonic() + self.heartbeat_timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not selector.select(remaining):
+                return False
+            nbytes = client.recv_into(frame_buffer.writable())
+            if not nbytes:
+                raise ConnectionError("机械臂连接已断开")
+            frame_buffer.commit(nbytes)
+            # 同一条连接上可能还有其它响应, 只要收到心跳响应即可
+            if any(self.HEARTBEAT_REPLY in frame for frame in frame_buffer.frames()):
+                return True
@@ -0,0 +1,177 @@
+import time
+import asyncio
+
+from loguru import logger
+
+from blinx_robots.robot_arm_async_interface import AsyncBlxRobotArm
+from blinx_robots.robot_arm_telemetry import JointStateBuffer
+
+
+class RobotArmFleet(object):
+    """多台机械臂集群控制
+
+    所有机械臂共用调用方的一个 asyncio 事件循环: 每台机械臂一条长连接、一个接收协程和一个命令队列协程,
+    不为机械臂创建线程, 空闲时没有任何轮询. 同一台机械臂的命令按提交顺序执行, 不同机械臂之间互不等待.
+    """
+
+    def __init__(self, command_timeout: float = None):
+        """
+        :param command_timeout: 等待命令响应的超时时间, 单位:秒, None 表示一直等待
+        """
+        self.command_timeout = command_timeout
+        self.arms = {}
+        self.telemetry = {}
+        self._queues = {}
+        self._workers = {}
+        self._telemetry_task = None
+
+    def add_arm(self, name: str, host: str, port: int) -> AsyncBlxRobotArm:
+        """添加一台机械臂, 需要在 start 之前调用
+
+        :param name: 机械臂名称, 作为后续命令的索引
+        :param host: 机械臂 IP 地址
+        :param port: 机械臂端口
+        """
+        if name in self.arms:
+            raise ValueError(f"机械臂名称重复: {name}")
+        arm = AsyncBlxRobotArm(host, port, self.command_timeout)
+        self.arms[name] = arm
+        return arm
+
+    async def start(self) -> None:
+        """同时连接所有机械臂, 并启动各自的命令队列协程"""
+        await asyncio.gather(*[arm.start_communication() for arm in self.arms.values()])
+        for name in self.arms:
+            self._queues[name] = asyncio.Queue()
+            self._workers[name] = asyncio.ensure_future(self._command_worker(name))
+        logger.warning(f"机械臂集群已连接: {len(self.arms)} 台")
+
+    async def stop(self) -> None:
+        """停止采集与命令队列, 关闭所有连接; 队列中尚未执行的命令以 ConnectionError 结束"""
+        await self.stop_telemetry()
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        for queue in self._queues.values():
+            while not queue.empty():
+                _, _, _, future = queue.get_nowait()
+                if not future.done():
+                    future.set_exception(ConnectionError("机械臂集群已关闭"))
+        self._workers.clear()
+        self._queues.clear()
+        await asyncio.gather(*[arm.end_communication() for arm in self.arms.values()])
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.stop()
+
+    async def _command_worker(self, name: str) -> None:
+        """依次执行一台机械臂队列中的命令"""
+        arm, queue = self.arms[name], self._queues[name]
+        while True:
+            method_name, args, kwargs, future = await queue.get()
+            if future.cancelled():
+                continue
+            try:
+                result = await getattr(arm, method_name)(*args, **kwargs)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                logger.error(f"机械臂 {name} 执行 {method_name} 失败: {e}")
+                future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+
+    def submit(self, name: str, method_name: str, *args, **kwargs) -> asyncio.Future:
+        """将命令放入指定机械臂的命令队列
+
+        :param name: 机械臂名称
+        :param method_name: AsyncBlxRobotArm 的方法名, 如 set_joint_degree_synchronize
+        :return: 命令执行完成后得到方法返回值的 asyncio.Future
+        """
+        if not hasattr(AsyncBlxRobotArm, method_name):
+            raise ValueError(f"不支持的命令: {method_name}")
+        future = asyncio.get_event_loop().create_future()
+        self._queues[name].put_nowait((method_name, args, kwargs, future))
+        return future
+
+    def queue_depths(self) -> dict:
+        """各机械臂命令队列中等待执行的命令数量"""
+        return {name: queue.qsize() for name, queue in self._queues.items()}
+
+    async def broadcast(self, method_name: str, *args, names=None, **kwargs) -> dict:
+        """向多台机械臂同时下发同一条命令, 每台机械臂的命令排在各自队列的末尾
+
+        :param method_name: AsyncBlxRobotArm 的方法名, 如 set_robot_arm_home
+        :param names: 机械臂名称列表, 默认为全部机械臂
+        :return: {机械臂名称: 方法返回值或异常}
+        """
+        names = list(self.arms) if names is None else list(names)
+        futures = [self.submit(name, method_name, *args, **kwargs) for name in names]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        return dict(zip(names, results))
+
+    async def emergency_stop_all(self) -> dict:
+        """所有机械臂立即急停, 不经过命令队列"""
+        names = list(self.arms)
+        results = await asyncio.gather(
+            *[self.arms[name].set_robot_arm_emergency_stop() for name in names], return_exceptions=True
+        )
+        logger.warning("机械臂集群紧急停止!")
+        return dict(zip(names, results))
+
+    def start_telemetry(self, rate: float = 20.0, capacity: int = 1024) -> None:
+        """开启所有机械臂的关节状态采集, 每个周期同时查询所有机械臂
+
+        :param rate: 采集频率, 单位:Hz
+        :param capacity: 每台机械臂环形缓冲区的容量
+        """
+        for name in self.arms:
+            self.telemetry.setdefault(name, JointStateBuffer(capacity))
+        if self._telemetry_task is None:
+            self._telemetry_task = asyncio.ensure_future(self._poll_telemetry(1.0 / rate))
+
+    async def stop_telemetry(self) -> None:
+        if self._telemetry_task is not None:
+            self._telemetry_task.cancel()
+            await asyncio.gather(self._telemetry_task, return_exceptions=True)
+            self._telemetry_task = None
+
+    async def _poll_telemetry(self, period: float) -> None:
+        names = list(self.arms)
+        next_poll_time = time.monotonic()
+        while True:
+            responses = await asyncio.gather(
+                *[self.arms[name].get_joint_degree_all() for name in names], return_exceptions=True
+            )
+            for name, response in zip(names, responses):
+                if isinstance(response, dict) and response.get('data'):
+                    self.telemetry[name].append(response['data'])
+            next_poll_time += period
+            delay = next_poll_time - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                next_poll_time = time.monotonic()
+
+    def joint_states(self, max_age: float = None) -> dict:
+        """所有机械臂的最新关节状态
+
+        :param max_age: 允许的最大数据时长, 单位:秒, 超过时对应机械臂的值为 None
+        :return: {机械臂名称: [q1, ..., q6] 或 None}
+        """
+        now = time.monotonic()
+        states = {}
+        for name in self.arms:
+            buffer = self.telemetry.get(name)
+            state = None if buffer is None else buffer.latest()
+            if state is None or (max_age is not None and now - state[0] > max_age):
+                states[name] = None
+            else:
+                states[name] = list(state[1])
+        return states
@@ -0,0 +1,110 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class InverseSolutionCache(object):
+    """逆解结果缓存 (LRU)
+
+    以量化后的末端位姿和参考关节角所在的逆解分支作为键: 位置误差在 tolerance 内、
+    姿态误差在 angle_tolerance 内的位姿视为同一个位姿, 直接复用已求得的关节角.
+    """
+
+    def __init__(self, maxsize: int = 1024, tolerance: float = 1e-4, angle_tolerance: float = 1e-3):
+        """
+        :param maxsize: 最多缓存的位姿数量, 超出时淘汰最久未使用的条目
+        :param tolerance: 位置量化步长, 单位:米
+        :param angle_tolerance: 姿态量化步长, 单位:弧度
+        """
+        self.maxsize = maxsize
+        self.tolerance = tolerance
+        self.angle_tolerance = angle_tolerance
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._steps = np.array([tolerance] * 3 + [angle_tolerance] * 3)
+
+    def make_key(self, pose, branch=None) -> tuple:
+        """生成缓存键
+
+        :param pose: 末端位姿 x, y, z, Rx, Py, Yz
+        :param branch: 参考关节角所在的逆解分支, 如 (1, 1, -1), 无参考值时为 None
+        """
+        cell = np.round(np.asarray(pose, dtype=float) / self._steps).astype(np.int64)
+        return tuple(cell.tolist()) + (tuple(int(b) for b in branch) if branch is not None else None,)
+
+    def get(self, key):
+        """查询缓存, 未命中时返回 None"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value) -> None:
+        """写入缓存, value 为关节角列表"""
+        with self._lock:
+            self._entries[key] = list(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """缓存命中统计"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def save(self, path: str) -> None:
+        """将缓存保存为 JSON 文件, 按最近使用顺序排列"""
+        with self._lock:
+            entries = [[list(key[:6]), None if key[6] is None else list(key[6]), value] for key, value in self._entries.items()]
+        payload = {
+            "tolerance": self.tolerance,
+            "angle_tolerance": self.angle_tolerance,
+            "entries": entries,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> int:
+        """从 JSON 文件预加载缓存, 量化步长不一致时忽略文件
+
+        :return: 加载的条目数量
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        if payload.get("tolerance") != self.tolerance or payload.get("angle_tolerance") != self.angle_tolerance:
+            return 0
+        entries = payload.get("entries", [])[-self.maxsize:]
+        with self._lock:
+            for cell, branch, value in entries:
+                key = tuple(cell) + (tuple(branch) if branch is not None else None,)
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return len(entries)
@@ -1,28 +1,61 @@
+import os
 import time
 import json
-from queue import Queue
-from concurrent.futures import ThreadPoolExecutor
+from queue import Queue, Empty
+from concurrent.futures import Future, ThreadPoolExecutor, CancelledError
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
-import numpy as np
 from loguru import logger
-from spatialmath import SE3
-from spatialmath.base import rpy2tr
 
-from blinx_robots.robot_arm_module import BlinxRobotArm
-from blinx_robots.robot_arm_communication import SocketCommunication
+from blinx_robots import configure_logging
+from blinx_robots.robot_arm_communication import SocketCommunication, FrameBuffer, encode_command
+from blinx_robots.robot_arm_dispatcher import ResponseDispatcher
+from blinx_robots.robot_arm_scheduler import CommandScheduler, COMMAND_PRIORITIES, PRIORITY_STATEFUL
 
-logger.remove(handler_id=None)  #  关闭日志输出到终端
-logger.add("robot_arm_interface.log", rotation="10 MB", level="DEBUG", compression='zip', enqueue=True)
+# 运动学相关模块 (numpy、roboticstoolbox、spatialmath) 导入耗时较长,
+# 只在第一次调用正逆解等功能时才导入, 只控制 IO、读取关节角度的程序不需要加载它们
 
 class BlxRobotArm(object):
     """比邻星六轴机械臂 API"""
 
-    def __init__(self, communication_strategy):
+    RECV_DATA_BUFFER_SIZE = 100  # 未被认领的响应消息最多保留的条数
+    TELEMETRY_POLL_TIMEOUT = 1.0  # 后台采集关节状态时等待单次响应的超时时间, 单位:秒
+    # 命令名称 -> 机械臂响应的命令名称, None 表示机械臂不回复该命令
+    COMMAND_RESPONSES = {
+        "set_joint_initialize": "set_joint_initialize",
+        "set_joint_angle": "move_in_place",
+        "set_joint_angle_all": "move_in_place",
+        "set_joint_angle_all_time": "move_in_place",
+        "set_end_tool": "set_end_tool",
+        "set_robot_io_interface": "set_robot_io_interface",
+        "set_robot_mode": "set_robot_mode",
+        "set_time_delay": None,
+        "get_joint_angle_all": "get_joint_angle_all",
+        "get_robot_mode": "get_robot_mode",
+    }
+
+    def __init__(self, communication_strategy, command_timeout: float = None):
         self.thread_work_flag = True
+        self.command_timeout = command_timeout  # 等待命令响应的超时时间, 单位:秒, None 表示一直等待
         self.robot_cmd_model = "SEQ"
         self.recv_data_buffer = Queue()
-        self.command_queue = Queue()
-        self.blinx_robot_arm = BlinxRobotArm()
+        self.command_queue = CommandScheduler(on_drop=self._drop_command)
+        self.response_dispatcher = ResponseDispatcher()
+        self._blinx_robot_arm = None
+        self.ik_cache = None
+        self.ik_cache_file = None
+        self.trajectory_validator = None
+        self._last_joint_target = None  # 最近一次发出的关节目标, 单位:度, 急停后未知
+        self.workspace_index = None
+        self.workspace_check_orientation = False
+        self.telemetry = None
+        self.telemetry_max_age = None
+        self.metrics = None
+        self.emergency_stop_channel = None
+        self.servo = None
+        self.recorder = None
+        self._recording_owns_telemetry = False
+        self._servo_previous_mode = None
         self.task_executor = ThreadPoolExecutor(max_workers=10)
         self.communication_strategy = communication_strategy
 
@@ -34,6 +67,340 @@ class BlxRobotArm(object):
         """
         self.communication_strategy = communication_strategy
     
+    @property
+    def blinx_robot_arm(self):
+        """机械臂运动学模型, 第一次使用时创建"""
+        if self._blinx_robot_arm is None:
+            from blinx_robots.robot_arm_module import BlinxRobotArm
+            self._blinx_robot_arm = BlinxRobotArm()
+        return self._blinx_robot_arm
+
+    @blinx_robot_arm.setter
+    def blinx_robot_arm(self, robot_model) -> None:
+        self._blinx_robot_arm = robot_model
+
+    def enable_ik_cache(self, maxsize: int = 1024, tolerance: float = 1e-4, angle_tolerance: float = 1e-3, cache_file: str = None) -> None:
+        """开启逆解缓存, 重复的目标位姿直接复用之前的逆解结果
+
+        :param maxsize: 最多缓存的位姿数量, 超出时淘汰最久未使用的条目
+        :param tolerance: 位置量化步长, 单位:米, 在同一量化格内的位姿共用一组逆解
+        :param angle_tolerance: 姿态量化步长, 单位:弧度
+        :param cache_file: 缓存文件路径, 文件存在时预加载, save_ik_cache 默认保存到此文件
+        """
+        from blinx_robots.robot_arm_ik_cache import InverseSolutionCache
+        self.ik_cache = InverseSolutionCache(maxsize, tolerance, angle_tolerance)
+        self.ik_cache_file = cache_file
+        if cache_file and os.path.exists(cache_file):
+            loaded = self.ik_cache.load(cache_file)
+            logger.info(f"预加载逆解缓存 {loaded} 条: {cache_file}")
+
+    def save_ik_cache(self, cache_file: str = None) -> None:
+        """保存逆解缓存到文件
+
+        :param cache_file: 缓存文件路径, 默认使用 enable_ik_cache 时指定的文件
+        """
+        cache_file = cache_file or self.ik_cache_file
+        if self.ik_cache is None or not cache_file:
+            logger.error("逆解缓存未开启或未指定缓存文件!")
+            return
+        self.ik_cache.save(cache_file)
+        logger.info(f"逆解缓存已保存: {cache_file}, {self.ik_cache.stats()}")
+
+    def enable_workspace_index(self, index_file: str, check_orientation: bool = False) -> None:
+        """加载可达空间索引, 之后 set_joint_degree_by_coordinate 在逆解之前先排除不可达的目标
+
+        :param index_file: robot_arm_workspace.build_workspace_index 生成的 .npy 文件, 以内存映射方式读取
+        :param check_orientation: 是否同时检查接近方向; 姿态覆盖由采样估计, 采样不足时可能误判可达的姿态
+        """
+        from blinx_robots.robot_arm_workspace import WorkspaceIndex
+        self.workspace_index = WorkspaceIndex.load(index_file)
+        self.workspace_check_orientation = check_orientation
+
+    def is_reachable(self, *args) -> bool:
+        """通过可达空间索引判断末端位姿是否可能可达, 未加载索引时返回 True
+
+        :param *args: 机械臂末端工具坐标与姿态: x, y, z, Rx, Py, Yz
+        """
+        if self.workspace_index is None:
+            return True
+        return self.workspace_index.pose_reachable(args, self.workspace_check_orientation)
+
+    def enable_trajectory_validation(self, max_joint_speed=None, min_tcp_height: float = None, keep_out_boxes=()) -> None:
+        """开启发送前的轨迹检查
+
+        所有关节目标命令 (同步与 *_async 接口、submit_command / submit_batch、伺服、录制回放) 在放入发送队列前检查,
+        不合格的命令不发送, 调用方收到失败结果; stream_joint_trajectory 在发送第一个路径点之前检查整条轨迹.
+        关节限位始终检查, 其余限制按参数开启.
+
+        :param max_joint_speed: 关节最大速度, 单位:度/秒, 标量或每个关节一个值, 用于检查流式发送时相邻路径点的关节变化
+        :param min_tcp_height: 末端最低高度, 单位:米
+        :param keep_out_boxes: 末端禁入区域 [((x_min, y_min, z_min), (x_max, y_max, z_max)), ...], 单位:米
+        """
+        from blinx_robots.robot_arm_validation import TrajectoryValidator
+        self.trajectory_validator = TrajectoryValidator(self.blinx_robot_arm, max_joint_speed, min_tcp_height, keep_out_boxes)
+
+    def validate_trajectory(self, trajectory, period: float = None, start: list = None) -> str:
+        """检查关节轨迹, 不发送任何命令; 未开启轨迹检查时只检查关节限位
+
+        :param trajectory: (N, 6) 机械臂关节角度, 单位:度
+        :param period: 相邻路径点的发送间隔, 单位:秒, 用于检查关节速度
+        :param start: 机械臂当前关节角度, 单位:度
+
+        :return success: {"command": "validate_trajectory", "status": true, "index": null, "joint": null, "reason": null}
+        :return failed: {"command": "validate_trajectory", "status": false, "index": 12, "joint": 3, "reason": "joint_limit"}
+        """
+        result = self._validator().validate_joints(trajectory, period=period, start=start)
+        return json.dumps({"command": "validate_trajectory", "status": result.valid, "index": result.index,
+                           "joint": result.joint, "reason": result.reason})
+
+    def _validator(self):
+        if self.trajectory_validator is None:
+            from blinx_robots.robot_arm_validation import TrajectoryValidator
+            return TrajectoryValidator(self.blinx_robot_arm)
+        return self.trajectory_validator
+
+    def _reject_trajectory(self, trajectory, period: float = None, start: list = None):
+        """开启轨迹检查时检查轨迹, 返回第一个不合格的检查结果, 合格或未开启时返回 None"""
+        if self.trajectory_validator is None:
+            return None
+        result = self.trajectory_validator.validate_joints(trajectory, period=period, start=start)
+        if result.valid:
+            return None
+        logger.error(f"轨迹检查未通过: 第 {result.index} 个路径点, 关节 {result.joint}, 原因 {result.reason}")
+        if self.metrics is not None:
+            self.metrics.increment("commands_rejected")
+        return result
+
+    def _last_joint_state(self):
+        """已知的最新关节角度, 不发起网络请求: 后台采集的数据足够新时使用采集数据, 否则为最近一次发出的关节目标"""
+        joint_degree = self.get_joint_state(self.telemetry_max_age)
+        return self._last_joint_target if joint_degree is None else joint_degree
+
+    def _joint_target(self, command: str, data: list):
+        """关节目标命令的目标关节角度, 单位:度; 其它命令或无法确定完整目标时返回 None"""
+        if command in ("set_joint_angle_all_time", "set_joint_angle_all"):
+            return list(data[1:7])
+        if command == "set_joint_initialize":
+            return [0.0] * 6
+        if command == "set_joint_angle":
+            current = self._last_joint_state()
+            if current is None:
+                return None
+            target = list(current)
+            target[int(data[0]) - 1] = data[2]
+            return target
+        return None
+
+    def enable_telemetry(self, rate: float = 50.0, capacity: int = 4096, max_age: float = None) -> None:
+        """开启后台关节状态采集
+
+        通过长连接按固定频率读取关节角度, 保存到带时间戳的环形缓冲区.
+        开启后 get_joint_state 直接返回最新状态, 使用当前关节角度的正逆解也不再单独发起查询.
+
+        :param rate: 采集频率, 单位:Hz
+        :param capacity: 环形缓冲区最多保存的状态条数
+        :param max_age: 最新状态的有效时长, 单位:秒, 超过时回退为实时查询, 默认为 3 个采集周期
+        """
+        from blinx_robots.robot_arm_telemetry import JointTelemetry
+        self.disable_telemetry()
+        self.telemetry = JointTelemetry(self._poll_joint_degree_all, rate, capacity)
+        self.telemetry_max_age = 3.0 / rate if max_age is None else max_age
+        self.telemetry.start()
+        logger.info(f"开启关节状态采集: {rate} Hz")
+
+    def disable_telemetry(self) -> None:
+        """停止后台关节状态采集"""
+        if self.telemetry is not None:
+            self.telemetry.stop()
+            self.telemetry = None
+
+    def _poll_joint_degree_all(self):
+        """后台采集使用的关节角度查询, 失败时返回 None"""
+        joint_degree_status = self.response_dispatcher.register("get_joint_angle_all")
+        self._put_command("get_joint_angle_all", None, joint_degree_status)
+        return self.get_command_response(joint_degree_status, timeout=self.TELEMETRY_POLL_TIMEOUT).get('data') or None
+
+    def get_joint_state(self, max_age: float = None):
+        """读取后台采集的最新关节角度, 不发起网络请求
+
+        :param max_age: 允许的最大数据时长, 单位:秒, 默认不限制
+        :return: [q1, q2, q3, q4, q5, q6], 单位:度; 未开启采集或数据过期时返回 None
+        """
+        if self.telemetry is None:
+            return None
+        return self.telemetry.latest(max_age)
+
+    def get_joint_history(self, seconds: float = None, count: int = None):
+        """查询后台采集的关节状态历史
+
+        :param seconds: 最近多少秒内的数据, 优先于 count
+        :param count: 最近多少条数据, 默认为缓冲区中的全部数据
+        :return: (timestamps, joints) numpy 数组, 时间戳为 time.monotonic(), 关节角度单位:度
+        """
+        if self.telemetry is None:
+            logger.error("关节状态采集未开启!")
+            return None
+        if seconds is not None:
+            return self.telemetry.buffer.window(seconds)
+        return self.telemetry.buffer.history(count)
+
+    def _current_joint_degree(self):
+        """当前关节角度: 后台采集的数据足够新时直接使用, 否则实时查询"""
+        joint_degree = self.get_joint_state(self.telemetry_max_age)
+        if joint_degree is None:
+            joint_degree = self.get_joint_degree_all().get('data')
+        return joint_degree
+
+    def enable_emergency_stop_channel(self, host: str = None, port: int = None, heartbeat_interval: float = 1.0) -> bool:
+        """开启专用急停通道
+
+        急停通道单独保持一条带心跳的长连接, 急停帧预先编码, 不经过命令队列, 触发时不需要重新握手.
+        开启后 set_robot_arm_emergency_stop 优先通过急停通道发送, 通道不可用时退回命令连接.
+
+        :param host: 机械臂 IP 地址, 默认与命令连接相同
+        :param port: 机械臂端口, 默认与命令连接相同
+        :param heartbeat_interval: 心跳间隔, 单位:秒
+        :return: 急停通道是否已连接
+        """
+        from blinx_robots.robot_arm_emergency_stop import EmergencyStopChannel
+        self.disable_emergency_stop_channel()
+        host = host or self.communication_strategy.host
+        port = port or self.communication_strategy.port
+        self.emergency_stop_channel = EmergencyStopChannel(host, port, heartbeat_interval)
+        connected = self.emergency_stop_channel.start()
+        if not connected:
+            logger.error("急停通道连接失败, 将在后台继续重连!")
+        return connected
+
+    def disable_emergency_stop_channel(self) -> None:
+        """关闭专用急停通道"""
+        if self.emergency_stop_channel is not None:
+            self.emergency_stop_channel.stop()
+            self.emergency_stop_channel = None
+
+    def enable_metrics(self):
+        """开启运行指标统计: 每个命令的入队、发送、响应耗时, 队列深度, 逆解耗时与迭代次数, 连接中断次数
+
+        :return: RobotArmMetrics, 也可以通过 get_metrics / export_metrics 读取
+        """
+        from blinx_robots.robot_arm_metrics import RobotArmMetrics
+        metrics = RobotArmMetrics()
+        metrics.add_gauge("command_queue_depth", self.command_queue.qsize)
+        metrics.add_gauge("recv_data_buffer_depth", self.recv_data_buffer.qsize)
+        metrics.add_gauge("pending_responses", self.response_dispatcher.pending_count)
+        self.metrics = metrics
+        return metrics
+
+    def get_metrics(self) -> dict:
+        """运行指标快照, 耗时单位:秒; 未开启统计时返回空字典"""
+        return {} if self.metrics is None else self.metrics.snapshot()
+
+    def export_metrics(self) -> str:
+        """以 Prometheus 文本格式导出运行指标; 未开启统计时返回空字符串"""
+        return "" if self.metrics is None else self.metrics.to_prometheus()
+
+    def _put_command(self, command: str, data: list = None, response_future=None, priority=None, deadline: float = None) -> int:
+        """将命令编码为协议帧后放入发送队列
+
+        :param command: 协议命令名称, 如 set_joint_angle_all_time
+        :param data: 命令参数, 为 None 时不携带 data 字段
+        :param response_future: 等待该命令响应的 Future, 用于统计响应耗时; 不需要等待响应时为 None
+        :param priority: 优先级类别 safety / query / stateful, 默认按命令名称确定, 见 COMMAND_PRIORITIES
+        :param deadline: 截止时间, 提交后多少秒内未发送则丢弃, None 表示不限制
+        :return: 命令 id, 可用于 cancel_command; 关节目标未通过轨迹检查时不发送, 返回 None
+        """
+        if not self._check_joint_target(command, data):
+            return self._reject_command(command, response_future)
+        if not self.thread_work_flag:
+            # 连接已中断或已关闭, 命令不会再被发送, 让等待响应的调用方立即返回
+            self.response_dispatcher.fail_all(ConnectionError("机械臂通讯已中断"))
+        if priority is None:
+            priority = COMMAND_PRIORITIES.get(command, PRIORITY_STATEFUL)
+        item = (command, encode_command(command, data), response_future, time.perf_counter())
+        command_id = self.command_queue.put(item, priority, deadline)
+        if response_future is not None:
+            response_future.command_id = command_id
+        if self.recorder is not None and command in ("set_end_tool", "set_robot_io_interface"):
+            self._record_io(command, data, response_future)
+        return command_id
+
+    def _check_joint_target(self, command: str, data: list) -> bool:
+        """所有命令放入发送队列前的轨迹检查入口, 通过时记录关节目标
+
+        :return: 命令是否可以发送; 未开启轨迹检查或不是关节目标命令时返回 True
+        """
+        target = self._joint_target(command, data)
+        validator = self.trajectory_validator
+        # 初始化 (关节归零) 用于恢复机械臂状态, 不做检查
+        if validator is not None and command != "set_joint_initialize":
+            if target is not None:
+                if self._reject_trajectory([target]) is not None:
+                    return False
+            elif command == "set_joint_angle":
+                # 当前关节角度未知, 只检查该关节的限位
+                low, high = validator.qlim[:, int(data[0]) - 1]
+                if not low - validator.tolerance <= data[2] <= high + validator.tolerance:
+                    logger.error(f"轨迹检查未通过: 关节 {data[0]}, 原因 joint_limit")
+                    if self.metrics is not None:
+                        self.metrics.increment("commands_rejected")
+                    return False
+        if target is not None:
+            self._last_joint_target = target
+        return True
+
+    def _reject_command(self, command: str, response_future) -> None:
+        """关节目标未通过轨迹检查, 命令不发送, 让等待它响应的调用方立即返回失败"""
+        logger.error(f"关节目标未通过轨迹检查, 不发送: {command}")
+        if response_future is not None:
+            self.response_dispatcher.discard(response_future, reply_expected=False)
+        return None
+
+    def _drop_command(self, item, reason: str) -> None:
+        """发送队列中的命令被取消或超过截止时间, 让等待它响应的调用方立即返回失败"""
+        _, frame, response_future, _ = item
+        logger.warning(f"命令未发送即被丢弃 ({reason}): {frame.decode('utf-8').strip()}")
+        if response_future is not None:
+            self.response_dispatcher.discard(response_future, reply_expected=False)
+        if self.metrics is not None:
+            self.metrics.increment(f"commands_{reason}")
+
+    def cancel_command(self, command_id: int) -> bool:
+        """取消一条尚未发送的命令, 等待其响应的调用方会收到失败结果
+
+        :param command_id: 命令 id, 即 submit_command 返回的 Future 的 command_id 属性
+        :return: 命令是否尚未发送并已取消
+        """
+        return self.command_queue.cancel(command_id)
+
+    def cancel_commands(self, priority_class) -> int:
+        """取消某一优先级类别中所有尚未发送的命令
+
+        :param priority_class: 优先级类别 safety / query / stateful
+        :return: 取消的命令数量
+        """
+        count = self.command_queue.cancel_class(priority_class)
+        if count:
+            logger.warning(f"已取消 {count} 条 {priority_class} 类命令")
+        return count
+
+    def _observe_sent_command(self, command_name: str, response_future, enqueue_time: float) -> None:
+        """记录命令的排队耗时, 并在收到响应时记录响应耗时"""
+        metrics = self.metrics
+        send_time = time.perf_counter()
+        metrics.increment("commands_sent")
+        metrics.observe_command(command_name, "queue_wait", send_time - enqueue_time)
+        if response_future is None:
+            return
+
+        def _on_response(future):
+            if future.cancelled() or future.exception() is not None:
+                return
+            ack_time = time.perf_counter()
+            metrics.observe_command(command_name, "ack", ack_time - send_time)
+            metrics.observe_command(command_name, "round_trip", ack_time - enqueue_time)
+
+        response_future.add_done_callback(_on_response)
+
     def start_communication(self) -> None:
         """机械臂开始连接"""
         try:
@@ -50,43 +417,70 @@ class BlxRobotArm(object):
         
     def end_communication(self) -> None:
         """机械臂结束连接"""
-        # todo 不同的连接策略，关闭连接的方式可能不同
         logger.warning("机械臂通讯关闭!")
+        if self.servo is not None:
+            self.servo.stop()
+            self.servo = None
+        self.stop_recording()
+        self.disable_telemetry()
+        self.disable_emergency_stop_channel()
         self.thread_work_flag = False
+        self.communication_strategy.close()
+        self.response_dispatcher.fail_all(ConnectionError("机械臂通讯已关闭"))
     
     def command_sender(self) -> None:
         """发送到机械臂命令线程"""
-        # 不同的连接策略，发送，接收命令的方式可能不同
+        # 所有命令复用通讯策略持有的同一条长连接, 不再为每条命令重新握手
         while self.thread_work_flag:
-            time.sleep(0.1)
-            if not self.command_queue.empty():
-                try:
-                    with self.communication_strategy.connect() as client:
-                        command = self.command_queue.get()
-                        logger.debug(f"发送命令: {command.strip()}")
-                        client.sendall(command.encode('utf-8'))
-                except Exception as e:
-                    logger.error(f"发送命令失败: {e}")
-                    self.thread_work_flag = False
+            try:
+                command, frame, response_future, enqueue_time = self.command_queue.get(timeout=0.1)
+            except Empty:
+                continue
+            try:
+                logger.debug(f"发送命令: {frame.decode('utf-8').strip()}")
+                if self.metrics is not None:
+                    self._observe_sent_command(command, response_future, enqueue_time)
+                self.communication_strategy.send(frame)
+            except Exception as e:
+                logger.error(f"发送命令失败: {e}")
+                if self.metrics is not None:
+                    self.metrics.increment("send_errors")
+                self._connection_lost(ConnectionError(f"发送命令失败: {e}"))
     
     def command_receiver(self) -> None:
         """接收机械臂返回信息的线程"""
+        frame_buffer = FrameBuffer()
         try:
-            with self.communication_strategy.connect() as client:
-                while self.thread_work_flag:
-                    time.sleep(0.1)
-                    recv_data = client.recv(1024).decode('utf-8')
-                    # logger.debug(f"接收数据: {recv_data.strip()}")
-                    # 放入队列前, 将粘包的数据进行处理
-                    recv_data_list = list(filter(lambda s: s and s.strip(), recv_data.split('\r\n')))
-                    for recv_data in recv_data_list:
-                        self.recv_data_buffer.put(recv_data)
-                    
-                    # 打印队列中的数据的长度, 用于调试
-                    # logger.debug(f"接收数据队列长度: {self.recv_data_buffer.qsize()}")
+            while self.thread_work_flag:
+                # 等待连接可读, 超时后重新检查线程运行标志
+                if not self.communication_strategy.wait_readable(0.1):
+                    continue
+                frame_buffer.commit(self.communication_strategy.recv_into(frame_buffer.writable()))
+                # 只解析完整的帧, 被拆开的半帧留在缓冲区等待下一次读取
+                for frame in frame_buffer.frames():
+                    try:
+                        response = json.loads(frame)
+                    except ValueError:
+                        logger.error(f"无法解析的响应消息: {frame!r}")
+                        continue
+                    # logger.debug(f"接收数据: {response}")
+                    if not self.response_dispatcher.dispatch(response):
+                        # 没有调用方等待的消息, 保留最近的若干条用于调试
+                        if self.recv_data_buffer.qsize() >= self.RECV_DATA_BUFFER_SIZE:
+                            self.recv_data_buffer.get_nowait()
+                        self.recv_data_buffer.put(response)
         except Exception as e:
-            logger.error(f"接收数据失败: {e}")
-            self.thread_work_flag = False
+            if self.thread_work_flag:
+                logger.error(f"接收数据失败: {e}")
+            self._connection_lost(ConnectionError(f"机械臂通讯中断: {e}"))
+
+    def _connection_lost(self, error: ConnectionError) -> None:
+        """连接中断 (对端关闭或收发出错): 停止收发线程, 让所有等待响应的调用方立即返回失败"""
+        if self.thread_work_flag and self.metrics is not None:
+            self.metrics.increment("connection_losses")
+        self.thread_work_flag = False
+        self.communication_strategy.close()
+        self.response_dispatcher.fail_all(error)
     
     def set_robot_arm_init(self) -> str:
         """机械臂初始化，将机械臂关节角度归零
@@ -95,13 +489,12 @@ class BlxRobotArm(object):
         :return failed: {"command": "set_joint_initialize", "status": "false"}
         """
         logger.info("机械臂初始化!")
-        robot_arm_init_status = self.task_executor.submit(self.get_command_response, "set_joint_initialize")
+        robot_arm_init_status = self.response_dispatcher.register("set_joint_initialize")
         
         payload = [0]
-        command = json.dumps({"command": "set_joint_initialize", "data": payload}).replace(' ', "").strip() + '\r\n'
-        self.command_queue.put(command)
+        self._put_command("set_joint_initialize", payload, robot_arm_init_status)
         
-        robot_arm_init_status_result = json.loads(robot_arm_init_status.result()).get('data')
+        robot_arm_init_status_result = self.get_command_response(robot_arm_init_status).get('data')
         if robot_arm_init_status_result:
             return json.dumps({"command": "set_joint_initialize", "status": True})
         else:
@@ -117,12 +510,11 @@ class BlxRobotArm(object):
         :return success: {"command": "set_joint_angle", "status": "true"}
         :return failed: {"command": "set_joint_angle", "status": "false"}
         """
-        get_command_response_status = self.task_executor.submit(self.get_command_response, "move_in_place")
+        get_command_response_status = self.response_dispatcher.register("move_in_place")
         payload = [joint_number, speed_percentage, joint_degree]
-        command = json.dumps({"command": "set_joint_angle", "data": payload}).replace(' ', "").strip() + '\r\n'
-        self.command_queue.put(command)
+        self._put_command("set_joint_angle", payload, get_command_response_status)
         
-        get_command_response_status_result = json.loads(get_command_response_status.result()).get('data')
+        get_command_response_status_result = self.get_command_response(get_command_response_status).get('data')
         if get_command_response_status_result:
             return json.dumps({"command": "set_joint_angle", "status": True})
         else:
@@ -134,13 +526,12 @@ class BlxRobotArm(object):
         :return success: {"command": "set_robot_arm_home", "status": "true"}
         :return failed: {"command": "set_robot_arm_home", "status": "false"}
         """
-        robot_arm_to_home_status = self.task_executor.submit(self.get_command_response, "move_in_place")
-        command = json.dumps({"command": "set_joint_angle_all", "data": [100, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]}).replace(' ', "").strip() + '\r\n'
-        self.command_queue.put(command)
+        robot_arm_to_home_status = self.response_dispatcher.register("move_in_place")
+        self._put_command("set_joint_angle_all", [100, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0], robot_arm_to_home_status)
         logger.warning("机械臂回零!")
         
-        robot_arm_to_home_status_result = json.loads(robot_arm_to_home_status.result()).get('data')
-        if robot_arm_to_home_status:
+        robot_arm_to_home_status_result = self.get_command_response(robot_arm_to_home_status).get('data')
+        if robot_arm_to_home_status_result:
             return json.dumps({"command": "set_robot_arm_home", "status": True})
         else:
             return json.dumps({"command": "set_robot_arm_home", "status": False})
@@ -155,14 +546,13 @@ class BlxRobotArm(object):
         :return failed: {"command": "set_joint_angle_all_time", "status": "false"}
         """
         if len(args) == 6:
-            set_joint_angle_all_time_status = self.task_executor.submit(self.get_command_response, "move_in_place")
+            set_joint_angle_all_time_status = self.response_dispatcher.register("move_in_place")
             joints_degree = list(args)
             payload = [speed_percentage]
             payload.extend(joints_degree)
-            command = json.dumps({"command": "set_joint_angle_all_time", "data": payload}).replace(' ', "").strip() + '\r\n'
-            self.command_queue.put(command)
+            self._put_command("set_joint_angle_all_time", payload, set_joint_angle_all_time_status)
             
-            set_joint_angle_all_time_status_result = json.loads(set_joint_angle_all_time_status.result()).get('data')
+            set_joint_angle_all_time_status_result = self.get_command_response(set_joint_angle_all_time_status).get('data')
             if set_joint_angle_all_time_status_result:
                 return json.dumps({"command": "set_joint_angle_all_time", "status": True})
             else:
@@ -175,12 +565,21 @@ class BlxRobotArm(object):
         """机械臂紧急停止
         
         :return success: {"command": "set_joint_emergency_stop", "status": "true"}
+        :return failed: {"command": "set_joint_emergency_stop", "status": "false"}, 急停通道与命令连接均不可用
         """
         # 需要立即执行的命令，不需要等待命令执行结果, 也不通过命令发送线程发送
-        with self.communication_strategy.connect() as client:
-            command = json.dumps({"command": "set_joint_emergency_stop", "data": [0]}).replace(' ', "").strip() + '\r\n'
-            client.send(command.encode('utf-8'))
-            logger.warning("机械臂紧急停止!")
+        # 优先使用专用急停通道, 不可用时通过已建立的命令连接发送; 不会为急停重新握手, 避免等待连接重试
+        channel = self.emergency_stop_channel
+        delivered = channel is not None and channel.trigger()
+        if not delivered:
+            delivered = self.communication_strategy.send_if_connected(encode_command("set_joint_emergency_stop", [0]))
+        # 队列中尚未发送的运动、延时、IO 等命令不再执行
+        self.command_queue.cancel_class(PRIORITY_STATEFUL)
+        self._last_joint_target = None  # 机械臂停在运动途中, 位置未知
+        if not delivered:
+            logger.critical("急停命令发送失败! 急停通道与命令连接均不可用, 机械臂没有收到急停命令!")
+            return json.dumps({"command": "set_joint_emergency_stop", "status": False})
+        logger.warning("机械臂紧急停止!")
         return json.dumps({"command": "set_joint_emergency_stop", "status": True})
     
     def set_robot_end_tool(self, io: int, status: bool) -> str:
@@ -192,10 +591,9 @@ class BlxRobotArm(object):
         :return success: {"command": "set_end_tool", "status": true}
         :return failed: {"command": "set_end_tool", "status": false}
         """
-        end_tool_status = self.task_executor.submit(self.get_command_response, "set_end_tool")
-        command = json.dumps({"command": "set_end_tool", "data": [io, status]}).replace(' ', "").strip() + '\r\n'
-        self.command_queue.put(command)
-        end_tool_status_result = json.loads(end_tool_status.result()).get('data')
+        end_tool_status = self.response_dispatcher.register("set_end_tool")
+        self._put_command("set_end_tool", [io, status], end_tool_status)
+        end_tool_status_result = self.get_command_response(end_tool_status).get('data')
         if end_tool_status_result:
             return json.dumps({"command": "set_end_tool", "status": True})
         else:
@@ -210,10 +608,9 @@ class BlxRobotArm(object):
         :return success: {"command": "set_io_status", "status": true}
         :return failed: {"command": "set_io_status", "status": false}
         """
-        io_status = self.task_executor.submit(self.get_command_response, "set_robot_io_interface")
-        command = json.dumps({"command": "set_robot_io_interface", "data": [io, status]}).replace(' ', "").strip() + '\r\n'
-        self.command_queue.put(command)
-        io_status_result = json.loads(io_status.result()).get('data')
+        io_status = self.response_dispatcher.register("set_robot_io_interface")
+        self._put_command("set_robot_io_interface", [io, status], io_status)
+        io_status_result = self.get_command_response(io_status).get('data')
         if io_status_result:
             return json.dumps({"command": "set_io_status", "status": True})
         else:
@@ -230,8 +627,7 @@ class BlxRobotArm(object):
             # 限制延时时间范围
             if 0 <= delay_time <= 3000:
                 # 获取命令执行结果
-                command = json.dumps({"command": "set_time_delay", "data": [delay_time]}).replace(' ', "").strip() + '\r\n'
-                self.command_queue.put(command)
+                self._put_command("set_time_delay", [delay_time])
                 return json.dumps({"command": "set_time_delay", "status": True})
             else:
                 logger.error("延时时间超出范围!")
@@ -247,12 +643,11 @@ class BlxRobotArm(object):
         :return success: {"command": "set_robot_mode", "status": true}
         :return failed: {"command": "set_robot_mode", "status": false}
         """
-        set_cmd_mode_thread = self.task_executor.submit(self.get_command_response, "set_robot_mode")
+        set_cmd_mode_future = self.response_dispatcher.register("set_robot_mode")
         
-        command = json.dumps({"command": "set_robot_mode", "data": [mode]}).replace(' ', "").strip() + '\r\n'
-        self.command_queue.put(command)
+        self._put_command("set_robot_mode", [mode], set_cmd_mode_future)
         
-        set_cmd_mode_status = json.loads(set_cmd_mode_thread.result()).get('data')
+        set_cmd_mode_status = self.get_command_response(set_cmd_mode_future).get('data')
         logger.debug(f"机械臂命令模式设置结果: {set_cmd_mode_status}")
         if set_cmd_mode_status:
             logger.warning(f"机械臂命令执行模式设置成功!")
@@ -273,6 +668,9 @@ class BlxRobotArm(object):
         :return success: {"command": "set_joint_degree_by_coordinate", "status": true}
         :return failed: {"command": "set_joint_degree_by_coordinate", "status": false}
         """
+        if not self.is_reachable(*args):
+            logger.error("目标位姿不在机械臂可达空间内!")
+            return json.dumps({"command": "set_joint_degree_by_coordinate", "status": False})
         # 通过末端工具坐标与姿态，计算机械臂逆解
         inverse_solution = json.loads(self.get_inverse_solution(*args)).get('data')
         if inverse_solution:
@@ -284,33 +682,349 @@ class BlxRobotArm(object):
             logger.error("获取机械臂逆解失败!")
             return json.dumps({"command": "set_joint_degree_by_coordinate", "status": False})
 
+    def stream_joint_trajectory(self, trajectory, speed_percentage: int = 50, period: float = 0.1) -> str:
+        """按固定周期连续发送关节轨迹, 不等待每个路径点的执行结果
+        
+        INT 立即执行模式下, 新的路径点会在机械臂到达上一个点之前送达, 机械臂不会在每个路径点停顿;
+        所有路径点的执行结果在发送完成后统一等待.
+        
+        :param trajectory: (N, 6) 机械臂关节角度, 单位:度
+        :param speed_percentage: 机械臂关节运动速度百分比 1~100
+        :param period: 相邻路径点的发送间隔, 单位:秒
+        
+        :return success: {"command": "stream_joint_trajectory", "status": true}
+        :return failed: {"command": "stream_joint_trajectory", "status": false}
+        :return rejected: {"command": "stream_joint_trajectory", "status": false, "failed_index": 12, "reason": "joint_speed"}, 开启轨迹检查且未通过时不发送任何路径点
+        """
+        import numpy as np
+        # 以已知的最新关节角度为起点, 同时检查从当前位置到第一个路径点的关节变化
+        rejected = self._reject_trajectory(trajectory, period, self._last_joint_state())
+        if rejected is not None:
+            return json.dumps({"command": "stream_joint_trajectory", "status": False,
+                               "failed_index": rejected.index, "reason": rejected.reason})
+        if self.robot_cmd_model != "INT":
+            logger.warning("SEQ 顺序模式下机械臂会在每个路径点停顿, 连续运动请先切换到 INT 模式!")
+        response_futures = []
+        next_send_time = time.perf_counter()
+        for joints_degree in np.round(np.asarray(trajectory, dtype=float), 3).tolist():
+            response_futures.append(self.response_dispatcher.register("move_in_place"))
+            payload = [speed_percentage]
+            payload.extend(joints_degree)
+            self._put_command("set_joint_angle_all_time", payload, response_futures[-1])
+            next_send_time += period
+            delay = next_send_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        
+        status = all([self.get_command_response(future).get('data') for future in response_futures])
+        return json.dumps({"command": "stream_joint_trajectory", "status": status})
+
+    def plan_joint_trajectory(self, *args, start: list = None, max_velocity=None, max_acceleration=None, max_jerk=None):
+        """规划到目标关节角度的同步梯形 / S 形轨迹, 不发送任何命令
+
+        :param *args: 目标关节角度 q1, q2, q3, q4, q5, q6, 单位:度
+        :param start: 起点关节角度, 单位:度, 默认读取机械臂当前关节角度
+        :param max_velocity: 关节最大速度, 单位:度/秒, 标量或每个关节一个值
+        :param max_acceleration: 关节最大加速度, 单位:度/秒²
+        :param max_jerk: 关节最大加加速度, 单位:度/秒³, 给出时使用 S 形曲线
+        :return: JointTrajectory, duration 为预计运动时间 (单位:秒); 读取当前关节角度失败时返回 None
+        """
+        from blinx_robots import robot_arm_trajectory as trajectory
+        if start is None:
+            start = self._current_joint_degree()
+        if start is None or len(start) == 0:
+            logger.error("读取机械臂当前关节角度失败!")
+            return None
+        return trajectory.plan_joint_trajectory(
+            start, args,
+            trajectory.DEFAULT_MAX_VELOCITY if max_velocity is None else max_velocity,
+            trajectory.DEFAULT_MAX_ACCELERATION if max_acceleration is None else max_acceleration,
+            max_jerk,
+        )
+
+    def move_joint_trajectory(self, trajectory, period: float = 0.02, speed_percentage: int = 100) -> str:
+        """按规划的时间曲线流式发送 plan_joint_trajectory 得到的轨迹, 需要 INT 立即执行模式
+
+        :param trajectory: JointTrajectory
+        :param period: 采样与发送周期, 单位:秒
+        :param speed_percentage: 发送路径点时使用的速度百分比, 应足够大, 使机械臂能跟上采样点
+
+        :return success: {"command": "stream_joint_trajectory", "status": true}
+        :return failed: {"command": "stream_joint_trajectory", "status": false}
+        """
+        _, samples = trajectory.sample(period)
+        logger.info(f"{trajectory.profile} 轨迹: {len(samples)} 个路径点, 预计 {trajectory.duration:.3f} 秒")
+        return self.stream_joint_trajectory(samples, speed_percentage=speed_percentage, period=period)
+
+    def move_joint_trajectory_async(self, trajectory, period: float = 0.02, speed_percentage: int = 100) -> Future:
+        """move_joint_trajectory 的非阻塞版本, 运动期间调用方可以准备下一段运动
+
+        :return: Future, 结果与 move_joint_trajectory 的返回值相同
+        """
+        return self.task_executor.submit(self.move_joint_trajectory, trajectory, period, speed_percentage)
+
+    def start_recording(self, path: str, rate: float = 20.0, flush_interval: float = 1.0):
+        """开始示教录制: 关节状态与 IO 操作追加写入二进制录制文件
+
+        关节状态来自后台关节状态采集, 未开启时按 rate 开启, 停止录制时一并关闭.
+
+        :param path: 录制文件路径, 文件已存在时继续追加
+        :param rate: 关节状态采集频率, 单位:Hz
+        :param flush_interval: 批量写入文件的间隔, 单位:秒
+        :return: MotionRecorder
+        """
+        from blinx_robots.robot_arm_recording import MotionRecorder
+        self.stop_recording()
+        if self.telemetry is None:
+            self.enable_telemetry(rate)
+            self._recording_owns_telemetry = True
+        self.recorder = MotionRecorder(path, flush_interval)
+        self.telemetry.listeners.append(self.recorder.record_joints)
+        logger.info(f"开始录制: {path}")
+        return self.recorder
+
+    def stop_recording(self) -> None:
+        """停止录制并关闭录制文件"""
+        recorder = self.recorder
+        if recorder is None:
+            return
+        self.recorder = None
+        if self.telemetry is not None and recorder.record_joints in self.telemetry.listeners:
+            self.telemetry.listeners.remove(recorder.record_joints)
+        if self._recording_owns_telemetry:
+            self.disable_telemetry()
+            self._recording_owns_telemetry = False
+        recorder.close()
+        logger.info(f"录制结束: {recorder.path}, 共 {recorder.count} 条记录")
+
+    def _record_io(self, command: str, data: list, response_future) -> None:
+        """录制 IO 命令, 机械臂确认执行后写入录制文件
+
+        同步、*_async 与 submit_command / submit_batch 提交的 IO 命令都经过 _put_command 到这里
+        """
+        from blinx_robots.robot_arm_recording import KIND_END_TOOL, KIND_IO
+        recorder = self.recorder
+        kind = KIND_END_TOOL if command == "set_end_tool" else KIND_IO
+        io, status = data[0], data[1]
+        if response_future is None:
+            recorder.record_io(kind, io, status)
+            return
+
+        def _on_response(future):
+            if future.cancelled() or future.exception() is not None:
+                return
+            if future.result().get('data'):
+                recorder.record_io(kind, io, status)
+
+        response_future.add_done_callback(_on_response)
+
+    def play_recording(self, path: str, mode: str = "SEQ", min_joint_step: float = 1.0, period: float = 0.05,
+                       speed_percentage: int = 50, start: float = None, end: float = None, window: float = 60.0,
+                       batch_size: int = 200) -> str:
+        """回放录制文件
+
+        按时间窗口分段读取文件, 不会一次加载整个录制. 关节状态按运动距离降采样后发送, IO 操作在对应位置执行.
+        - SEQ: 路径点与 IO 命令按顺序批量提交, 由机械臂控制器排队执行, 每批最多 batch_size 条
+        - INT: 路径点按 period 重新采样后按录制时的节奏流式发送
+        回放前切换到的命令执行模式在回放结束 (包括出错) 后恢复为原来的模式.
+
+        :param path: 录制文件路径
+        :param mode: 回放使用的命令执行模式, SEQ 或 INT
+        :param min_joint_step: 降采样后相邻路径点之间的最小关节运动距离, 单位:度
+        :param period: INT 模式下路径点的发送间隔, 单位:秒
+        :param speed_percentage: 机械臂关节运动速度百分比 1~100
+        :param start: 回放起点, 相对开始录制的时间, 单位:秒
+        :param end: 回放终点, 相对开始录制的时间, 单位:秒
+        :param window: 每次读取的录制时间长度, 单位:秒
+
+        :return success: {"command": "play_recording", "status": true}
+        :return failed: {"command": "play_recording", "status": false}
+        """
+        from blinx_robots import robot_arm_recording as recording
+        motion_log = recording.MotionLog(path)
+        previous_mode = self.robot_cmd_model
+        if previous_mode != mode and not json.loads(self.set_robot_cmd_mode(mode)).get('status'):
+            return json.dumps({"command": "play_recording", "status": False})
+        window_start = 0.0 if start is None else start
+        play_end = motion_log.duration if end is None else min(end, motion_log.duration)
+        logger.info(f"回放录制: {path}, {mode} 模式, {play_end - window_start:.1f} 秒")
+        status = True
+        try:
+            while status and window_start <= play_end:
+                window_end = min(window_start + window, play_end)
+                t, joints = motion_log.joint_states(window_start, window_end)
+                events = motion_log.io_events(window_start, window_end)
+                # 窗口边界上的记录只属于前一个窗口
+                if window_end < play_end:
+                    keep = t < window_end
+                    t, joints = t[keep], joints[keep]
+                    events = [event for event in events if event[0] < window_end]
+                if mode == "SEQ":
+                    status = self._play_sequential(t, joints, events, min_joint_step, speed_percentage, batch_size)
+                else:
+                    status = self._play_immediate(t, joints, events, period, speed_percentage)
+                if window_end >= play_end:
+                    break
+                window_start = window_end
+        finally:
+            if previous_mode != mode:
+                self.set_robot_cmd_mode(previous_mode)
+        return json.dumps({"command": "play_recording", "status": status})
+
+    def _play_sequential(self, t, joints, events, min_joint_step, speed_percentage, batch_size) -> bool:
+        import numpy as np
+        from blinx_robots import robot_arm_recording as recording
+        kept = recording.downsample(joints, min_joint_step)
+        # 路径点与 IO 事件按录制时间合并, 同一时刻先执行 IO
+        items = [(float(t[i]), 1, ("set_joint_angle_all_time", [speed_percentage, *np.round(joints[i], 3).tolist()])) for i in kept]
+        items += [(event_t, 0, (recording.io_command(kind), [channel, status])) for event_t, kind, channel, status in events]
+        commands = [command for _, _, command in sorted(items, key=lambda item: item[:2])]
+        for first in range(0, len(commands), batch_size):
+            if not self.wait_all(self.submit_batch(commands[first:first + batch_size]))["status"]:
+                return False
+        return True
+
+    def _play_immediate(self, t, joints, events, period, speed_percentage) -> bool:
+        import numpy as np
+        from blinx_robots import robot_arm_recording as recording
+        boundaries = [event[0] for event in events] + [np.inf]
+        segment_start = 0
+        for boundary, event in zip(boundaries, events + [None]):
+            segment_end = int(np.searchsorted(t, boundary, side='right'))
+            if segment_end > segment_start:
+                _, samples = recording.resample(t[segment_start:segment_end], joints[segment_start:segment_end], period)
+                result = self.stream_joint_trajectory(samples, speed_percentage=speed_percentage, period=period)
+                if not json.loads(result).get('status'):
+                    return False
+            if event is not None:
+                _, kind, channel, status = event
+                if not self.wait_all([self.submit_command(recording.io_command(kind), [channel, status])])["status"]:
+                    return False
+            segment_start = segment_end
+        return True
+
+    def start_servo(self, rate: float = 100.0, **kwargs):
+        """进入笛卡尔实时伺服模式: 切换到 INT 立即执行模式, 之后通过 servo_twist 给出末端速度
+
+        :param rate: 控制频率, 单位:Hz, 通常为 50 ~ 100
+        :param kwargs: CartesianServo 的其它参数, 如 max_joint_speed、damping、twist_timeout
+        :return: CartesianServo, 启动失败时返回 None
+        """
+        from blinx_robots.robot_arm_servo import CartesianServo
+        self.stop_servo()
+        if self.robot_cmd_model != "INT":
+            self._servo_previous_mode = self.robot_cmd_model
+            if not json.loads(self.set_robot_cmd_mode("INT")).get('status'):
+                logger.error("切换到 INT 立即执行模式失败, 无法启动伺服!")
+                return None
+        servo = CartesianServo(self, rate, **kwargs)
+        if not servo.start():
+            self._restore_servo_mode()
+            return None
+        self.servo = servo
+        logger.info(f"笛卡尔伺服已启动: {rate} Hz")
+        return servo
+
+    def servo_twist(self, vx: float, vy: float, vz: float, wx: float = 0.0, wy: float = 0.0, wz: float = 0.0, timestamp: float = None) -> bool:
+        """更新伺服的末端速度, 基坐标系, 单位:米/秒, 弧度/秒
+
+        :param timestamp: 速度对应的 time.monotonic() 时间, 过期的速度直接丢弃
+        :return: 是否被采用
+        """
+        if self.servo is None:
+            logger.error("笛卡尔伺服未启动!")
+            return False
+        return self.servo.set_twist((vx, vy, vz, wx, wy, wz), timestamp)
+
+    def stop_servo(self) -> None:
+        """退出笛卡尔伺服模式, 恢复之前的命令执行模式"""
+        if self.servo is None:
+            return
+        self.servo.stop()
+        self.servo = None
+        self._restore_servo_mode()
+
+    def _restore_servo_mode(self) -> None:
+        """恢复启动伺服前的命令执行模式"""
+        if self._servo_previous_mode is not None:
+            self.set_robot_cmd_mode(self._servo_previous_mode)
+            self._servo_previous_mode = None
+
+    def _move_along_poses(self, command_name: str, poses, speed_percentage: int, velocity: float, step: float) -> str:
+        """求解路径点的连续逆解后流式发送"""
+        from blinx_robots import robot_arm_kinematics as kinematics
+        current_joints = self._current_joint_degree()
+        path = kinematics.inverse_solution_path(self.blinx_robot_arm, poses, current_joints or None)
+        if not path.success:
+            logger.error(f"路径第 {path.failed_index} 个位姿逆解失败!")
+            return json.dumps({"command": command_name, "status": False})
+        if path.discontinuities:
+            logger.error(f"路径逆解存在不连续点, 取消运动: {path.discontinuities}")
+            return json.dumps({"command": command_name, "status": False})
+        status = json.loads(self.stream_joint_trajectory(path.q, speed_percentage, period=step / velocity)).get('status')
+        return json.dumps({"command": command_name, "status": status})
+
+    def move_linear(self, *args, start_pose: list = None, speed_percentage: int = 50, velocity: float = 0.05, step: float = 0.005) -> str:
+        """机械臂末端沿直线运动到目标位姿
+        
+        :param *args: 目标位姿 x, y, z, Rx, Py, Yz, 单位:米, 弧度
+        :param start_pose: 起点位姿, 默认使用机械臂当前位姿
+        :param speed_percentage: 机械臂关节运动速度百分比 1~100
+        :param velocity: 末端直线速度, 单位:米/秒, 决定路径点的发送周期
+        :param step: 路径点间距, 单位:米
+        
+        :return success: {"command": "move_linear", "status": true}
+        :return failed: {"command": "move_linear", "status": false}
+        """
+        from blinx_robots import robot_arm_path
+        if start_pose is None:
+            start_pose = json.loads(self.get_positive_solution(current_pose=True)).get('data')
+        if len(args) != 6 or not start_pose:
+            logger.error("直线运动的位姿参数错误!")
+            return json.dumps({"command": "move_linear", "status": False})
+        poses = robot_arm_path.linear_path(start_pose, args, step)
+        return self._move_along_poses("move_linear", poses, speed_percentage, velocity, step)
+
+    def move_arc(self, via_pose: list, end_pose: list, start_pose: list = None, speed_percentage: int = 50, velocity: float = 0.05, step: float = 0.005) -> str:
+        """机械臂末端沿圆弧经过途经点运动到目标位姿
+        
+        :param via_pose: 途经点位姿 x, y, z, Rx, Py, Yz, 只使用位置
+        :param end_pose: 目标位姿 x, y, z, Rx, Py, Yz, 单位:米, 弧度
+        :param start_pose: 起点位姿, 默认使用机械臂当前位姿
+        :param speed_percentage: 机械臂关节运动速度百分比 1~100
+        :param velocity: 末端线速度, 单位:米/秒, 决定路径点的发送周期
+        :param step: 路径点间距, 单位:米
+        
+        :return success: {"command": "move_arc", "status": true}
+        :return failed: {"command": "move_arc", "status": false}
+        """
+        from blinx_robots import robot_arm_path
+        if start_pose is None:
+            start_pose = json.loads(self.get_positive_solution(current_pose=True)).get('data')
+        try:
+            poses = robot_arm_path.arc_path(start_pose, via_pose, end_pose, step)
+        except (ValueError, TypeError) as e:
+            logger.error(f"圆弧运动的位姿参数错误: {e}")
+            return json.dumps({"command": "move_arc", "status": False})
+        return self._move_along_poses("move_arc", poses, speed_percentage, velocity, step)
+
     def get_joint_degree_all(self) -> dict:
         """获取机械臂所有关节角度
         
         :return: {"command": "get_joint_angle_all", "data": [10, 20, 30, 40, 50, 60]}
         """
-        before_joint_data_temp = {}
-        with self.communication_strategy.connect() as client:
-            command = json.dumps({"command": "get_joint_angle_all"}).replace(' ', "").strip() + '\r\n'
-            client.sendall(command.encode('utf-8'))
-            try:
-                recv_data = json.loads(client.recv(1024).decode('utf-8'))
-                before_joint_data_temp = recv_data  # 保留最后一次的关节角度数据
-            except json.JSONDecodeError:
-                logger.exception("获取机械臂关节角度失败!")
-                # 失败后发送最上一次的角度数据
-                return before_joint_data_temp
-        return recv_data
+        joint_degree_status = self.response_dispatcher.register("get_joint_angle_all")
+        self._put_command("get_joint_angle_all", None, joint_degree_status)
+        return self.get_command_response(joint_degree_status)
     
     def get_robot_cmd_mode(self) -> str:
         """获取机械臂命令执行模式
         
         :return: {"command": "get_robot_mode", "data": "SEQ"}
         """
-        robot_cmd_mode = self.task_executor.submit(self.get_command_response, "get_robot_mode")
-        get_cmd_mode_payload = json.dumps({"command": "get_robot_mode"}).replace(' ', "") + '\r\n'
-        self.command_queue.put(get_cmd_mode_payload)
-        return robot_cmd_mode.result()
+        robot_cmd_mode = self.response_dispatcher.register("get_robot_mode")
+        self._put_command("get_robot_mode", None, robot_cmd_mode)
+        return json.dumps(self.get_command_response(robot_cmd_mode))
              
     def get_positive_solution(self, *args, current_pose: bool = False) -> str:
         """获取机械臂正解
@@ -324,17 +1038,15 @@ class BlxRobotArm(object):
         :return failed: {"command": "get_positive_solution", "data": []}
         """
         if current_pose:
-            joint_angle_list = self.get_joint_degree_all().get('data')
+            joint_angle_list = self._current_joint_degree()
         else:
             joint_angle_list = list(args)
 
         if joint_angle_list and len(joint_angle_list) == 6:
             # 计算机械臂正解
-            arm_joint_radians = np.radians(joint_angle_list)
-            translation_vector = self.blinx_robot_arm.fkine(arm_joint_radians)
-            x, y, z = np.round(translation_vector.t, 3)  # 平移向量
-            Rx, Py, Yz = np.round(translation_vector.rpy(order="zyx"), 3)  # 旋转角
-            positive_solution = json.dumps({"command": "get_positive_solution", "data": [x, y, z, Rx, Py, Yz]})
+            from blinx_robots import robot_arm_kinematics as kinematics
+            pose = kinematics.positive_solution(self.blinx_robot_arm, joint_angle_list)
+            positive_solution = json.dumps({"command": "get_positive_solution", "data": pose})
             logger.debug(f"机械臂正解: {positive_solution}")
             return positive_solution
         else:
@@ -342,11 +1054,23 @@ class BlxRobotArm(object):
             positive_solution = json.dumps({"command": "get_positive_solution", "data": []})
             return positive_solution
 
-    def get_inverse_solution(self, *args, current_pose: bool = False) -> str:
+    def get_positive_solution_batch(self, joint_degrees, transforms: bool = False):
+        """批量获取机械臂正解, 用于轨迹校验、可视化等大批量计算
+
+        :params joint_degrees: (N, 6) 机械臂关节角度数组, 单位:度
+        :params transforms: 为 True 时返回 (N, 4, 4) 齐次变换矩阵
+        
+        :return: (N, 6) numpy 数组 [x, y, z, Rx, Py, Yz], 单位:米, 弧度; 或 (N, 4, 4) 变换矩阵
+        """
+        from blinx_robots import robot_arm_kinematics as kinematics
+        return kinematics.batch_positive_solution(self.blinx_robot_arm, joint_degrees, transforms)
+
+    def get_inverse_solution(self, *args, current_pose: bool = False, q_seed: list = None) -> str:
         """获取机械臂逆解
         
         :params *args: 机械臂 x, y, z, Rx, Py, Yz 坐标
         :params current_pose: 是否使用当前机械臂关节角度值
+        :params q_seed: 参考关节角度 q1 ~ q6, 单位:度, 存在多组解时返回最接近参考值的一组
         
         :return success: {"command": "get_inverse_kinematics", "data": [q1, q2, q3, q4, q5, q6]}
         :return failed: {"command": "get_inverse_kinematics", "data": []}
@@ -357,10 +1081,23 @@ class BlxRobotArm(object):
         else:
             x, y, z, Rx, Py, Yz = list(args)
 
-        R_T = SE3([x, y, z]) * rpy2tr([Rx, Py, Yz], order='zyx')
-        sol = self.blinx_robot_arm.ikine_LM(R_T, joint_limits=True)
-        if sol.success:
-            inverse_result = np.round(np.degrees(sol.q), 3).tolist()
+        import numpy as np
+        from blinx_robots import robot_arm_kinematics as kinematics
+        pose = [x, y, z, Rx, Py, Yz]
+        inverse_result = None
+        if self.ik_cache is not None:
+            branch = None if q_seed is None else self.blinx_robot_arm.configuration(np.radians(q_seed))[0]
+            cache_key = self.ik_cache.make_key(pose, branch)
+            inverse_result = self.ik_cache.get(cache_key)
+        if inverse_result is None:
+            ik_stats = {}
+            ik_start_time = time.perf_counter()
+            inverse_result = kinematics.inverse_solution(self.blinx_robot_arm, pose, q_seed, stats=ik_stats)
+            if self.metrics is not None:
+                self.metrics.observe_ik(time.perf_counter() - ik_start_time, ik_stats.get('iterations'))
+            if inverse_result and self.ik_cache is not None:
+                self.ik_cache.put(cache_key, inverse_result)
+        if inverse_result:
             ik_solution = json.dumps({"command": "get_inverse_kinematics", "data": inverse_result})
             logger.debug(f"机械臂逆解: {ik_solution}")
             return ik_solution
@@ -368,23 +1105,247 @@ class BlxRobotArm(object):
             logger.error("获取机械臂逆解失败!")
             return json.dumps({"command": "get_inverse_kinematics", "data": []})
 
-    def get_command_response(self, command_name=None) -> str:
-        """获取机械臂命令执行结果"""
-        get_command_response = False
-        while not get_command_response:
-            time.sleep(0.1)
-            # logger.warning(f"等待 {command_name} 命令响应结果...")
-            if not self.recv_data_buffer.empty():
-                data = self.recv_data_buffer.get()
-                if command_name in data:
-                    response = data
-                    get_command_response = True
-                    break
-                
-        return response
+    def get_inverse_solution_path(self, poses, q_seed: list = None, current_pose: bool = False, max_joint_step: float = 30.0) -> str:
+        """获取笛卡尔路径的连续逆解
+        
+        每个位姿以上一个位姿的解作为参考值, 保证关节轨迹尽量连续并减少迭代次数
+        
+        :params poses: (N, 6) 机械臂末端位姿 x, y, z, Rx, Py, Yz
+        :params q_seed: 第一个位姿的参考关节角度, 单位:度
+        :params current_pose: 是否使用机械臂当前关节角度作为第一个位姿的参考值
+        :params max_joint_step: 相邻两点之间允许的最大关节变化, 单位:度, 超过时记录为关节跳变
+        
+        :return success: {"command": "get_inverse_solution_path", "data": [[q1, ..., q6], ...], "failed_index": null, "discontinuities": [[index, "branch_flip"], ...]}
+        :return failed: {"command": "get_inverse_solution_path", "data": [...], "failed_index": index, "discontinuities": [...]}
+        """
+        import numpy as np
+        from blinx_robots import robot_arm_kinematics as kinematics
+        if current_pose:
+            q_seed = self._current_joint_degree() or q_seed
+        path = kinematics.inverse_solution_path(self.blinx_robot_arm, poses, q_seed, max_joint_step)
+        if not path.success:
+            logger.error(f"路径第 {path.failed_index} 个位姿逆解失败!")
+        if path.discontinuities:
+            logger.warning(f"路径逆解存在不连续点: {path.discontinuities}")
+        return json.dumps({
+            "command": "get_inverse_solution_path",
+            "data": np.round(path.q, 3).tolist(),
+            "failed_index": path.failed_index,
+            "discontinuities": path.discontinuities,
+        })
+
+    def submit_command(self, command: str, data: list = None, priority=None, deadline: float = None) -> Future:
+        """提交一条命令, 不等待执行结果
+
+        :param command: 协议命令名称, 见 COMMAND_RESPONSES, 如 set_joint_angle_all_time
+        :param data: 命令参数, 如 [50, 10, 10, 10, 10, 10, 10]
+        :param priority: 优先级类别 safety / query / stateful, 默认按命令名称确定;
+                         响应按命令名称先进先出匹配, 响应名称相同的命令应使用同一类别
+        :param deadline: 截止时间, 提交后多少秒内未发送则丢弃, 对应的 Future 以失败结束
+        :return: 收到响应后完成的 Future, 结果为响应字典 {"command": "move_in_place", "data": true};
+                 机械臂不回复的命令直接返回已完成的 Future; Future 的 command_id 属性可用于 cancel_command
+        """
+        if command not in self.COMMAND_RESPONSES:
+            raise ValueError(f"不支持批量提交的命令: {command}")
+        response_name = self.COMMAND_RESPONSES[command]
+        if response_name is None:
+            response_future = self._completed_future(command, {"command": command, "data": True})
+        else:
+            response_future = self.response_dispatcher.register(response_name)
+        command_id = self._put_command(command, data, None if response_name is None else response_future, priority, deadline)
+        response_future.command_id = command_id
+        return response_future
+
+    def submit_batch(self, commands, priority=PRIORITY_STATEFUL, deadline: float = None) -> list:
+        """流水线批量提交命令: 所有命令连续写入发送队列, 不等待上一条命令的响应
+        
+        SEQ 顺序模式下命令由机械臂控制器排队执行, 上位机只需在最后统一等待结果.
+        
+        :param commands: [(command, data), ...] 命令列表, 如 [("set_joint_angle_all_time", [50, 10, 10, 10, 10, 10, 10]), ("set_time_delay", [1000])]
+        :param priority: 整批命令使用的优先级类别, 同一类别内按提交顺序发送, 保证批内命令的执行顺序
+        :param deadline: 每条命令的截止时间, 单位:秒
+        :return: 与命令一一对应的 Future 列表, 配合 wait_all 等待
+        """
+        commands = [(command[0], command[1] if len(command) > 1 else None) for command in commands]
+        # 先整体校验, 避免只发送了一部分命令
+        for command, _ in commands:
+            if command not in self.COMMAND_RESPONSES:
+                raise ValueError(f"不支持批量提交的命令: {command}")
+        logger.info(f"批量提交 {len(commands)} 条命令")
+        return [self.submit_command(command, data, priority, deadline) for command, data in commands]
+
+    def wait_all(self, response_futures, timeout: float = None) -> dict:
+        """按提交顺序等待所有命令的响应, 遇到第一条失败的命令立即返回
+        
+        :param response_futures: submit_command / submit_batch 返回的 Future 列表
+        :param timeout: 等待全部响应的总超时时间, 单位:秒, 默认使用 command_timeout
+        
+        :return success: {"status": true, "failed_index": null, "data": [响应字典, ...]}
+        :return failed: {"status": false, "failed_index": index, "data": [失败之前的响应字典, ...]}
+        """
+        timeout = self.command_timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        results = []
+        for index, response_future in enumerate(response_futures):
+            remaining = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            response = self.get_command_response(response_future, remaining)
+            if not response.get('data'):
+                logger.error(f"第 {index} 条命令 {response_future.command_name} 执行失败: {response}")
+                return {"status": False, "failed_index": index, "data": results}
+            results.append(response)
+        return {"status": True, "failed_index": None, "data": results}
+
+    def _chain_response(self, response_future, transform) -> Future:
+        """将响应 Future 转换为调用方需要的结果
+        
+        转换在接收线程完成响应 Future 时执行, 等待中的命令不占用任何线程;
+        超时、连接中断等错误按失败响应 {"command": ..., "data": false} 处理, 与同步接口一致.
+        
+        :param response_future: response_dispatcher.register / submit_command 返回的 Future
+        :param transform: 响应字典 -> 结果的转换函数
+        """
+        result_future = Future()
+        result_future.command_name = response_future.command_name
+        result_future.response_future = response_future
+
+        def _on_response(future):
+            try:
+                response = future.result()
+            except (Exception, CancelledError) as e:
+                logger.error(f"等待 {future.command_name} 命令响应失败: {e!r}")
+                response = {"command": future.command_name, "data": False}
+            try:
+                result_future.set_result(transform(response))
+            except Exception as e:
+                result_future.set_exception(e)
+
+        response_future.add_done_callback(_on_response)
+        return result_future
+
+    def _status_response(self, response_future, command_name: str) -> Future:
+        """响应 Future -> {"command": command_name, "status": true/false} JSON 字符串的 Future"""
+        return self._chain_response(
+            response_future,
+            lambda response: json.dumps({"command": command_name, "status": bool(response.get('data'))}),
+        )
+
+    @staticmethod
+    def _completed_future(command_name: str, result) -> Future:
+        future = Future()
+        future.command_name = command_name
+        future.set_result(result)
+        return future
+
+    def set_robot_arm_init_async(self) -> Future:
+        """set_robot_arm_init 的非阻塞版本
+        
+        :return: Future, 结果与 set_robot_arm_init 的返回值相同
+        """
+        logger.info("机械臂初始化!")
+        return self._status_response(self.submit_command("set_joint_initialize", [0]), "set_joint_initialize")
+
+    def set_joint_degree_by_number_async(self, joint_number: int, speed_percentage: int, joint_degree: float) -> Future:
+        """set_joint_degree_by_number 的非阻塞版本
+        
+        :return: Future, 结果与 set_joint_degree_by_number 的返回值相同
+        """
+        response_future = self.submit_command("set_joint_angle", [joint_number, speed_percentage, joint_degree])
+        return self._status_response(response_future, "set_joint_angle")
+
+    def set_robot_arm_home_async(self) -> Future:
+        """set_robot_arm_home 的非阻塞版本
+        
+        :return: Future, 结果与 set_robot_arm_home 的返回值相同
+        """
+        logger.warning("机械臂回零!")
+        response_future = self.submit_command("set_joint_angle_all", [100, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0])
+        return self._status_response(response_future, "set_robot_arm_home")
+
+    def set_joint_degree_synchronize_async(self, *args, speed_percentage: int = 50) -> Future:
+        """set_joint_degree_synchronize 的非阻塞版本
+        
+        :return: Future, 结果与 set_joint_degree_synchronize 的返回值相同
+        """
+        if len(args) != 6:
+            logger.error("关节超出范围!")
+            return self._completed_future("set_joint_angle_all_time", json.dumps({"command": "set_joint_angle_all_time", "status": False}))
+        payload = [speed_percentage]
+        payload.extend(args)
+        return self._status_response(self.submit_command("set_joint_angle_all_time", payload), "set_joint_angle_all_time")
+
+    def set_robot_end_tool_async(self, io: int, status: bool) -> Future:
+        """set_robot_end_tool 的非阻塞版本
+        
+        :return: Future, 结果与 set_robot_end_tool 的返回值相同
+        """
+        return self._status_response(self.submit_command("set_end_tool", [io, status]), "set_end_tool")
+
+    def set_robot_io_status_async(self, io: int, status: bool) -> Future:
+        """set_robot_io_status 的非阻塞版本
+        
+        :return: Future, 结果与 set_robot_io_status 的返回值相同
+        """
+        return self._status_response(self.submit_command("set_robot_io_interface", [io, status]), "set_io_status")
+
+    def set_robot_cmd_mode_async(self, mode: str = "SEQ") -> Future:
+        """set_robot_cmd_mode 的非阻塞版本
+        
+        设置成功后直接将 robot_cmd_model 更新为请求的模式, 不再额外查询一次机械臂
+        
+        :return: Future, 结果与 set_robot_cmd_mode 的返回值相同
+        """
+        def _on_response(response):
+            if response.get('data'):
+                self.robot_cmd_model = mode
+                logger.warning(f"机械臂当前的命令执行模式: {self.robot_cmd_model}")
+                return json.dumps({"command": "set_robot_mode", "status": True})
+            logger.error(f"机械臂命令执行模式设置失败!")
+            return json.dumps({"command": "set_robot_mode", "status": False})
+
+        return self._chain_response(self.submit_command("set_robot_mode", [mode]), _on_response)
+
+    def get_joint_degree_all_async(self) -> Future:
+        """get_joint_degree_all 的非阻塞版本
+        
+        :return: Future, 结果为 {"command": "get_joint_angle_all", "data": [10, 20, 30, 40, 50, 60]}
+        """
+        return self._chain_response(self.submit_command("get_joint_angle_all"), lambda response: response)
+
+    def get_robot_cmd_mode_async(self) -> Future:
+        """get_robot_cmd_mode 的非阻塞版本
+        
+        :return: Future, 结果为 {"command": "get_robot_mode", "data": "SEQ"} JSON 字符串
+        """
+        return self._chain_response(self.submit_command("get_robot_mode"), json.dumps)
+
+    def get_command_response(self, response_future, timeout: float = None) -> dict:
+        """等待机械臂命令执行结果
+        
+        :param response_future: 发送命令前通过 response_dispatcher.register 登记的 Future
+        :param timeout: 等待超时时间, 单位:秒, 默认使用 command_timeout
+        
+        :return success: {"command": "move_in_place", "data": true}
+        :return failed: {"command": "move_in_place", "data": false}
+        """
+        command_name = response_future.command_name
+        timeout = self.command_timeout if timeout is None else timeout
+        try:
+            return response_future.result(timeout=timeout)
+        except FutureTimeoutError:
+            command_id = getattr(response_future, 'command_id', None)
+            # 命令仍在发送队列中时直接取消; 已经发出的命令, 其迟到的响应由分发器丢弃
+            if command_id is None or not self.command_queue.cancel(command_id):
+                self.response_dispatcher.discard(response_future)
+            logger.error(f"等待 {command_name} 命令响应超时!")
+            if self.metrics is not None:
+                self.metrics.increment("response_timeouts")
+        except Exception as e:
+            logger.error(f"等待 {command_name} 命令响应失败: {e}")
+        return {"command": command_name, "data": False}
     
     
 if __name__ == "__main__":
+    configure_logging("robot_arm_interface.log")
     try:
         # 连接机械臂
         host = "192.168.10.48"
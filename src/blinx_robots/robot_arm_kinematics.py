@@ -0,0 +1,319 @@
+from collections import namedtuple
+import math
+
+import numpy as np
+from spatialmath import SE3
+from spatialmath.base import rpy2tr
+
+
+# 路径逆解结果: q 为 (N, 6) 关节角 (单位:度), failed_index 为第一个无解的位姿序号,
+# discontinuities 为 [(序号, 原因), ...], 原因为 "branch_flip" 或 "joint_jump"
+PathSolution = namedtuple('PathSolution', ['q', 'success', 'failed_index', 'discontinuities'])
+
+
+def positive_solution(robot, joint_degrees) -> list:
+    """计算机械臂正解
+
+    :param robot: 机械臂模型, 如 BlinxRobotArm
+    :param joint_degrees: 机械臂关节角度值 q1, q2, q3, q4, q5, q6, 单位:度
+    :return: 机械臂末端位姿 [x, y, z, Rx, Py, Yz], 单位:米, 弧度
+    """
+    T = chain_kernel(robot).fkine([math.radians(angle) for angle in joint_degrees])
+    return [round(float(value), 3) for value in transforms_to_poses(T[None])[0]]
+
+
+class SerialChainKernel(object):
+    """针对固定连杆参数预先展开的正解 / 雅可比计算内核
+
+    每个连杆变换被拆成若干个基本变换 (绕 x 旋转、沿 x 平移、绕 z 旋转、沿 z 平移),
+    常量部分在构造时确定, 单位变换直接省略, alpha 为 ±90° 时绕 x 旋转退化为列交换.
+    计算时只对变换矩阵的列做向量化的线性组合, 不构造 4x4 矩阵, 也不创建 SE3 对象.
+    连杆参数在构造后不应再修改.
+    """
+
+    def __init__(self, robot):
+        self.n = robot.n
+        self.base = np.asarray(robot.base.A, dtype=float)
+        tool = np.asarray(robot.tool.A, dtype=float)
+        self.tool = None if np.allclose(tool, np.eye(4)) else tool
+        self.offset = [float(link.offset) for link in robot.links]
+        self.ops = []
+        for i, link in enumerate(robot.links):
+            if robot.mdh:
+                # RotX(alpha) · TransX(a) · RotZ(theta) · TransZ(d)
+                self._append_rotx(link.alpha)
+                self._append_trans('x', link.a)
+                self.ops.append(('rz', i))
+                self._append_trans('z', link.d)
+            else:
+                # RotZ(theta) · TransZ(d) · TransX(a) · RotX(alpha)
+                self.ops.append(('rz', i))
+                self._append_trans('z', link.d)
+                self._append_trans('x', link.a)
+                self._append_rotx(link.alpha)
+
+    def _append_rotx(self, alpha):
+        c, s = np.cos(alpha), np.sin(alpha)
+        if abs(s) < 1e-15:
+            if c < 0:
+                self.ops.append(('rx_pi',))
+        elif abs(c) < 1e-15:
+            self.ops.append(('rx_half', 1.0 if s > 0 else -1.0))
+        else:
+            self.ops.append(('rx', c, s))
+
+    def _append_trans(self, axis, distance):
+        if distance != 0:
+            self.ops.append(('t' + axis, distance))
+
+    def _run(self, q, jacobian: bool):
+        q = np.asarray(q, dtype=float)
+        count = q.shape[0]
+        theta = (q + np.array(self.offset)).T
+        cos_theta, sin_theta = np.cos(theta), np.sin(theta)
+        # 变换矩阵的 4 列 (旋转 x, y, z 轴与平移), 每列为 (3, N)
+        x, y, z, p = [np.repeat(self.base[:3, j:j + 1], count, axis=1) for j in range(4)]
+        axes = []
+        for op in self.ops:
+            kind = op[0]
+            if kind == 'rz':
+                if jacobian:
+                    axes.append((z, p))
+                c, s = cos_theta[op[1]], sin_theta[op[1]]
+                x, y = x * c + y * s, y * c - x * s
+            elif kind == 'tz':
+                p = p + op[1] * z
+            elif kind == 'tx':
+                p = p + op[1] * x
+            elif kind == 'rx_half':
+                y, z = (z, -y) if op[1] > 0 else (-z, y)
+            elif kind == 'rx_pi':
+                y, z = -y, -z
+            else:
+                c, s = op[1], op[2]
+                y, z = y * c + z * s, z * c - y * s
+        if self.tool is not None:
+            R = np.stack([x, y, z], axis=1)
+            x, y, z = [np.einsum('ijn,j->in', R, self.tool[:3, j]) for j in range(3)]
+            p = p + np.einsum('ijn,j->in', R, self.tool[:3, 3])
+        return x, y, z, p, axes
+
+    def _run_single(self, q, jacobian: bool):
+        """单组关节角的标量版本, 避免小数组运算的调用开销"""
+        base = self.base
+        x, y, z, p = [tuple(base[:3, j].tolist()) for j in range(4)]
+        axes = []
+        for op in self.ops:
+            kind = op[0]
+            if kind == 'rz':
+                if jacobian:
+                    axes.append((z, p))
+                theta = q[op[1]] + self.offset[op[1]]
+                c, s = math.cos(theta), math.sin(theta)
+                x, y = ((x[0] * c + y[0] * s, x[1] * c + y[1] * s, x[2] * c + y[2] * s),
+                        (y[0] * c - x[0] * s, y[1] * c - x[1] * s, y[2] * c - x[2] * s))
+            elif kind == 'tz':
+                d = op[1]
+                p = (p[0] + d * z[0], p[1] + d * z[1], p[2] + d * z[2])
+            elif kind == 'tx':
+                a = op[1]
+                p = (p[0] + a * x[0], p[1] + a * x[1], p[2] + a * x[2])
+            elif kind == 'rx_half':
+                y, z = (z, (-y[0], -y[1], -y[2])) if op[1] > 0 else ((-z[0], -z[1], -z[2]), y)
+            elif kind == 'rx_pi':
+                y, z = (-y[0], -y[1], -y[2]), (-z[0], -z[1], -z[2])
+            else:
+                c, s = op[1], op[2]
+                y, z = ((y[0] * c + z[0] * s, y[1] * c + z[1] * s, y[2] * c + z[2] * s),
+                        (z[0] * c - y[0] * s, z[1] * c - y[1] * s, z[2] * c - y[2] * s))
+        if self.tool is not None:
+            R = np.array([x, y, z]).T
+            x, y, z = [tuple((R @ self.tool[:3, j]).tolist()) for j in range(3)]
+            p = tuple((np.array(p) + R @ self.tool[:3, 3]).tolist())
+        return x, y, z, p, axes
+
+    def fkine(self, q) -> np.ndarray:
+        """计算末端齐次变换矩阵
+
+        :param q: (n,) 或 (N, n) 关节角, 单位:弧度
+        :return: (4, 4) 或 (N, 4, 4)
+        """
+        q = np.asarray(q, dtype=float)
+        if q.ndim == 1:
+            x, y, z, p, _ = self._run_single(q.tolist(), jacobian=False)
+            return np.array([
+                (x[0], y[0], z[0], p[0]),
+                (x[1], y[1], z[1], p[1]),
+                (x[2], y[2], z[2], p[2]),
+                (0.0, 0.0, 0.0, 1.0),
+            ])
+        x, y, z, p, _ = self._run(q, jacobian=False)
+        T = np.zeros((x.shape[1], 4, 4))
+        T[:, :3, 0], T[:, :3, 1], T[:, :3, 2], T[:, :3, 3] = x.T, y.T, z.T, p.T
+        T[:, 3, 3] = 1.0
+        return T
+
+    def jacob0(self, q) -> np.ndarray:
+        """计算基坐标系下的几何雅可比矩阵, 行顺序为 [vx, vy, vz, wx, wy, wz]
+
+        :param q: (n,) 或 (N, n) 关节角, 单位:弧度
+        :return: (6, n) 或 (N, 6, n)
+        """
+        q = np.asarray(q, dtype=float)
+        if q.ndim == 1:
+            _, _, _, (px, py, pz), axes = self._run_single(q.tolist(), jacobian=True)
+            return np.array([
+                (zy * (pz - oz) - zz * (py - oy), zz * (px - ox) - zx * (pz - oz), zx * (py - oy) - zy * (px - ox), zx, zy, zz)
+                for (zx, zy, zz), (ox, oy, oz) in axes
+            ]).T
+        _, _, _, p, axes = self._run(q, jacobian=True)
+        J = np.empty((p.shape[1], 6, self.n))
+        for i, (axis, origin) in enumerate(axes):
+            J[:, :3, i] = np.cross(axis, p - origin, axis=0).T
+            J[:, 3:, i] = axis.T
+        return J
+
+
+def chain_kernel(robot) -> SerialChainKernel:
+    """获取机械臂模型对应的计算内核, 第一次调用时创建并缓存在模型上"""
+    kernel = getattr(robot, '_chain_kernel', None)
+    if kernel is None:
+        kernel = robot._chain_kernel = SerialChainKernel(robot)
+    return kernel
+
+
+def fkine_batch(robot, q) -> np.ndarray:
+    """批量计算机械臂正解齐次变换矩阵
+
+    :param robot: 机械臂模型, 如 BlinxRobotArm
+    :param q: (N, n) 关节角, 单位:弧度
+    :return: (N, 4, 4) 末端齐次变换矩阵
+    """
+    return chain_kernel(robot).fkine(np.atleast_2d(q))
+
+
+def jacob0_batch(robot, q) -> np.ndarray:
+    """批量计算基坐标系下的几何雅可比矩阵
+
+    :param robot: 机械臂模型, 如 BlinxRobotArm
+    :param q: (N, n) 关节角, 单位:弧度
+    :return: (N, 6, n) 雅可比矩阵, 行顺序为 [vx, vy, vz, wx, wy, wz]
+    """
+    return chain_kernel(robot).jacob0(np.atleast_2d(q))
+
+
+def transforms_to_poses(T) -> np.ndarray:
+    """将 (N, 4, 4) 齐次变换矩阵转换为 (N, 6) 末端位姿 x, y, z, Rx, Py, Yz
+
+    姿态与 SE3.rpy(order="zyx") 一致: R = Rz(Yz) · Ry(Py) · Rx(Rx)
+    """
+    T = np.asarray(T)
+    poses = np.empty((len(T), 6))
+    poses[:, :3] = T[:, :3, 3]
+    poses[:, 3] = np.arctan2(T[:, 2, 1], T[:, 2, 2])
+    poses[:, 4] = np.arctan2(-T[:, 2, 0], np.hypot(T[:, 0, 0], T[:, 1, 0]))
+    poses[:, 5] = np.arctan2(T[:, 1, 0], T[:, 0, 0])
+    # 俯仰角为 ±90° 时横滚角与偏航角耦合, 与 spatialmath 一致取横滚角为 0
+    singular = np.abs(np.abs(T[:, 2, 0]) - 1) < 20 * np.finfo(float).eps
+    if np.any(singular):
+        Ts = T[singular]
+        poses[singular, 3] = 0.0
+        poses[singular, 4] = -np.arcsin(np.clip(Ts[:, 2, 0], -1.0, 1.0))
+        poses[singular, 5] = np.where(Ts[:, 2, 0] < 0, -np.arctan2(Ts[:, 0, 1], Ts[:, 0, 2]), np.arctan2(-Ts[:, 0, 1], -Ts[:, 0, 2]))
+    return poses
+
+
+def batch_positive_solution(robot, joint_degrees, transforms: bool = False) -> np.ndarray:
+    """批量计算机械臂正解
+
+    :param robot: 机械臂模型, 如 BlinxRobotArm
+    :param joint_degrees: (N, 6) 机械臂关节角度, 单位:度
+    :param transforms: 为 True 时返回 (N, 4, 4) 齐次变换矩阵
+    :return: (N, 6) 末端位姿 x, y, z, Rx, Py, Yz (单位:米, 弧度, 不做舍入), 或 (N, 4, 4) 变换矩阵
+    """
+    T = fkine_batch(robot, np.radians(joint_degrees))
+    return T if transforms else transforms_to_poses(T)
+
+
+def pose_to_transform(pose) -> np.ndarray:
+    """将末端位姿 x, y, z, Rx, Py, Yz 转换为 4x4 齐次变换矩阵"""
+    x, y, z, Rx, Py, Yz = pose
+    T = rpy2tr([Rx, Py, Yz], order='zyx')
+    T[:3, 3] = [x, y, z]
+    return T
+
+
+def inverse_solution(robot, pose, q_seed=None, stats: dict = None) -> list:
+    """计算机械臂逆解
+
+    优先使用机械臂模型提供的解析逆解 (ikine_analytic), 取最接近参考关节角的一组解;
+    模型不支持或解析解不存在时, 退回 roboticstoolbox 的 ikine_LM 数值迭代.
+
+    :param robot: 机械臂模型, 如 BlinxRobotArm
+    :param pose: 机械臂末端位姿 x, y, z, Rx, Py, Yz, 单位:米, 弧度
+    :param q_seed: 参考关节角, 单位:度, 默认为零位
+    :param stats: 传入字典时写入求解方法 method (analytic / ikine_LM) 与迭代次数 iterations
+    :return success: 机械臂关节角度值 [q1, q2, q3, q4, q5, q6], 单位:度
+    :return failed: []
+    """
+    stats = {} if stats is None else stats
+    R_T = pose_to_transform(pose)
+    q0 = None if q_seed is None else np.radians(q_seed)
+    if hasattr(robot, 'ikine_analytic'):
+        solutions = robot.ikine_analytic(R_T, q0=q0)
+        stats.update(method="analytic", iterations=0)
+        if len(solutions):
+            return np.round(np.degrees(solutions[0]), 3).tolist()
+    sol = robot.ikine_LM(SE3(R_T, check=False), q0=q0, joint_limits=True)
+    stats.update(method="ikine_LM", iterations=int(sol.iterations))
+    if sol.success:
+        return np.round(np.degrees(sol.q), 3).tolist()
+    return []
+
+
+def inverse_solution_path(robot, poses, q_seed=None, max_joint_step: float = 30.0) -> PathSolution:
+    """沿笛卡尔路径连续求解逆解
+
+    每个位姿都以上一个位姿的解作为参考值 (第一个位姿使用 q_seed): 解析逆解选择最接近的分支,
+    ikine_LM 以它作为迭代初值. 相邻两点之间发生逆解分支切换, 或任一关节变化超过
+    max_joint_step 时, 记录在 discontinuities 中.
+
+    :param robot: 机械臂模型, 如 BlinxRobotArm
+    :param poses: (N, 6) 末端位姿 x, y, z, Rx, Py, Yz, 单位:米, 弧度
+    :param q_seed: 参考关节角, 单位:度, 默认为零位
+    :param max_joint_step: 相邻两点之间允许的最大关节变化, 单位:度
+    :return: PathSolution, 遇到无解的位姿时停止求解, q 只包含此前的解
+    """
+    poses = np.atleast_2d(np.asarray(poses, dtype=float))
+    q_prev = np.zeros(robot.n) if q_seed is None else np.radians(q_seed)
+    has_analytic = hasattr(robot, 'ikine_analytic')
+    trajectory = np.empty((len(poses), robot.n))
+    for i, pose in enumerate(poses):
+        R_T = pose_to_transform(pose)
+        q = None
+        if has_analytic:
+            solutions = robot.ikine_analytic(R_T, q0=q_prev)
+            if len(solutions):
+                q = solutions[0]
+        if q is None:
+            sol = robot.ikine_LM(SE3(R_T, check=False), q0=q_prev, joint_limits=True)
+            if not sol.success:
+                return PathSolution(np.degrees(trajectory[:i]), False, i, _path_discontinuities(robot, trajectory[:i], max_joint_step))
+            q = sol.q
+        trajectory[i] = q_prev = q
+    return PathSolution(np.degrees(trajectory), True, None, _path_discontinuities(robot, trajectory, max_joint_step))
+
+
+def _path_discontinuities(robot, trajectory, max_joint_step) -> list:
+    """找出关节轨迹中的分支切换与关节跳变, trajectory 单位:弧度"""
+    if len(trajectory) < 2:
+        return []
+    discontinuities = []
+    if hasattr(robot, 'configuration'):
+        branch = robot.configuration(trajectory)
+        for i in np.flatnonzero(np.any(branch[1:] != branch[:-1], axis=1)) + 1:
+            discontinuities.append((int(i), "branch_flip"))
+    jumps = np.max(np.abs(np.diff(trajectory, axis=0)), axis=1) > np.radians(max_joint_step)
+    for i in np.flatnonzero(jumps) + 1:
+        discontinuities.append((int(i), "joint_jump"))
+    return sorted(discontinuities)
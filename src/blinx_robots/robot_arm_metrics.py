@@ -0,0 +1,150 @@
+import bisect
+import threading
+from collections import defaultdict
+
+# 耗时直方图的桶上界, 单位:秒, 覆盖 50 微秒 ~ 60 秒
+LATENCY_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+# 逆解迭代次数直方图的桶上界
+ITERATION_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class Histogram(object):
+    """固定分桶的直方图, 记录一次观测只需要一次二分查找和几次加法"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 最后一个桶为 +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            if self.min is None or value < self.min:
+                self.min = value
+            if self.max is None or value > self.max:
+                self.max = value
+
+    def quantile(self, q: float):
+        """按桶估算分位数 (返回所在桶的上界), 没有数据时返回 None"""
+        with self._lock:
+            if not self.count:
+                return None
+            rank, seen = q * self.count, 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank and count:
+                    return self.buckets[index] if index < len(self.buckets) else self.max
+            return self.max
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            count, total = self.count, self.sum
+            snapshot = {
+                "count": count,
+                "sum": total,
+                "mean": total / count if count else None,
+                "min": self.min,
+                "max": self.max,
+                "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+            }
+        snapshot["p50"] = self.quantile(0.5)
+        snapshot["p99"] = self.quantile(0.99)
+        return snapshot
+
+
+class RobotArmMetrics(object):
+    """机械臂 API 运行指标
+
+    - 每个命令的耗时直方图: 入队 -> 发送 (queue_wait), 发送 -> 收到响应 (ack), 入队 -> 收到响应 (round_trip)
+    - 逆解耗时与迭代次数直方图
+    - 计数器: 发送命令数、响应超时数、连接中断次数等
+    - 队列深度等瞬时值通过 gauge 回调在生成快照时读取
+    """
+
+    STAGES = ("queue_wait", "ack", "round_trip")
+
+    def __init__(self):
+        self.command_histograms = defaultdict(lambda: {stage: Histogram() for stage in self.STAGES})
+        self.ik_seconds = Histogram()
+        self.ik_iterations = Histogram(ITERATION_BUCKETS)
+        self.counters = defaultdict(int)
+        self.gauges = {}
+        self._lock = threading.Lock()
+
+    def observe_command(self, command_name: str, stage: str, seconds: float) -> None:
+        with self._lock:
+            histograms = self.command_histograms[command_name]
+        histograms[stage].observe(seconds)
+
+    def observe_ik(self, seconds: float, iterations: int = None) -> None:
+        self.ik_seconds.observe(seconds)
+        if iterations is not None:
+            self.ik_iterations.observe(iterations)
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += value
+
+    def add_gauge(self, name: str, read) -> None:
+        """登记一个瞬时值, read 为无参数函数, 在生成快照时调用"""
+        self.gauges[name] = read
+
+    def snapshot(self) -> dict:
+        """当前全部指标的快照, 耗时单位:秒"""
+        with self._lock:
+            command_histograms = dict(self.command_histograms)
+            counters = dict(self.counters)
+        return {
+            "commands": {
+                name: {stage: histogram.snapshot() for stage, histogram in histograms.items()}
+                for name, histograms in command_histograms.items()
+            },
+            "ik": {"seconds": self.ik_seconds.snapshot(), "iterations": self.ik_iterations.snapshot()},
+            "counters": counters,
+            "gauges": {name: read() for name, read in self.gauges.items()},
+        }
+
+    def to_prometheus(self, prefix: str = "blinx_robot_arm") -> str:
+        """导出 Prometheus 文本格式"""
+        lines = []
+
+        def histogram_lines(metric, histogram, labels=""):
+            snapshot = histogram.snapshot()
+            separator = "," if labels else ""
+            cumulative = 0
+            for bound, count in snapshot["buckets"].items():
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{labels}{separator}le="{bound}"}} {cumulative}')
+            label_text = f"{{{labels}}}" if labels else ""
+            lines.append(f"{metric}_sum{label_text} {snapshot['sum']}")
+            lines.append(f"{metric}_count{label_text} {snapshot['count']}")
+
+        with self._lock:
+            command_histograms = dict(self.command_histograms)
+            counters = dict(self.counters)
+        for stage in self.STAGES:
+            metric = f"{prefix}_command_{stage}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for name, histograms in sorted(command_histograms.items()):
+                histogram_lines(metric, histograms[stage], f'command="{name}"')
+        lines.append(f"# TYPE {prefix}_ik_seconds histogram")
+        histogram_lines(f"{prefix}_ik_seconds", self.ik_seconds)
+        lines.append(f"# TYPE {prefix}_ik_iterations histogram")
+        histogram_lines(f"{prefix}_ik_iterations", self.ik_iterations)
+        for name, value in sorted(counters.items()):
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        for name, read in sorted(self.gauges.items()):
+            lines.append(f"# TYPE {prefix}_{name} gauge")
+            lines.append(f"{prefix}_{name} {read()}")
+        return "\n".join(lines) + "\n"
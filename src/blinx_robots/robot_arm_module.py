@@ -2,8 +2,30 @@ from math import radians, pi
 import numpy as np
 from roboticstoolbox import DHRobot, RevoluteMDH, RevoluteDH
 
+from blinx_robots.robot_arm_kinematics import chain_kernel
+
     
-class BlinxRobotArm(DHRobot):
+class _ChainKernelMixin(object):
+    """使用预先展开的计算内核求正解与雅可比矩阵, 结果与 fkine / jacob0 一致"""
+
+    def fkine_fast(self, q) -> np.ndarray:
+        """正解齐次变换矩阵
+
+        :param q: (n,) 或 (N, n) 关节角, 单位:弧度
+        :return: (4, 4) 或 (N, 4, 4) 齐次变换矩阵
+        """
+        return chain_kernel(self).fkine(q)
+
+    def jacob0_fast(self, q) -> np.ndarray:
+        """基坐标系下的几何雅可比矩阵
+
+        :param q: (n,) 或 (N, n) 关节角, 单位:弧度
+        :return: (6, n) 或 (N, 6, n) 雅可比矩阵
+        """
+        return chain_kernel(self).jacob0(q)
+
+
+class BlinxRobotArm(_ChainKernelMixin, DHRobot):
     """比邻星机械臂模型"""
 
     def __init__(self):
@@ -66,8 +88,110 @@ class BlinxRobotArm(DHRobot):
     def MYCONFIG(self):
         return self._MYCONFIG
 
+    def ikine_analytic(self, T, q0=None, tol: float = 1e-6) -> np.ndarray:
+        """比邻星机械臂解析逆解
+
+        后三轴为球形腕 (关节 4、5、6 轴线交于腕心), 先由腕心位置求出关节 1~3,
+        再由腕部姿态求出关节 4~6. 最多 8 组解: 肩部前/后 × 肘部上/下 × 腕部翻转.
+
+        :param T: 末端位姿, 4x4 齐次变换矩阵或 SE3
+        :param q0: 参考关节角, 单位:弧度, 默认 qz; 解按与参考关节角的距离排序
+        :param tol: 正解校验误差阈值
+        :return: (k, 6) 满足关节限位的全部解, 单位:弧度, 无解时 k 为 0
+        """
+        T = np.asarray(T.A if hasattr(T, 'A') else T, dtype=float)
+        q0 = self.qz if q0 is None else np.asarray(q0, dtype=float)
+        R, p = T[:3, :3], T[:3, 3]
+        L = self.links
+        d1, a1, a2, d4, d6 = L[0].d, L[1].a, L[2].a, L[3].d, L[5].d
+        offset = np.array([link.offset for link in L])
+
+        # 腕心位置: 末端沿自身 z 轴回退 d6
+        wx, wy, wz = p - d6 * R[:, 2]
+        radius = np.hypot(wx, wy)
+        arm_solutions = []
+        for theta1, r in ((np.arctan2(wy, wx), radius), (np.arctan2(wy, wx) + pi, -radius)):
+            u, v = r - a1, d1 - wz
+            s3 = (a2 ** 2 + d4 ** 2 - u ** 2 - v ** 2) / (2 * a2 * d4)
+            if abs(s3) > 1:
+                continue
+            for theta3 in (np.arcsin(s3), pi - np.arcsin(s3)):
+                X, Y = a2 - d4 * np.sin(theta3), d4 * np.cos(theta3)
+                theta2 = np.arctan2(v, u) - np.arctan2(Y, X)
+                arm_solutions.append((theta1, theta2, theta3))
+
+        solutions = []
+        for theta1, theta2, theta3 in arm_solutions:
+            # M = Rz(θ4)·Rx(π/2)·Rz(θ5)·Rx(π/2)·Rz(θ6)
+            M = _rotx(-pi / 2).T @ (_rotz(theta1) @ _rotx(-pi / 2) @ _rotz(theta2) @ _rotz(theta3)).T @ R
+            s5 = np.hypot(M[0, 2], M[1, 2])
+            for sign in (1, -1):
+                theta5 = np.arctan2(sign * s5, -M[2, 2])
+                if s5 > 1e-9:
+                    theta4 = np.arctan2(sign * M[1, 2], sign * M[0, 2])
+                    theta6 = np.arctan2(-sign * M[2, 1], sign * M[2, 0])
+                else:
+                    # 奇异位形: 关节 4、6 共轴, 关节 4 取参考值, 剩余转角全部交给关节 6
+                    theta4 = q0[3] + offset[3]
+                    B = _rotz(theta4) @ _rotx(pi / 2) @ _rotz(theta5) @ _rotx(pi / 2)
+                    R6 = B.T @ M
+                    theta6 = np.arctan2(R6[1, 0], R6[0, 0])
+                q = np.array([theta1, theta2, theta3, theta4, theta5, theta6]) - offset
+                q = self._wrap_to_qlim(q, q0)
+                if q is not None:
+                    solutions.append(q)
+
+        valid = []
+        transforms = self.fkine_fast(np.array(solutions)) if solutions else []
+        for q, Tq in zip(solutions, transforms):
+            if np.linalg.norm(Tq[:3, 3] - p) < tol and np.linalg.norm(Tq[:3, :3] - R) < tol * 10:
+                if not any(np.allclose(q, other, atol=1e-9) for other in valid):
+                    valid.append(q)
+        if not valid:
+            return np.empty((0, self.n))
+        valid = np.array(valid)
+        return valid[np.argsort(np.linalg.norm(valid - q0, axis=1))]
+
+    def configuration(self, q) -> np.ndarray:
+        """计算关节角所在的逆解分支
+
+        :param q: (6,) 或 (N, 6) 关节角, 单位:弧度
+        :return: (N, 3) 分支符号 [肩部, 肘部, 腕部], 取值 ±1
+        """
+        q = np.atleast_2d(q)
+        L = self.links
+        theta = q + np.array([link.offset for link in L])
+        X = L[2].a - L[3].d * np.sin(theta[:, 2])
+        Y = L[3].d * np.cos(theta[:, 2])
+        radius = L[1].a + np.cos(theta[:, 1]) * X - np.sin(theta[:, 1]) * Y
+        signs = np.stack([radius, np.cos(theta[:, 2]), np.sin(theta[:, 4])], axis=1)
+        return np.where(signs >= 0, 1, -1)
+
+    def _wrap_to_qlim(self, q, q0):
+        """将关节角平移 2π 的整数倍, 使其落在限位内且尽量靠近参考关节角, 无法满足时返回 None"""
+        qlim = self.qlim
+        wrapped = np.empty_like(q)
+        for i, angle in enumerate(q):
+            angle = (angle - q0[i] + pi) % (2 * pi) - pi + q0[i]
+            candidates = [angle + k * 2 * pi for k in (0, -1, 1)]
+            candidates = [c for c in candidates if qlim[0, i] - 1e-9 <= c <= qlim[1, i] + 1e-9]
+            if not candidates:
+                return None
+            wrapped[i] = min(candidates, key=lambda c: abs(c - q0[i]))
+        return wrapped
+
+
+def _rotx(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
+
+
+def _rotz(angle):
+    c, s = np.cos(angle), np.sin(angle)
+    return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+
 
-class BlinxRobotArmDH(DHRobot):
+class BlinxRobotArmDH(_ChainKernelMixin, DHRobot):
     """"""
     def __init__(self):
         L1 = RevoluteDH(
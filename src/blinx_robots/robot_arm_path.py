@@ -0,0 +1,103 @@
+import numpy as np
+
+
+def rpy_to_quaternion(rpy) -> np.ndarray:
+    """(N, 3) 欧拉角 Rx, Py, Yz (R = Rz·Ry·Rx) 转换为 (N, 4) 单位四元数 w, x, y, z"""
+    rpy = np.atleast_2d(rpy)
+    cr, cp, cy = np.cos(rpy.T / 2)
+    sr, sp, sy = np.sin(rpy.T / 2)
+    return np.stack([
+        cr * cp * cy + sr * sp * sy,
+        sr * cp * cy - cr * sp * sy,
+        cr * sp * cy + sr * cp * sy,
+        cr * cp * sy - sr * sp * cy,
+    ], axis=1)
+
+
+def quaternion_to_rpy(quaternion) -> np.ndarray:
+    """(N, 4) 单位四元数 w, x, y, z 转换为 (N, 3) 欧拉角 Rx, Py, Yz"""
+    w, x, y, z = np.atleast_2d(quaternion).T
+    return np.stack([
+        np.arctan2(2 * (w * x + y * z), 1 - 2 * (x * x + y * y)),
+        np.arcsin(np.clip(2 * (w * y - z * x), -1.0, 1.0)),
+        np.arctan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z)),
+    ], axis=1)
+
+
+def quaternion_slerp(q0, q1, t) -> np.ndarray:
+    """四元数球面线性插值
+
+    :param q0: 起点四元数 w, x, y, z
+    :param q1: 终点四元数 w, x, y, z
+    :param t: (N,) 插值比例, 0~1
+    :return: (N, 4) 插值后的单位四元数
+    """
+    q0, q1 = np.asarray(q0, dtype=float), np.asarray(q1, dtype=float)
+    t = np.asarray(t, dtype=float)[:, None]
+    dot = np.dot(q0, q1)
+    if dot < 0:
+        # 取较短的旋转方向
+        q1, dot = -q1, -dot
+    if dot > 0.9995:
+        q = q0 + t * (q1 - q0)
+    else:
+        theta = np.arccos(dot)
+        q = (np.sin((1 - t) * theta) * q0 + np.sin(t * theta) * q1) / np.sin(theta)
+    return q / np.linalg.norm(q, axis=1, keepdims=True)
+
+
+def _interpolate_orientation(start_pose, end_pose, t) -> np.ndarray:
+    q0 = rpy_to_quaternion(start_pose[3:])[0]
+    q1 = rpy_to_quaternion(end_pose[3:])[0]
+    return quaternion_to_rpy(quaternion_slerp(q0, q1, t))
+
+
+def linear_path(start_pose, end_pose, step: float = 0.005) -> np.ndarray:
+    """末端直线路径: 位置线性插值, 姿态球面插值
+
+    :param start_pose: 起点位姿 x, y, z, Rx, Py, Yz, 单位:米, 弧度
+    :param end_pose: 终点位姿 x, y, z, Rx, Py, Yz
+    :param step: 相邻路径点之间的最大距离, 单位:米
+    :return: (N, 6) 路径点位姿, 包含起点与终点
+    """
+    start_pose = np.asarray(start_pose, dtype=float)
+    end_pose = np.asarray(end_pose, dtype=float)
+    length = np.linalg.norm(end_pose[:3] - start_pose[:3])
+    count = max(2, int(np.ceil(length / step)) + 1)
+    t = np.linspace(0.0, 1.0, count)
+    poses = np.empty((count, 6))
+    poses[:, :3] = start_pose[:3] + t[:, None] * (end_pose[:3] - start_pose[:3])
+    poses[:, 3:] = _interpolate_orientation(start_pose, end_pose, t)
+    return poses
+
+
+def arc_path(start_pose, via_pose, end_pose, step: float = 0.005) -> np.ndarray:
+    """末端圆弧路径: 经过起点、途经点、终点三点的圆弧, 姿态从起点到终点球面插值
+
+    :param start_pose: 起点位姿 x, y, z, Rx, Py, Yz, 单位:米, 弧度
+    :param via_pose: 途经点位姿, 只使用位置
+    :param end_pose: 终点位姿
+    :param step: 相邻路径点之间的最大弧长, 单位:米
+    :return: (N, 6) 路径点位姿, 包含起点与终点
+    """
+    start_pose = np.asarray(start_pose, dtype=float)
+    end_pose = np.asarray(end_pose, dtype=float)
+    p0, p1, p2 = start_pose[:3], np.asarray(via_pose, dtype=float)[:3], end_pose[:3]
+    a, b = p1 - p0, p2 - p0
+    normal = np.cross(a, b)
+    normal_norm = np.dot(normal, normal)
+    if normal_norm < 1e-16:
+        raise ValueError("圆弧的三个点共线, 无法确定圆弧")
+    center = p0 + np.cross(np.dot(a, a) * b - np.dot(b, b) * a, normal) / (2 * normal_norm)
+    radius = np.linalg.norm(p0 - center)
+    u = (p0 - center) / radius
+    v = np.cross(normal / np.sqrt(normal_norm), u)
+    end_angle = np.arctan2(np.dot(p2 - center, v), np.dot(p2 - center, u)) % (2 * np.pi)
+
+    count = max(2, int(np.ceil(radius * end_angle / step)) + 1)
+    t = np.linspace(0.0, 1.0, count)
+    angle = t * end_angle
+    poses = np.empty((count, 6))
+    poses[:, :3] = center + radius * (np.cos(angle)[:, None] * u + np.sin(angle)[:, None] * v)
+    poses[:, 3:] = _interpolate_orientation(start_pose, end_pose, t)
+    return poses
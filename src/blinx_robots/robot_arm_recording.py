@@ -0,0 +1,240 @@
+import os
+import time
+import struct
+import threading
+
+import numpy as np
+
+# 文件格式: 64 字节文件头 + 定长记录, 只在文件末尾追加
+# 文件头: 魔数 8 字节, 版本 uint32, 记录长度 uint32, 开始录制的时间 (Unix 时间) float64, 其余补零
+MAGIC = b"BLXMREC\0"
+VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<8sIId")
+
+# 记录类型
+KIND_JOINTS = 0       # 关节状态, joints 为关节角度, 单位:度
+KIND_END_TOOL = 1     # 末端工具 IO 事件, channel 为 IO 口, value 为状态
+KIND_IO = 2           # 扩展 IO 事件, channel 为 IO 口, value 为状态
+
+# 每条记录 36 字节: 相对开始录制的时间 (秒), 类型, IO 口, IO 状态, 关节角度 (float32 精度约 1e-5 度)
+RECORD_DTYPE = np.dtype([
+    ("t", "<f8"),
+    ("kind", "u1"),
+    ("channel", "u1"),
+    ("value", "<i2"),
+    ("joints", "<f4", (6,)),
+])
+
+
+class MotionRecorder(object):
+    """示教录制: 将带时间戳的关节状态与 IO 事件追加写入二进制文件
+
+    写入经过缓冲, 按 flush_interval 批量写入文件; 程序异常退出时最多丢失最后一批记录,
+    读取时会忽略末尾不完整的记录.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0):
+        """
+        :param path: 录制文件路径, 文件已存在时继续追加
+        :param flush_interval: 批量写入文件的间隔, 单位:秒
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.count = 0
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE:
+            self.start_time, _ = _read_header(path)
+            self._file = open(path, 'r+b')
+            # 截掉上次异常退出时留下的半条记录
+            records = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+            self._file.truncate(HEADER_SIZE + records * RECORD_DTYPE.itemsize)
+            self._file.seek(0, os.SEEK_END)
+            self._monotonic_start = time.monotonic() - (time.time() - self.start_time)
+        else:
+            self.start_time = time.time()
+            self._monotonic_start = time.monotonic()
+            self._file = open(path, 'wb')
+            self._file.write(_HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize, self.start_time).ljust(HEADER_SIZE, b"\0"))
+            # 文件头立即写入, 录制过程中即可打开读取
+            self._file.flush()
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _append(self, timestamp, kind: int, channel: int = 0, value: int = 0, joints=(0.0,) * 6) -> None:
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        with self._lock:
+            if self._file is None:
+                return
+            self._pending.append((timestamp - self._monotonic_start, kind, channel, value, joints))
+            self.count += 1
+            if timestamp - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def record_joints(self, joints, timestamp: float = None) -> None:
+        """记录一条关节状态
+
+        :param joints: 关节角度 q1 ~ q6, 单位:度
+        :param timestamp: time.monotonic() 时间戳, 默认为当前时间
+        """
+        self._append(timestamp, KIND_JOINTS, joints=tuple(joints))
+
+    def record_io(self, kind: int, channel: int, status: bool, timestamp: float = None) -> None:
+        """记录一次 IO 操作
+
+        :param kind: KIND_END_TOOL 或 KIND_IO
+        :param channel: IO 口编号
+        :param status: IO 状态
+        """
+        self._append(timestamp, kind, channel, int(status))
+
+    def flush(self) -> None:
+        """将缓冲的记录写入文件"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._pending and self._file is not None:
+            self._file.write(np.array(self._pending, dtype=RECORD_DTYPE).tobytes())
+            self._file.flush()
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _read_header(path: str):
+    with open(path, 'rb') as f:
+        magic, version, record_size, start_time = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != MAGIC or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"不是比邻星机械臂录制文件或版本不兼容: {path}")
+    return start_time, version
+
+
+class MotionLog(object):
+    """内存映射方式读取录制文件, 不会把整个文件读入内存
+
+    支持按序号或时间随机访问, 也可以分块顺序读取, 包括读取仍在录制中的文件.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.start_time, self.version = _read_header(path)
+        self.records = self._map()
+
+    def _map(self) -> np.ndarray:
+        count = (os.path.getsize(self.path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        if count <= 0:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+        return np.memmap(self.path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+
+    def refresh(self) -> int:
+        """重新映射文件, 读取录制过程中新追加的记录
+
+        :return: 当前记录条数
+        """
+        self.records = self._map()
+        return len(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    @property
+    def duration(self) -> float:
+        return float(self.records["t"][-1]) if len(self.records) else 0.0
+
+    def time_slice(self, start: float = None, end: float = None) -> np.ndarray:
+        """录制时间在 [start, end] 内的记录, 按时间二分查找, 返回内存映射的视图
+
+        :param start: 相对开始录制的时间, 单位:秒
+        :param end: 相对开始录制的时间, 单位:秒
+        """
+        t = self.records["t"]
+        first = 0 if start is None else int(np.searchsorted(t, start, side='left'))
+        last = len(t) if end is None else int(np.searchsorted(t, end, side='right'))
+        return self.records[first:last]
+
+    def joint_states(self, start: float = None, end: float = None):
+        """关节状态记录
+
+        :return: (t (N,), joints (N, 6)), joints 为 float64 副本, 单位:度
+        """
+        records = self.time_slice(start, end)
+        records = records[records["kind"] == KIND_JOINTS]
+        return np.array(records["t"]), records["joints"].astype(float)
+
+    def io_events(self, start: float = None, end: float = None) -> list:
+        """IO 事件 [(t, kind, channel, status), ...]"""
+        records = self.time_slice(start, end)
+        records = records[records["kind"] != KIND_JOINTS]
+        return [(float(r["t"]), int(r["kind"]), int(r["channel"]), bool(r["value"])) for r in records]
+
+    def stream(self, chunk_size: int = 4096, follow: bool = False, poll_interval: float = 0.1, stop_event=None):
+        """分块顺序读取记录
+
+        :param chunk_size: 每块的记录条数
+        :param follow: 读到末尾后是否继续等待新追加的记录 (读取正在录制的文件)
+        :param poll_interval: follow 时检查新记录的间隔, 单位:秒
+        :param stop_event: follow 时用于结束读取的 threading.Event
+        :return: 生成器, 每次返回一块结构化数组
+        """
+        position = 0
+        while True:
+            while position < len(self.records):
+                chunk = self.records[position:position + chunk_size]
+                position += len(chunk)
+                yield chunk
+            if not follow or (stop_event is not None and stop_event.is_set()):
+                return
+            time.sleep(poll_interval)
+            self.refresh()
+
+
+def io_command(kind: int) -> str:
+    """IO 事件类型对应的协议命令名称"""
+    return "set_end_tool" if kind == KIND_END_TOOL else "set_robot_io_interface"
+
+
+def downsample(joints, min_joint_step: float) -> np.ndarray:
+    """按关节空间中的运动距离降采样, 保留起点、终点与运动距离每增加 min_joint_step 的第一个点
+
+    :param joints: (N, 6) 关节角度, 单位:度
+    :param min_joint_step: 相邻保留点之间的最小运动距离 (各关节变化的最大值累加), 单位:度
+    :return: 保留的序号
+    """
+    joints = np.asarray(joints, dtype=float)
+    if len(joints) <= 2:
+        return np.arange(len(joints))
+    distance = np.concatenate([[0.0], np.cumsum(np.max(np.abs(np.diff(joints, axis=0)), axis=1))])
+    marks = np.arange(0.0, distance[-1], min_joint_step)
+    indices = np.unique(np.concatenate([np.searchsorted(distance, marks, side='left'), [len(joints) - 1]]))
+    return indices
+
+
+def resample(t, joints, period: float):
+    """按固定周期对关节轨迹线性插值, 用于 INT 模式流式发送
+
+    :return: (t (M,), joints (M, 6)); 所有记录的时间相同时只返回最后一条记录
+    """
+    t = np.asarray(t, dtype=float)
+    if len(t) < 2:
+        return t, np.asarray(joints, dtype=float)
+    if t[-1] <= t[0]:
+        return t[-1:], np.asarray(joints, dtype=float)[-1:]
+    grid = np.arange(t[0], t[-1], period)
+    grid = np.append(grid, t[-1]) if grid[-1] < t[-1] else grid
+    return grid, np.column_stack([np.interp(grid, t, column) for column in np.asarray(joints, dtype=float).T])
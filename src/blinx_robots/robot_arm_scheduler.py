@@ -0,0 +1,163 @@
+import time
+import heapq
+import itertools
+import threading
+from queue import Empty
+
+# 优先级类别, 数值越小越先发送
+# 运动、延时、IO、命令模式等会改变机械臂状态的命令共用一个类别, 严格按提交顺序发送:
+# SEQ 模式下机械臂按收到的顺序执行, 例如 "运动 -> 延时 -> 打开气泵" 不能被调换.
+# 只有急停与不改变状态的查询命令可以插队.
+PRIORITY_SAFETY = 0
+PRIORITY_QUERY = 1
+PRIORITY_STATEFUL = 2
+
+PRIORITY_CLASSES = {
+    "safety": PRIORITY_SAFETY,
+    "query": PRIORITY_QUERY,
+    "stateful": PRIORITY_STATEFUL,
+}
+
+# 命令名称 -> 默认优先级类别, 未列出的命令按改变状态的命令处理
+COMMAND_PRIORITIES = {
+    "set_joint_emergency_stop": PRIORITY_SAFETY,
+    "get_joint_angle_all": PRIORITY_QUERY,
+    "get_robot_mode": PRIORITY_QUERY,
+}
+
+
+def priority_of(priority) -> int:
+    """将优先级类别名称 (safety / query / stateful) 或数值统一为数值"""
+    if isinstance(priority, str):
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"未知的优先级类别: {priority}")
+        return PRIORITY_CLASSES[priority]
+    return int(priority)
+
+
+class CommandScheduler(object):
+    """按优先级发送命令的调度队列, 用于替代先进先出的 command_queue
+
+    - 优先级高的类别先发送, 同一类别内保持提交顺序
+    - 尚未发送的命令可以按 id 或按类别取消
+    - 可以为命令设置截止时间, 超过截止时间仍未发送的命令直接丢弃
+    被取消或丢弃的命令通过 on_drop(item, reason) 通知调用方, reason 为 "cancelled" 或 "expired".
+    """
+
+    def __init__(self, on_drop=None):
+        """
+        :param on_drop: 命令被取消或过期丢弃时的回调, 在调度器的锁之外调用
+        """
+        self.on_drop = on_drop
+        self._heap = []       # (优先级, 命令 id), 命令 id 递增, 同一类别内按提交顺序
+        self._deadlines = []  # (截止时间, 命令 id)
+        self._entries = {}    # 命令 id -> (优先级, item)
+        self._ids = itertools.count(1)
+        self._condition = threading.Condition()
+
+    def put(self, item, priority=PRIORITY_STATEFUL, deadline: float = None) -> int:
+        """加入一条待发送的命令
+
+        :param item: 命令数据, 原样交给发送线程
+        :param priority: 优先级类别, 数值或名称
+        :param deadline: 截止时间, 提交后多少秒内未发送则丢弃, None 表示不限制
+        :return: 命令 id, 用于取消
+        """
+        priority = priority_of(priority)
+        with self._condition:
+            command_id = next(self._ids)
+            self._entries[command_id] = (priority, item)
+            heapq.heappush(self._heap, (priority, command_id))
+            if deadline is not None:
+                heapq.heappush(self._deadlines, (time.monotonic() + deadline, command_id))
+            self._condition.notify()
+        return command_id
+
+    def get(self, block: bool = True, timeout: float = None):
+        """取出优先级最高的命令, 与 queue.Queue.get 的用法相同, 没有命令时抛出 queue.Empty"""
+        end_time = None if timeout is None else time.monotonic() + timeout
+        while True:
+            dropped = []
+            with self._condition:
+                dropped.extend(self._pop_expired())
+                item = self._pop_next()
+                if item is None and block and not dropped:
+                    remaining = None if end_time is None else end_time - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise Empty
+                    self._condition.wait(self._wait_time(remaining))
+                    continue
+            self._notify_dropped(dropped, "expired")
+            if item is not None:
+                return item
+            if not block:
+                raise Empty
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    def cancel(self, command_id: int) -> bool:
+        """取消一条尚未发送的命令
+
+        :return: 命令是否还在队列中并被取消
+        """
+        with self._condition:
+            entry = self._entries.pop(command_id, None)
+        if entry is None:
+            return False
+        self._notify_dropped([entry[1]], "cancelled")
+        return True
+
+    def cancel_class(self, priority) -> int:
+        """取消某一优先级类别中所有尚未发送的命令
+
+        :return: 取消的命令数量
+        """
+        priority = priority_of(priority)
+        with self._condition:
+            command_ids = [command_id for command_id, entry in self._entries.items() if entry[0] == priority]
+            items = [self._entries.pop(command_id)[1] for command_id in command_ids]
+        self._notify_dropped(items, "cancelled")
+        return len(items)
+
+    def qsize(self, priority=None) -> int:
+        """等待发送的命令数量, 指定优先级类别时只统计该类别"""
+        with self._condition:
+            if priority is None:
+                return len(self._entries)
+            priority = priority_of(priority)
+            return sum(1 for entry in self._entries.values() if entry[0] == priority)
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def _pop_next(self):
+        # 已取消的命令只从 _entries 中删除, 在这里跳过 (延迟删除)
+        while self._heap:
+            _, command_id = heapq.heappop(self._heap)
+            entry = self._entries.pop(command_id, None)
+            if entry is not None:
+                return entry[1]
+        return None
+
+    def _pop_expired(self) -> list:
+        now = time.monotonic()
+        expired = []
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, command_id = heapq.heappop(self._deadlines)
+            entry = self._entries.pop(command_id, None)
+            if entry is not None:
+                expired.append(entry[1])
+        return expired
+
+    def _wait_time(self, remaining):
+        """等待新命令的时间, 不超过最近的截止时间"""
+        if self._deadlines:
+            until_deadline = max(0.0, self._deadlines[0][0] - time.monotonic())
+            return until_deadline if remaining is None else min(remaining, until_deadline)
+        return remaining
+
+    def _notify_dropped(self, items, reason: str) -> None:
+        if self.on_drop is not None:
+            for item in items:
+                self.on_drop(item, reason)
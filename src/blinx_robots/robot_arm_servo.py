@@ -0,0 +1,174 @@
+import time
+import threading
+
+import numpy as np
+from loguru import logger
+
+from blinx_robots.robot_arm_kinematics import chain_kernel
+
+
+def servo_step(kernel, q, twist, dt: float, qlim, max_joint_speed, damping: float = 0.02, limit_margin: float = 0.0) -> np.ndarray:
+    """由末端速度计算一个控制周期的关节增量: 阻尼最小二乘 dq = Jᵀ (J Jᵀ + λ² I)⁻¹ v
+
+    - 即将越过关节限位的关节在本周期锁定, 其余关节重新求解, 末端尽量保持期望方向
+    - 关节速度超过上限时整体等比例缩小, 末端运动方向不变
+
+    :param kernel: SerialChainKernel
+    :param q: (n,) 当前关节角, 单位:弧度
+    :param twist: 末端速度 [vx, vy, vz, wx, wy, wz], 基坐标系, 单位:米/秒, 弧度/秒
+    :param dt: 控制周期, 单位:秒
+    :param qlim: (2, n) 关节限位, 单位:弧度
+    :param max_joint_speed: (n,) 关节最大速度, 单位:弧度/秒
+    :param damping: 阻尼系数 λ, 奇异位形附近限制关节速度
+    :param limit_margin: 与关节限位保持的距离, 单位:弧度
+    :return: (n,) 关节增量, 单位:弧度
+    """
+    J = kernel.jacob0(q)
+    twist = np.asarray(twist, dtype=float)
+    locked = np.zeros(len(q), dtype=bool)
+    for _ in range(len(q)):
+        Jf = np.where(locked, 0.0, J)
+        dq = Jf.T @ np.linalg.solve(Jf @ Jf.T + damping ** 2 * np.eye(6), twist)
+        scale = np.max(np.abs(dq) / max_joint_speed)
+        if scale > 1:
+            dq /= scale
+        target = q + dq * dt
+        blocked = ((target > qlim[1] - limit_margin) & (dq > 0)) | ((target < qlim[0] + limit_margin) & (dq < 0))
+        if not np.any(blocked & ~locked):
+            break
+        locked |= blocked
+    dq[locked] = 0.0
+    return dq * dt
+
+
+class CartesianServo(object):
+    """笛卡尔实时伺服: 按固定频率将末端速度积分为关节目标, INT 立即执行模式下流式发送
+
+    - 只保留最新的末端速度, 超过 twist_timeout 没有更新时视为零速度 (松开即停)
+    - 关节目标以当前控制周期为截止时间放入发送队列, 来不及发送的目标直接丢弃, 不会积压
+    - 积分使用上一次发出的关节目标, 不等待机械臂的响应
+    """
+
+    def __init__(self, robot_arm, rate: float = 100.0, speed_percentage: int = 100, max_joint_speed=90.0,
+                 damping: float = 0.02, limit_margin: float = 1.0, twist_timeout: float = None):
+        """
+        :param robot_arm: BlxRobotArm
+        :param rate: 控制频率, 单位:Hz, 通常为 50 ~ 100
+        :param speed_percentage: 发送关节目标时使用的速度百分比
+        :param max_joint_speed: 关节最大速度, 单位:度/秒, 标量或每个关节一个值
+        :param damping: 阻尼最小二乘的阻尼系数
+        :param limit_margin: 与关节限位保持的距离, 单位:度
+        :param twist_timeout: 末端速度的有效时间, 单位:秒, 默认为 3 个控制周期
+        """
+        self.robot_arm = robot_arm
+        self.robot = robot_arm.blinx_robot_arm
+        self.kernel = chain_kernel(self.robot)
+        self.period = 1.0 / rate
+        self.speed_percentage = speed_percentage
+        self.max_joint_speed = np.radians(np.broadcast_to(np.asarray(max_joint_speed, dtype=float), (self.robot.n,)))
+        self.damping = damping
+        self.limit_margin = np.radians(limit_margin)
+        self.twist_timeout = 3 * self.period if twist_timeout is None else twist_timeout
+        self.qlim = np.asarray(self.robot.qlim, dtype=float)
+        self.q = None
+        self.sent_count = 0
+        self.late_count = 0      # 超过截止时间未发送而被丢弃的关节目标
+        self.stale_count = 0     # 过期未使用的末端速度
+        self.rejected_count = 0  # 未通过轨迹检查而没有发送的关节目标
+        self.overrun_count = 0   # 计算与发送超过一个控制周期的次数
+        self.max_cycle_time = 0.0
+        self._twist = None       # (末端速度, 时间戳)
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and not self._stopped.is_set()
+
+    def start(self, joint_degrees: list = None) -> bool:
+        """启动伺服线程
+
+        :param joint_degrees: 起始关节角度, 单位:度, 默认读取机械臂当前关节角度
+        :return: 是否已启动
+        """
+        if self.running:
+            return True
+        if joint_degrees is None:
+            joint_degrees = self.robot_arm._current_joint_degree()
+        if joint_degrees is None or len(joint_degrees) == 0:
+            logger.error("读取机械臂当前关节角度失败, 无法启动伺服!")
+            return False
+        self.q = np.radians(np.asarray(joint_degrees, dtype=float))
+        self._twist = None
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="blinx-cartesian-servo", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """停止伺服线程, 机械臂停在最后一个关节目标"""
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def set_twist(self, twist, timestamp: float = None) -> bool:
+        """更新末端速度, 可在任意线程中调用
+
+        :param twist: [vx, vy, vz, wx, wy, wz], 基坐标系, 单位:米/秒, 弧度/秒
+        :param timestamp: 速度对应的 time.monotonic() 时间 (如相机采集时间), 默认为当前时间;
+                          已超过 twist_timeout 的速度直接丢弃
+        :return: 是否被采用
+        """
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        if time.monotonic() - timestamp > self.twist_timeout:
+            self.stale_count += 1
+            return False
+        # 单次引用赋值, 伺服线程读取时不需要加锁
+        self._twist = (np.asarray(twist, dtype=float), timestamp)
+        return True
+
+    def joint_target(self) -> list:
+        """最近一次发出的关节目标, 单位:度"""
+        return None if self.q is None else np.degrees(self.q).tolist()
+
+    def _on_response(self, future) -> None:
+        if future.cancelled():
+            self.late_count += 1
+
+    def _run(self) -> None:
+        next_time = time.monotonic()
+        while not self._stopped.is_set():
+            start = time.monotonic()
+            twist = self._twist
+            if twist is not None and start - twist[1] <= self.twist_timeout and np.any(twist[0]):
+                try:
+                    self._step(twist[0])
+                except Exception as e:
+                    logger.error(f"伺服计算失败: {e}")
+            cycle_time = time.monotonic() - start
+            if cycle_time > self.max_cycle_time:
+                self.max_cycle_time = cycle_time
+            next_time += self.period
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                self._stopped.wait(delay)
+            else:
+                self.overrun_count += 1
+                next_time = time.monotonic()
+
+    def _step(self, twist) -> None:
+        dq = servo_step(self.kernel, self.q, twist, self.period, self.qlim, self.max_joint_speed, self.damping, self.limit_margin)
+        if not np.any(dq):
+            return
+        target = self.q + dq
+        payload = [self.speed_percentage]
+        payload.extend(np.round(np.degrees(target), 3).tolist())
+        response_future = self.robot_arm.submit_command("set_joint_angle_all_time", payload, deadline=self.period)
+        if response_future.command_id is None:
+            # 未通过轨迹检查 (如末端低于最低高度), 保持在上一个关节目标
+            self.rejected_count += 1
+            return
+        self.q = target
+        response_future.add_done_callback(self._on_response)
+        self.sent_count += 1
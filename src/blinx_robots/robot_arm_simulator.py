@@ -0,0 +1,357 @@
+import json
+import time
+import random
+import asyncio
+import threading
+
+from loguru import logger
+
+from blinx_robots.robot_arm_communication import FrameBuffer
+
+
+class RobotArmSimulator(object):
+    """本地机械臂模拟器, 使用与机械臂相同的 JSON + \\r\\n TCP 协议
+
+    关节按运动学插值运动: 所有关节同时出发、同时到达, 耗时由最大关节转角与速度百分比决定.
+    SEQ 顺序模式下运动、延时、IO 命令依次执行; INT 立即执行模式下新的运动目标立即替换当前目标.
+    查询命令总是立即回复. 回复可以按配置加入网络延迟与抖动, 拆成多段发送, 或与相邻的回复合并发送.
+    多条连接共享同一台模拟机械臂.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 fragment_size: int = None, coalesce_window: float = 0.0, max_joint_speed: float = 90.0,
+                 time_scale: float = 1.0, seed: int = None):
+        """
+        :param host: 监听地址
+        :param port: 监听端口, 0 表示由系统分配
+        :param latency: 每条回复的固定延迟, 单位:秒
+        :param jitter: 延迟抖动上限, 每条回复额外增加 0~jitter 秒的随机延迟, 回复顺序保持不变
+        :param fragment_size: 每段发送的最大字节数, 用于模拟 TCP 拆包, None 表示整帧发送
+        :param coalesce_window: 合并发送的时间窗口, 单位:秒, 窗口内就绪的回复一次写出, 用于模拟 TCP 粘包
+        :param max_joint_speed: 速度百分比为 100 时的关节速度, 单位:度/秒
+        :param time_scale: 运动与延时命令的时间缩放, 0 表示立即完成
+        :param seed: 抖动随机数种子
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.fragment_size = fragment_size
+        self.coalesce_window = coalesce_window
+        self.max_joint_speed = max_joint_speed
+        self.time_scale = time_scale
+        self.random = random.Random(seed)
+
+        self.mode = "SEQ"
+        self.end_tool = {}
+        self.io_status = {}
+        self.emergency_stopped = False
+        self.received = []  # 收到的全部命令, 用于测试断言
+
+        self._joints = [0.0] * 6
+        self._motion = None  # (起点, 终点, 开始时间, 耗时)
+        self._motion_task = None
+        self._motion_reply = None
+        self._sequence = None
+        self._sequence_task = None
+        self._server = None
+        self._loop = None
+        self._thread = None
+        self._connections = set()
+
+    # ---- 运动学状态 ----
+
+    def joint_degrees(self) -> list:
+        """当前关节角度, 单位:度"""
+        if self._motion is None:
+            return list(self._joints)
+        start, target, start_time, duration = self._motion
+        ratio = 1.0 if duration <= 0 else min(1.0, (time.monotonic() - start_time) / duration)
+        return [a + (b - a) * ratio for a, b in zip(start, target)]
+
+    def _motion_duration(self, start, target, speed_percentage) -> float:
+        speed = self.max_joint_speed * max(1, min(100, speed_percentage)) / 100.0
+        return max(abs(b - a) for a, b in zip(start, target)) / speed * self.time_scale
+
+    async def _run_motion(self, target, speed_percentage) -> bool:
+        """执行一段运动, 被新的运动目标替换或急停时提前结束"""
+        start = self.joint_degrees()
+        duration = self._motion_duration(start, target, speed_percentage)
+        motion = self._motion = (start, list(target), time.monotonic(), duration)
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            # 被替换时新的运动可能已经开始, 只清理自己的状态
+            if self._motion is motion:
+                self._joints = self.joint_degrees()
+                self._motion = None
+        return True
+
+    def _stop_motion(self, status: bool) -> None:
+        """停在当前位置, 被打断的运动按 status 回复"""
+        if self._motion_task is not None and not self._motion_task.done():
+            self._motion_task.cancel()
+        self._joints = self.joint_degrees()
+        self._motion = None
+        if self._motion_reply is not None:
+            self._motion_reply(status)
+            self._motion_reply = None
+
+    def _start_immediate_motion(self, target, speed_percentage, reply) -> None:
+        """INT 模式: 新的运动目标立即替换当前目标, 被替换的运动回复 true"""
+        self._stop_motion(True)
+        self._motion_reply = reply
+
+        async def _move():
+            await self._run_motion(target, speed_percentage)
+            if self._motion_reply is reply:
+                self._motion_reply = None
+                reply(True)
+
+        self._motion_task = asyncio.ensure_future(_move())
+
+    async def _sequence_worker(self) -> None:
+        """SEQ 模式: 依次执行运动、延时、IO 命令"""
+        while True:
+            action, reply = await self._sequence.get()
+            self._motion_reply = reply
+            self._motion_task = asyncio.ensure_future(action())
+            # asyncio.wait 不会因为动作被急停取消而抛出异常, 只有工作协程自身被取消时才退出
+            await asyncio.wait({self._motion_task})
+            if self._motion_task.cancelled():
+                continue
+            status = self._motion_task.result()
+            if self._motion_reply is reply:
+                self._motion_reply = None
+                if reply is not None:
+                    reply(status)
+
+    # ---- 协议处理 ----
+
+    def _target_for(self, command, data):
+        if command == "set_joint_angle":
+            joint_number, speed_percentage, joint_degree = data
+            target = self.joint_degrees() if self._motion is None else list(self._motion[1])
+            target[int(joint_number) - 1] = float(joint_degree)
+            return target, speed_percentage
+        if command == "set_joint_initialize":
+            return [0.0] * 6, 100
+        speed_percentage, *target = data
+        return [float(angle) for angle in target], speed_percentage
+
+    def handle_message(self, message: dict, send) -> None:
+        """处理一条命令, 通过 send(reply_dict) 回复"""
+        command, data = message.get("command"), message.get("data")
+        self.received.append(message)
+
+        def reply_as(name):
+            return lambda status: send({"command": name, "data": bool(status)})
+
+        if command == "get_joint_angle_all":
+            send({"command": command, "data": [round(angle, 3) for angle in self.joint_degrees()]})
+        elif command == "get_robot_mode":
+            send({"command": command, "data": self.mode})
+        elif command == "set_robot_mode":
+            self.mode = data[0] if data and data[0] in ("SEQ", "INT") else self.mode
+            send({"command": command, "data": bool(data) and data[0] in ("SEQ", "INT")})
+        elif command == "set_joint_emergency_stop":
+            self.emergency_stopped = True
+            self._clear_sequence()
+            self._stop_motion(False)
+        elif command in ("set_joint_angle", "set_joint_angle_all", "set_joint_angle_all_time", "set_joint_initialize"):
+            reply = reply_as("set_joint_initialize" if command == "set_joint_initialize" else "move_in_place")
+            if command == "set_joint_initialize":
+                self.emergency_stopped = False
+            elif self.emergency_stopped:
+                reply(False)
+                return
+            target, speed_percentage = self._target_for(command, data)
+            if self.mode == "INT":
+                self._start_immediate_motion(target, speed_percentage, reply)
+            else:
+                self._sequence.put_nowait((lambda: self._run_motion(target, speed_percentage), reply))
+        elif command == "set_time_delay":
+            async def _delay():
+                await asyncio.sleep(data[0] / 1000.0 * self.time_scale)
+                return True
+            self._sequence.put_nowait((_delay, None))
+        elif command in ("set_end_tool", "set_robot_io_interface"):
+            states = self.end_tool if command == "set_end_tool" else self.io_status
+
+            async def _set_io():
+                states[data[0]] = bool(data[1])
+                return True
+            if self.mode == "INT":
+                states[data[0]] = bool(data[1])
+                send({"command": command, "data": True})
+            else:
+                self._sequence.put_nowait((_set_io, reply_as(command)))
+        else:
+            logger.error(f"模拟器不支持的命令: {message}")
+            send({"command": command, "data": False})
+
+    def _clear_sequence(self) -> None:
+        """急停时丢弃尚未执行的顺序命令, 等待中的命令回复 false"""
+        while not self._sequence.empty():
+            _, reply = self._sequence.get_nowait()
+            if reply is not None:
+                reply(False)
+
+    async def _handle_client(self, reader, writer) -> None:
+        outgoing = asyncio.Queue()
+        sender = asyncio.ensure_future(self._reply_sender(writer, outgoing))
+        self._connections.add(writer)
+        last_due_time = 0.0
+
+        def send(reply):
+            nonlocal last_due_time
+            # 抖动只推迟发送时间, 不改变同一条连接上回复的先后顺序
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+            last_due_time = max(last_due_time, time.monotonic() + delay)
+            outgoing.put_nowait((last_due_time, json.dumps(reply).encode('utf-8') + b'\r\n'))
+
+        frame_buffer = FrameBuffer()
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                frame_buffer.feed(data)
+                for frame in frame_buffer.frames():
+                    try:
+                        message = json.loads(frame)
+                    except ValueError:
+                        logger.error(f"模拟器无法解析的命令: {frame!r}")
+                        continue
+                    self.handle_message(message, send)
+        except ConnectionError:
+            pass
+        finally:
+            sender.cancel()
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _reply_sender(self, writer, outgoing) -> None:
+        while True:
+            due_time, frame = await outgoing.get()
+            chunks = [frame]
+            delay = due_time - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if self.coalesce_window > 0:
+                # 等待一个合并窗口, 把窗口内产生的回复一次写出
+                await asyncio.sleep(self.coalesce_window)
+                while not outgoing.empty():
+                    due_time, frame = outgoing.get_nowait()
+                    chunks.append(frame)
+                delay = due_time - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            data = b''.join(chunks)
+            try:
+                if self.fragment_size:
+                    for offset in range(0, len(data), self.fragment_size):
+                        writer.write(data[offset:offset + self.fragment_size])
+                        await writer.drain()
+                        await asyncio.sleep(0.0005)
+                else:
+                    writer.write(data)
+                    await writer.drain()
+            except ConnectionError:
+                return
+
+    # ---- 启动与停止 ----
+
+    def drop_connections(self) -> None:
+        """断开所有客户端连接, 用于模拟网络故障; 后台线程运行时可以从其它线程调用"""
+        def _drop():
+            for writer in list(self._connections):
+                writer.transport.abort()
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(_drop)
+        else:
+            _drop()
+
+    async def start(self):
+        """在当前事件循环中启动模拟器
+
+        :return: (host, port) 实际监听的地址
+        """
+        self._sequence = asyncio.Queue()
+        self._sequence_task = asyncio.ensure_future(self._sequence_worker())
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"机械臂模拟器已启动: {self.host}:{self.port}")
+        return self.host, self.port
+
+    async def stop(self) -> None:
+        """停止模拟器并断开所有连接"""
+        self._server.close()
+        for writer in list(self._connections):
+            writer.close()
+        await self._server.wait_closed()
+        task, self._sequence_task = self._sequence_task, None
+        task.cancel()
+        self._stop_motion(False)
+        await asyncio.gather(task, return_exceptions=True)
+
+    def start_in_thread(self):
+        """在后台线程的独立事件循环中启动模拟器, 用于同步代码的测试
+
+        :return: (host, port) 实际监听的地址
+        """
+        started = threading.Event()
+
+        def _run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.stop())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=_run, name="blinx-robot-simulator", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.host, self.port
+
+    def stop_thread(self) -> None:
+        """停止 start_in_thread 启动的模拟器"""
+        if self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        self.start_in_thread()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop_thread()
+
+
+if __name__ == "__main__":
+    import argparse
+    from blinx_robots import configure_logging
+
+    parser = argparse.ArgumentParser(description="比邻星机械臂模拟器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1234)
+    parser.add_argument("--latency", type=float, default=0.0, help="回复延迟, 单位:秒")
+    parser.add_argument("--jitter", type=float, default=0.0, help="回复延迟抖动, 单位:秒")
+    parser.add_argument("--fragment-size", type=int, default=None, help="拆包大小, 单位:字节")
+    parser.add_argument("--coalesce-window", type=float, default=0.0, help="粘包合并窗口, 单位:秒")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="运动耗时缩放, 0 表示立即完成")
+    args = parser.parse_args()
+    configure_logging("robot_arm_simulator.log", level="INFO")
+
+    async def main():
+        simulator = RobotArmSimulator(args.host, args.port, args.latency, args.jitter, args.fragment_size,
+                                      args.coalesce_window, time_scale=args.time_scale)
+        await simulator.start()
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
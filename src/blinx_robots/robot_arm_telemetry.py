@@ -0,0 +1,152 @@
+import time
+import threading
+
+import numpy as np
+from loguru import logger
+
+
+class JointStateBuffer(object):
+    """带时间戳的关节状态环形缓冲区
+
+    数据保存在预先分配的 numpy 数组中, 写满后覆盖最旧的数据.
+    只允许一个写入线程; 读取最新状态不加锁, 历史查询在复制期间被写入覆盖时自动重试.
+    """
+
+    def __init__(self, capacity: int = 4096, joint_count: int = 6):
+        """
+        :param capacity: 最多保存的状态条数
+        :param joint_count: 关节数量
+        """
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity)
+        self.joints = np.zeros((capacity, joint_count))
+        self._count = 0       # 累计写入的条数, 写入完成后才递增
+        self._latest = None   # (时间戳, 关节角度元组), 整体替换, 读取时不需要加锁
+
+    def append(self, joints, timestamp: float = None) -> None:
+        """写入一条关节状态
+
+        :param joints: 关节角度, 单位:度
+        :param timestamp: time.monotonic() 时间戳, 默认为当前时间
+        """
+        timestamp = time.monotonic() if timestamp is None else timestamp
+        index = self._count % self.capacity
+        self.timestamps[index] = timestamp
+        self.joints[index] = joints
+        self._count += 1
+        self._latest = (timestamp, tuple(float(angle) for angle in joints))
+
+    def latest(self):
+        """最新的关节状态, 没有数据时返回 None
+
+        :return: (时间戳, (q1, ..., q6))
+        """
+        return self._latest
+
+    def history(self, count: int = None):
+        """最近 count 条关节状态, 按时间先后排列
+
+        :param count: 条数, 默认为缓冲区中的全部数据
+        :return: (timestamps (k,), joints (k, 6)) 数组副本
+        """
+        while True:
+            written = self._count
+            size = min(written, self.capacity) if count is None else min(count, written, self.capacity)
+            indices = np.arange(written - size, written) % self.capacity
+            timestamps, joints = self.timestamps[indices], self.joints[indices]
+            # 复制期间写入线程覆盖了正在复制的位置时重新读取
+            if self._count - written <= self.capacity - size:
+                return timestamps, joints
+
+    def window(self, seconds: float, now: float = None):
+        """最近 seconds 秒内的关节状态
+
+        :param seconds: 时间窗口长度, 单位:秒
+        :param now: 窗口结束时间, 默认为当前 time.monotonic()
+        :return: (timestamps (k,), joints (k, 6)) 数组副本
+        """
+        now = time.monotonic() if now is None else now
+        timestamps, joints = self.history()
+        start = np.searchsorted(timestamps, now - seconds, side='left')
+        end = np.searchsorted(timestamps, now, side='right')
+        return timestamps[start:end], joints[start:end]
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+
+class JointTelemetry(object):
+    """后台关节状态采集
+
+    在独立的守护线程中按固定频率调用 poll 读取关节角度, 写入 JointStateBuffer.
+    """
+
+    def __init__(self, poll, rate: float = 50.0, capacity: int = 4096):
+        """
+        :param poll: 读取一次关节角度的函数, 失败时返回 None
+        :param rate: 采集频率, 单位:Hz
+        :param capacity: 环形缓冲区容量
+        """
+        self.poll = poll
+        self.period = 1.0 / rate
+        self.buffer = JointStateBuffer(capacity)
+        self.failures = 0
+        self.listeners = []  # 每条新状态的回调 listener(joints, timestamp), 在采集线程中调用
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and not self._stopped.is_set()
+
+    def start(self) -> None:
+        """启动采集线程"""
+        if self.running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="blinx-joint-telemetry", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """停止采集线程, 已采集的数据保留在缓冲区中"""
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def latest(self, max_age: float = None):
+        """最新的关节角度
+
+        :param max_age: 允许的最大数据时长, 单位:秒, 超过时返回 None
+        :return: [q1, ..., q6] 或 None
+        """
+        state = self.buffer.latest()
+        if state is None or (max_age is not None and time.monotonic() - state[0] > max_age):
+            return None
+        return list(state[1])
+
+    def _run(self) -> None:
+        next_poll_time = time.monotonic()
+        while not self._stopped.is_set():
+            try:
+                joints = self.poll()
+            except Exception as e:
+                logger.error(f"采集关节状态失败: {e}")
+                joints = None
+            if joints:
+                timestamp = time.monotonic()
+                self.buffer.append(joints, timestamp)
+                for listener in list(self.listeners):
+                    try:
+                        listener(joints, timestamp)
+                    except Exception as e:
+                        logger.error(f"关节状态回调失败: {e}")
+            else:
+                self.failures += 1
+            # 按绝对时间调度, 采集耗时不会累积成频率漂移; 落后时直接从当前时间重新计算
+            next_poll_time += self.period
+            delay = next_poll_time - time.monotonic()
+            if delay > 0:
+                self._stopped.wait(delay)
+            else:
+                next_poll_time = time.monotonic()
@@ -0,0 +1,148 @@
+import numpy as np
+
+# 默认关节运动限制, 单位:度/秒, 度/秒², 度/秒³
+DEFAULT_MAX_VELOCITY = 60.0
+DEFAULT_MAX_ACCELERATION = 120.0
+
+
+class JointTrajectory(object):
+    """同步的点到点关节轨迹
+
+    所有关节共用一条归一化的运动曲线 s(t) (0 → 1), q(t) = q0 + (q1 - q0) · s(t):
+    所有关节同时启动、同时到达, 关节空间中的路径为直线.
+    s(t) 由若干段加加速度恒定的多项式组成, 梯形曲线的加加速度为 0.
+    """
+
+    def __init__(self, q0, q1, segments, profile: str):
+        """
+        :param q0: 起点关节角度, 单位:度
+        :param q1: 终点关节角度, 单位:度
+        :param segments: [(时长, 起始加速度, 加加速度), ...], 描述归一化曲线 s(t)
+        :param profile: "trapezoidal" 或 "s_curve"
+        """
+        self.q0 = np.asarray(q0, dtype=float)
+        self.q1 = np.asarray(q1, dtype=float)
+        self.profile = profile
+        durations = np.array([segment[0] for segment in segments], dtype=float)
+        self._a0 = np.array([segment[1] for segment in segments], dtype=float)
+        self._jerk = np.array([segment[2] for segment in segments], dtype=float)
+        self._starts = np.concatenate([[0.0], np.cumsum(durations)])
+        # 每段起点的 s 与 ds/dt
+        self._s0 = np.zeros(len(durations))
+        self._v0 = np.zeros(len(durations))
+        s = v = 0.0
+        for i, (T, a, j) in enumerate(zip(durations, self._a0, self._jerk)):
+            self._s0[i], self._v0[i] = s, v
+            s += v * T + a * T ** 2 / 2 + j * T ** 3 / 6
+            v += a * T + j * T ** 2 / 2
+        self.duration = float(self._starts[-1])
+
+    def _evaluate(self, t):
+        t = np.clip(np.asarray(t, dtype=float), 0.0, self.duration)
+        if not len(self._s0):
+            zeros = np.zeros(t.shape)
+            return zeros, zeros, zeros
+        index = np.clip(np.searchsorted(self._starts, t, side='right') - 1, 0, len(self._s0) - 1)
+        tau = t - self._starts[index]
+        a0, j = self._a0[index], self._jerk[index]
+        s = self._s0[index] + self._v0[index] * tau + a0 * tau ** 2 / 2 + j * tau ** 3 / 6
+        v = self._v0[index] + a0 * tau + j * tau ** 2 / 2
+        a = a0 + j * tau
+        # 终点之后保持静止
+        end = t >= self.duration
+        s, v, a = np.where(end, 1.0, s), np.where(end, 0.0, v), np.where(end, 0.0, a)
+        return s, v, a
+
+    def positions(self, t) -> np.ndarray:
+        """(N,) 时刻 -> (N, 6) 关节角度, 单位:度"""
+        s, _, _ = self._evaluate(t)
+        return self.q0 + np.multiply.outer(s, self.q1 - self.q0)
+
+    def velocities(self, t) -> np.ndarray:
+        """(N,) 时刻 -> (N, 6) 关节速度, 单位:度/秒"""
+        _, v, _ = self._evaluate(t)
+        return np.multiply.outer(v, self.q1 - self.q0)
+
+    def accelerations(self, t) -> np.ndarray:
+        """(N,) 时刻 -> (N, 6) 关节加速度, 单位:度/秒²"""
+        _, _, a = self._evaluate(t)
+        return np.multiply.outer(a, self.q1 - self.q0)
+
+    def sample(self, period: float):
+        """按固定周期采样, 最后一个采样点为终点
+
+        :param period: 采样周期, 单位:秒
+        :return: (t, q), t 为 (N,) 时刻, q 为 (N, 6) 关节角度
+        """
+        count = max(1, int(np.ceil(self.duration / period)))
+        t = np.minimum(np.arange(1, count + 1) * period, self.duration)
+        return t, self.positions(t)
+
+
+def _normalized_limits(distance, limit):
+    """各关节的限制换算到归一化曲线 s(t) 上, 取最严格的一个"""
+    limit = np.broadcast_to(np.asarray(limit, dtype=float), distance.shape)
+    moving = distance > 0
+    return float(np.min(limit[moving] / distance[moving]))
+
+
+def _trapezoidal_segments(V: float, A: float) -> list:
+    Ta = V / A
+    if A * Ta ** 2 > 1.0:
+        # 达不到最大速度, 三角形曲线
+        Ta = np.sqrt(1.0 / A)
+        V = A * Ta
+    Tv = (1.0 - A * Ta ** 2) / V
+    return [(Ta, A, 0.0), (Tv, 0.0, 0.0), (Ta, -A, 0.0)]
+
+
+def _s_curve_segments(V: float, A: float, J: float) -> list:
+    # 加速段: 加加速时间 Tj, 加速总时间 Ta; 不能达到最大加速度时 Ta = 2 Tj
+    if V * J >= A ** 2:
+        Tj = A / J
+        Ta = Tj + V / A
+    else:
+        Tj = np.sqrt(V / J)
+        Ta = 2 * Tj
+    Tv = 1.0 / V - Ta
+    if Tv < 0:
+        # 达不到最大速度: 由 A (Ta - Tj) Ta = 1 求加速时间
+        Tv = 0.0
+        Tj = A / J
+        Ta = (Tj + np.sqrt(Tj ** 2 + 4.0 / A)) / 2
+        if Ta < 2 * Tj:
+            Tj = (1.0 / (2 * J)) ** (1 / 3)
+            Ta = 2 * Tj
+    Ap = J * Tj
+    return [
+        (Tj, 0.0, J), (Ta - 2 * Tj, Ap, 0.0), (Tj, Ap, -J),
+        (Tv, 0.0, 0.0),
+        (Tj, 0.0, -J), (Ta - 2 * Tj, -Ap, 0.0), (Tj, -Ap, J),
+    ]
+
+
+def plan_joint_trajectory(q0, q1, max_velocity=DEFAULT_MAX_VELOCITY, max_acceleration=DEFAULT_MAX_ACCELERATION,
+                          max_jerk=None) -> JointTrajectory:
+    """规划时间同步的点到点关节轨迹
+
+    运动时间由最受限的关节决定, 其余关节按比例放慢, 所有关节同时到达.
+
+    :param q0: 起点关节角度, 单位:度
+    :param q1: 终点关节角度, 单位:度
+    :param max_velocity: 关节最大速度, 单位:度/秒, 标量或每个关节一个值
+    :param max_acceleration: 关节最大加速度, 单位:度/秒², 标量或每个关节一个值
+    :param max_jerk: 关节最大加加速度, 单位:度/秒³; None 时为梯形速度曲线, 否则为 S 形曲线 (加速度连续)
+    :return: JointTrajectory, duration 为预计运动时间
+    """
+    q0, q1 = np.asarray(q0, dtype=float), np.asarray(q1, dtype=float)
+    distance = np.abs(q1 - q0)
+    profile = "trapezoidal" if max_jerk is None else "s_curve"
+    if not np.any(distance > 0):
+        return JointTrajectory(q0, q1, [], profile)
+    V = _normalized_limits(distance, max_velocity)
+    A = _normalized_limits(distance, max_acceleration)
+    if max_jerk is None:
+        segments = _trapezoidal_segments(V, A)
+    else:
+        segments = _s_curve_segments(V, A, _normalized_limits(distance, max_jerk))
+    return JointTrajectory(q0, q1, segments, profile)
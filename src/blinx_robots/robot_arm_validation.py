@@ -0,0 +1,122 @@
+from collections import namedtuple
+
+import numpy as np
+
+from blinx_robots import robot_arm_kinematics as kinematics
+
+# 轨迹检查结果: index 为第一个不合格路径点的序号, joint 为超限的关节编号 (1~6, 与关节无关时为 None),
+# reason 为 "joint_limit"、"joint_speed"、"tcp_height"、"keep_out" 或 "unreachable"
+ValidationResult = namedtuple('ValidationResult', ['valid', 'index', 'joint', 'reason'])
+
+VALID = ValidationResult(True, None, None, None)
+
+
+class TrajectoryValidator(object):
+    """发送之前整体检查关节轨迹, 所有检查对整条轨迹向量化完成
+
+    - 关节角度是否在机械臂模型的 qlim 范围内
+    - 相邻路径点之间的关节变化是否超过 关节最大速度 × 发送间隔
+    - 末端 (TCP) 高度是否低于下限, 是否进入禁入区域; 末端位置由批量正解得到
+    """
+
+    # 同一路径点有多项不合格时, 按此顺序报告
+    REASONS = ("joint_limit", "joint_speed", "tcp_height", "keep_out")
+
+    def __init__(self, robot, max_joint_speed=None, min_tcp_height: float = None, keep_out_boxes=(), tolerance: float = 1e-6):
+        """
+        :param robot: 机械臂模型, 如 BlinxRobotArm
+        :param max_joint_speed: 关节最大速度, 单位:度/秒, 标量或每个关节一个值, None 表示不检查
+        :param min_tcp_height: 末端最低高度 (基坐标系 z), 单位:米, None 表示不检查
+        :param keep_out_boxes: 禁入区域 [((x_min, y_min, z_min), (x_max, y_max, z_max)), ...], 单位:米
+        :param tolerance: 关节限位的容差, 单位:度
+        """
+        self.robot = robot
+        self.qlim = np.degrees(np.asarray(robot.qlim, dtype=float))
+        self.max_joint_speed = None if max_joint_speed is None else np.broadcast_to(np.asarray(max_joint_speed, dtype=float), (robot.n,))
+        self.min_tcp_height = min_tcp_height
+        self.keep_out_boxes = np.asarray(keep_out_boxes, dtype=float).reshape(-1, 2, 3)
+        self.tolerance = tolerance
+
+    @property
+    def checks_workspace(self) -> bool:
+        return self.min_tcp_height is not None or len(self.keep_out_boxes) > 0
+
+    def validate_joints(self, trajectory, period: float = None, start=None) -> ValidationResult:
+        """检查关节轨迹
+
+        :param trajectory: (N, 6) 机械臂关节角度, 单位:度
+        :param period: 相邻路径点的发送间隔, 单位:秒, None 表示不检查关节速度
+        :param start: 机械臂当前关节角度, 单位:度, 给出时同时检查到第一个路径点的关节变化
+        :return: ValidationResult
+        """
+        q = np.atleast_2d(np.asarray(trajectory, dtype=float))
+        violations = np.zeros((len(q), len(self.REASONS)), dtype=bool)
+        joints = np.full((len(q), len(self.REASONS)), -1)
+
+        out_of_range = (q < self.qlim[0] - self.tolerance) | (q > self.qlim[1] + self.tolerance)
+        violations[:, 0] = out_of_range.any(axis=1)
+        joints[:, 0] = np.argmax(out_of_range, axis=1)
+
+        if self.max_joint_speed is not None and period is not None:
+            previous = q[:-1] if start is None else np.vstack([start, q[:-1]])
+            step_limit = self.max_joint_speed * period + self.tolerance
+            too_fast = np.abs(q[len(q) - len(previous):] - previous) > step_limit
+            violations[len(q) - len(previous):, 1] = too_fast.any(axis=1)
+            joints[len(q) - len(previous):, 1] = np.argmax(too_fast, axis=1)
+
+        if self.checks_workspace:
+            positions = kinematics.fkine_batch(self.robot, np.radians(q))[:, :3, 3]
+            violations[:, 2:] = self._workspace_violations(positions)
+
+        return self._first_violation(violations, joints)
+
+    def validate_poses(self, poses, q_seed=None, period: float = None) -> ValidationResult:
+        """检查笛卡尔路径: 先检查末端位置, 再连续求解逆解并检查得到的关节轨迹
+
+        :param poses: (N, 6) 末端位姿 x, y, z, Rx, Py, Yz, 单位:米, 弧度
+        :param q_seed: 参考关节角, 单位:度, 默认为零位; 检查关节速度时也作为起点
+        :param period: 相邻路径点的发送间隔, 单位:秒, None 表示不检查关节速度
+        :return: ValidationResult, 无逆解时 reason 为 "unreachable"
+        """
+        poses = np.atleast_2d(np.asarray(poses, dtype=float))
+        violations = np.zeros((len(poses), len(self.REASONS)), dtype=bool)
+        if self.checks_workspace:
+            violations[:, 2:] = self._workspace_violations(poses[:, :3])
+        workspace = self._first_violation(violations, np.full(violations.shape, -1))
+        # 只需要求解到第一个不合格的位姿之前
+        end = len(poses) if workspace.valid else workspace.index
+        path = kinematics.inverse_solution_path(self.robot, poses[:end], q_seed=q_seed)
+        if not path.success:
+            return ValidationResult(False, path.failed_index, None, "unreachable")
+        if len(path.q):
+            joints = self.validate_joints(path.q, period=period, start=q_seed)
+            if not joints.valid:
+                return joints
+        return workspace
+
+    def _workspace_violations(self, positions) -> np.ndarray:
+        """(N, 3) 末端位置 -> (N, 2) [低于最低高度, 进入禁入区域]"""
+        violations = np.zeros((len(positions), 2), dtype=bool)
+        if self.min_tcp_height is not None:
+            violations[:, 0] = positions[:, 2] < self.min_tcp_height
+        if len(self.keep_out_boxes):
+            inside = np.all(
+                (positions[:, None, :] >= self.keep_out_boxes[None, :, 0]) & (positions[:, None, :] <= self.keep_out_boxes[None, :, 1]),
+                axis=2,
+            )
+            violations[:, 1] = inside.any(axis=1)
+        return violations
+
+    def _first_violation(self, violations, joints) -> ValidationResult:
+        bad = violations.any(axis=1)
+        if not bad.any():
+            return VALID
+        index = int(np.argmax(bad))
+        check = int(np.argmax(violations[index]))
+        joint = int(joints[index, check])
+        return ValidationResult(False, index, None if joint < 0 else joint + 1, self.REASONS[check])
+
+
+def validate_trajectory(robot, trajectory, period: float = None, start=None, **limits) -> ValidationResult:
+    """使用 TrajectoryValidator 检查关节轨迹, limits 为 TrajectoryValidator 的限制参数"""
+    return TrajectoryValidator(robot, **limits).validate_joints(trajectory, period=period, start=start)
@@ -0,0 +1,197 @@
+import os
+import json
+import math
+
+import numpy as np
+
+from blinx_robots import robot_arm_kinematics as kinematics
+
+# 末端接近方向 (工具 z 轴) 按等面积划分为 ELEVATION_BINS × AZIMUTH_BINS 个区间,
+# 每个体素用一个 uint32 位掩码记录采样到的接近方向, 掩码非零即该体素可达
+ELEVATION_BINS = 4
+AZIMUTH_BINS = 8
+
+
+def approach_bins(directions) -> np.ndarray:
+    """(N, 3) 单位方向向量 -> (N,) 方向区间编号 0 ~ 31
+
+    高度方向按 z 分量均匀划分 (球面上等面积), 方位角按 x, y 均匀划分.
+    """
+    directions = np.atleast_2d(directions)
+    elevation = np.clip(((directions[:, 2] + 1) * (ELEVATION_BINS / 2)).astype(int), 0, ELEVATION_BINS - 1)
+    azimuth = ((np.arctan2(directions[:, 1], directions[:, 0]) + np.pi) * (AZIMUTH_BINS / (2 * np.pi))).astype(int) % AZIMUTH_BINS
+    return elevation * AZIMUTH_BINS + azimuth
+
+
+def _approach_bin(Rx: float, Py: float, Yz: float) -> int:
+    """单个位姿的方向区间编号, 与 approach_bins 一致, 只用 math 计算"""
+    cr, sr, cp, sp, cy, sy = math.cos(Rx), math.sin(Rx), math.cos(Py), math.sin(Py), math.cos(Yz), math.sin(Yz)
+    # R = Rz(Yz) · Ry(Py) · Rx(Rx) 的第三列
+    x, y, z = cy * sp * cr + sy * sr, sy * sp * cr - cy * sr, cp * cr
+    elevation = min(max(int((z + 1) * (ELEVATION_BINS / 2)), 0), ELEVATION_BINS - 1)
+    azimuth = int((math.atan2(y, x) + math.pi) * (AZIMUTH_BINS / (2 * math.pi))) % AZIMUTH_BINS
+    return elevation * AZIMUTH_BINS + azimuth
+
+
+def _metadata_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".json"
+
+
+def build_workspace_index(robot, path: str, samples: int = 2_000_000, voxel_size: float = 0.01, dilate: int = 1,
+                          chunk_size: int = 200_000, seed: int = None) -> "WorkspaceIndex":
+    """在关节限位内随机采样关节角, 用批量正解生成体素化的可达空间与姿态覆盖索引
+
+    结果保存为 path (.npy, uint32 位掩码) 与同名 .json 元数据, 之后通过 WorkspaceIndex.load 内存映射读取.
+
+    :param robot: 机械臂模型, 如 BlinxRobotArm
+    :param path: 索引文件路径, 如 workspace.npy
+    :param samples: 关节空间采样数量
+    :param voxel_size: 体素边长, 单位:米
+    :param dilate: 向相邻体素扩展的层数; 采样无法覆盖边界附近的所有体素, 扩展后可达判断偏保守, 不会误判可达目标
+    :param chunk_size: 每批正解的采样数量, 控制内存占用
+    :param seed: 随机数种子
+    :return: WorkspaceIndex
+    """
+    rng = np.random.default_rng(seed)
+    qlim = np.asarray(robot.qlim, dtype=float)
+    positions, bins = [], []
+    for start in range(0, samples, chunk_size):
+        q = rng.uniform(qlim[0], qlim[1], size=(min(chunk_size, samples - start), robot.n))
+        T = kinematics.fkine_batch(robot, q)
+        positions.append(T[:, :3, 3].astype(np.float32))
+        bins.append(approach_bins(T[:, :3, 2]).astype(np.uint8))
+    positions, bins = np.concatenate(positions), np.concatenate(bins)
+
+    origin = (np.floor(positions.min(axis=0) / voxel_size) - dilate) * voxel_size
+    cells = np.floor((positions - origin) / voxel_size).astype(np.int64)
+    shape = tuple(int(n) for n in cells.max(axis=0) + 1 + dilate)
+    grid = np.zeros(shape, dtype=np.uint32)
+    np.bitwise_or.at(grid, tuple(cells.T), np.left_shift(np.uint32(1), bins.astype(np.uint32)))
+
+    for _ in range(dilate):
+        dilated = grid.copy()
+        for axis in range(3):
+            for shift in (-1, 1):
+                dilated |= _shifted(grid, axis, shift)
+        grid = dilated
+
+    np.save(path, grid)
+    metadata = {
+        "origin": origin.tolist(),
+        "voxel_size": voxel_size,
+        "shape": list(shape),
+        "samples": samples,
+        "dilate": dilate,
+        "elevation_bins": ELEVATION_BINS,
+        "azimuth_bins": AZIMUTH_BINS,
+        "robot": type(robot).__name__,
+    }
+    with open(_metadata_path(path), 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+    return WorkspaceIndex.load(path)
+
+
+def _shifted(grid, axis: int, shift: int) -> np.ndarray:
+    """沿 axis 平移一个体素, 移出边界的部分丢弃, 空出的部分补零"""
+    shifted = np.zeros_like(grid)
+    source = [slice(None)] * 3
+    target = [slice(None)] * 3
+    source[axis] = slice(None, -1) if shift > 0 else slice(1, None)
+    target[axis] = slice(1, None) if shift > 0 else slice(None, -1)
+    shifted[tuple(target)] = grid[tuple(source)]
+    return shifted
+
+
+class WorkspaceIndex(object):
+    """内存映射的可达空间索引, 单次查询只做一次体素定位和一次数组读取
+
+    索引由采样生成: 判断为不可达的位置一定无解 (在采样与扩展精度内), 判断为可达的位置仍需要逆解确认.
+    """
+
+    def __init__(self, grid, origin, voxel_size: float):
+        self.grid = grid
+        self.origin = tuple(float(v) for v in origin)
+        self.voxel_size = float(voxel_size)
+        self.shape = grid.shape
+
+    @classmethod
+    def load(cls, path: str) -> "WorkspaceIndex":
+        """内存映射方式加载 build_workspace_index 生成的索引文件, 不会把整个文件读入内存"""
+        with open(_metadata_path(path), 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        grid = np.load(path, mmap_mode='r')
+        return cls(grid, metadata["origin"], metadata["voxel_size"])
+
+    def _cell(self, x: float, y: float, z: float):
+        i = math.floor((x - self.origin[0]) / self.voxel_size)
+        j = math.floor((y - self.origin[1]) / self.voxel_size)
+        k = math.floor((z - self.origin[2]) / self.voxel_size)
+        nx, ny, nz = self.shape
+        if 0 <= i < nx and 0 <= j < ny and 0 <= k < nz:
+            return i, j, k
+        return None
+
+    def reachable(self, x: float, y: float, z: float) -> bool:
+        """末端位置是否可能可达, 单位:米"""
+        cell = self._cell(x, y, z)
+        return cell is not None and bool(self.grid[cell])
+
+    def pose_reachable(self, pose, check_orientation: bool = True) -> bool:
+        """末端位姿是否可能可达
+
+        :param pose: 末端位姿 x, y, z, Rx, Py, Yz, 单位:米, 弧度
+        :param check_orientation: 是否同时检查该体素是否采样到过相同区间的接近方向
+        """
+        x, y, z, Rx, Py, Yz = pose
+        cell = self._cell(x, y, z)
+        if cell is None:
+            return False
+        mask = int(self.grid[cell])
+        if not check_orientation:
+            return mask != 0
+        return bool(mask >> _approach_bin(Rx, Py, Yz) & 1)
+
+    def orientation_coverage(self, x: float, y: float, z: float) -> float:
+        """末端位置处采样到的接近方向区间占比, 0 ~ 1"""
+        cell = self._cell(x, y, z)
+        if cell is None:
+            return 0.0
+        return bin(int(self.grid[cell])).count("1") / (ELEVATION_BINS * AZIMUTH_BINS)
+
+    def filter_poses(self, poses, check_orientation: bool = True) -> np.ndarray:
+        """批量判断位姿是否可能可达, 用于在规划之前筛选候选抓取位姿
+
+        :param poses: (N, 6) 末端位姿 x, y, z, Rx, Py, Yz
+        :return: (N,) bool
+        """
+        poses = np.atleast_2d(np.asarray(poses, dtype=float))
+        cells = np.floor((poses[:, :3] - self.origin) / self.voxel_size).astype(np.int64)
+        inside = np.all((cells >= 0) & (cells < self.shape), axis=1)
+        masks = np.zeros(len(poses), dtype=np.uint32)
+        masks[inside] = self.grid[tuple(cells[inside].T)]
+        if not check_orientation:
+            return masks != 0
+        rpy = poses[:, 3:]
+        cr, sr = np.cos(rpy[:, 0]), np.sin(rpy[:, 0])
+        cp, sp = np.cos(rpy[:, 1]), np.sin(rpy[:, 1])
+        cy, sy = np.cos(rpy[:, 2]), np.sin(rpy[:, 2])
+        directions = np.column_stack([cy * sp * cr + sy * sr, sy * sp * cr - cy * sr, cp * cr])
+        return (np.right_shift(masks, approach_bins(directions).astype(np.uint32)) & 1).astype(bool)
+
+
+if __name__ == "__main__":
+    import time
+    import argparse
+    from blinx_robots.robot_arm_module import BlinxRobotArm
+
+    parser = argparse.ArgumentParser(description="生成比邻星机械臂可达空间索引")
+    parser.add_argument("--output", default="workspace.npy")
+    parser.add_argument("--samples", type=int, default=2_000_000)
+    parser.add_argument("--voxel-size", type=float, default=0.01)
+    parser.add_argument("--dilate", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = build_workspace_index(BlinxRobotArm(), args.output, args.samples, args.voxel_size, args.dilate, seed=args.seed)
+    print(f"索引已保存: {args.output}, 体素 {index.shape}, 可达 {np.count_nonzero(index.grid)}, 耗时 {time.perf_counter() - start:.1f} 秒")
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+# 测试 SDK 导入: 只控制 IO、读取关节角度的程序不应加载运动学相关模块
+# 导入耗时的性能回退由 benchmarks/run_benchmarks.py 中的 import_ms_median 对比基线检查
+import sys
+import json
+import subprocess
+
+# 宽松的上限, 只用于发现误加载运动学模块 (通常需要数秒) 这类量级上的回退, 不受 CI 机器负载影响
+IMPORT_TIME_BUDGET = 2.0  # 单位:秒
+
+PROBE = """
+import sys, time, json, os
+start = time.perf_counter()
+from blinx_robots.robot_arm_interface import BlxRobotArm
+from blinx_robots.robot_arm_communication import SocketCommunication
+robot = BlxRobotArm(SocketCommunication("127.0.0.1", 1234))
+elapsed = time.perf_counter() - start
+heavy = [name for name in ("numpy", "roboticstoolbox", "spatialmath") if name in sys.modules]
+print(json.dumps({"elapsed": elapsed, "heavy": heavy, "files": os.listdir(".")}))
+"""
+
+
+def test_import_does_not_load_kinematics_stack(tmp_path):
+    output = subprocess.run([sys.executable, "-c", PROBE], cwd=str(tmp_path), capture_output=True, text=True, check=True)
+    result = json.loads(output.stdout.strip().splitlines()[-1])
+    assert result["heavy"] == []
+    assert result["files"] == []  # 导入时不再创建日志文件
+    assert result["elapsed"] < IMPORT_TIME_BUDGET
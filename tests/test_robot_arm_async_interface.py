@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+# 测试 asyncio 版本的机械臂 API
+import json
+import asyncio
+
+from blinx_robots.robot_arm_async_interface import AsyncBlxRobotArm
+
+
+async def handle_client(reader, writer):
+    """最简单的机械臂替身: 运动命令回复 move_in_place, 其余命令原样回复 true"""
+    while True:
+        try:
+            line = await reader.readuntil(b'\r\n')
+        except asyncio.IncompleteReadError:
+            return
+        command = json.loads(line)["command"]
+        if command.startswith("set_joint_angle"):
+            reply = {"command": "move_in_place", "data": True}
+        elif command == "get_joint_angle_all":
+            reply = {"command": command, "data": [1, 2, 3, 4, 5, 6]}
+        else:
+            reply = {"command": command, "data": True}
+        # 故意将响应拆成两段发送, 验证分帧
+        frame = json.dumps(reply).encode('utf-8') + b'\r\n'
+        writer.write(frame[:5])
+        await writer.drain()
+        writer.write(frame[5:])
+        await writer.drain()
+
+
+def test_async_commands_round_trip():
+    async def main():
+        server = await asyncio.start_server(handle_client, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with AsyncBlxRobotArm('127.0.0.1', port, command_timeout=5) as robot:
+            moves = await asyncio.gather(*[robot.set_joint_degree_synchronize(1, 2, 3, 4, 5, 6) for _ in range(20)])
+            assert all(json.loads(move)["status"] for move in moves)
+            assert json.loads(await robot.set_robot_end_tool(1, True))["status"]
+            assert (await robot.get_joint_degree_all())["data"] == [1, 2, 3, 4, 5, 6]
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(main())
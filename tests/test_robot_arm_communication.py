@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# 测试通讯层的增量帧缓冲区与长连接
+import json
+import socket
+import threading
+import time
+
+from blinx_robots.robot_arm_interface import BlxRobotArm
+from blinx_robots.robot_arm_communication import FrameBuffer, SocketCommunication, encode_command
+
+
+def feed(frame_buffer, chunks):
+    frames = []
+    for chunk in chunks:
+        while chunk:
+            writable = frame_buffer.writable()
+            nbytes = min(len(writable), len(chunk))
+            writable[:nbytes] = chunk[:nbytes]
+            frame_buffer.commit(nbytes)
+            chunk = chunk[nbytes:]
+        frames.extend(frame_buffer.frames())
+    return frames
+
+
+def test_frames_split_across_reads():
+    payload = json.dumps({"command": "get_joint_angle_all", "data": [1.5, 2, 3, 4, 5, 6]}).encode('utf-8') + b'\r\n'
+    chunks = [payload[:7], payload[7:-1], payload[-1:] + payload]
+    frames = feed(FrameBuffer(), chunks)
+    assert [json.loads(frame) for frame in frames] == [json.loads(payload)] * 2
+
+
+def test_multibyte_utf8_split_and_buffer_growth():
+    payload = json.dumps({"command": "set_robot_mode", "data": ["顺序模式"]}, ensure_ascii=False).encode('utf-8')
+    stream = (payload + b'\r\n\r\n') * 3
+    chunks = [stream[i:i + 3] for i in range(0, len(stream), 3)]
+    frame_buffer = FrameBuffer(capacity=8)
+    frames = feed(frame_buffer, chunks)
+    assert [json.loads(frame)["data"] for frame in frames] == [["顺序模式"]] * 3
+    assert len(frame_buffer) == 0
+
+
+def accept_frames(server, accepted, received, close_after=None):
+    """替身服务器: 记录每条连接收到的帧, 收到 close_after 条后主动断开"""
+    while True:
+        try:
+            client, _ = server.accept()
+        except OSError:
+            return
+        accepted.append(client)
+        buffer = b''
+        while True:
+            data = client.recv(4096)
+            if not data:
+                break
+            buffer += data
+            while b'\r\n' in buffer:
+                frame, buffer = buffer.split(b'\r\n', 1)
+                received.append(json.loads(frame))
+            if close_after is not None and len(received) >= close_after:
+                client.close()
+                break
+
+
+def test_connection_is_reused_across_sends():
+    server = socket.create_server(('127.0.0.1', 0))
+    accepted, received = [], []
+    threading.Thread(target=accept_frames, args=(server, accepted, received), daemon=True).start()
+    communication = SocketCommunication('127.0.0.1', server.getsockname()[1])
+    try:
+        for i in range(20):
+            communication.send(encode_command("set_end_tool", [1, i % 2 == 0]))
+        deadline = time.monotonic() + 2
+        while len(received) < 20 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(received) == 20
+        assert len(accepted) == 1 and communication.connect_count == 1
+    finally:
+        communication.close()
+        server.close()
+
+
+def test_peer_disconnect_fails_pending_commands():
+    server = socket.create_server(('127.0.0.1', 0))
+    accepted, received = [], []
+    threading.Thread(target=accept_frames, args=(server, accepted, received, 1), daemon=True).start()
+    robot = BlxRobotArm(SocketCommunication('127.0.0.1', server.getsockname()[1]))  # 不设超时, 断开后不能一直等待
+    metrics = robot.enable_metrics()
+    robot.start_communication()
+    try:
+        pending = robot.get_joint_degree_all_async()
+        assert pending.result(timeout=2) == {"command": "get_joint_angle_all", "data": False}
+        assert not robot.thread_work_flag and not robot.communication_strategy.connected
+        # 连接中断后提交的命令立即失败
+        assert robot.get_joint_degree_all_async().result(timeout=1)["data"] is False
+        assert robot.response_dispatcher.pending_count() == 0
+        assert metrics.snapshot()["counters"]["connection_losses"] == 1
+    finally:
+        robot.end_communication()
+        robot.task_executor.shutdown()
+        server.close()
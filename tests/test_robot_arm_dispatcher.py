@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+# 测试命令响应分发器
+import json
+
+import pytest
+
+from blinx_robots.robot_arm_dispatcher import ResponseDispatcher
+
+
+def test_dispatch_fifo_per_command_name():
+    dispatcher = ResponseDispatcher()
+    first = dispatcher.register("move_in_place")
+    second = dispatcher.register("move_in_place")
+    tool = dispatcher.register("set_end_tool")
+
+    assert dispatcher.dispatch(json.dumps({"command": "set_end_tool", "data": True}))
+    assert dispatcher.dispatch(json.dumps({"command": "move_in_place", "data": True}))
+    assert not second.done()
+    assert dispatcher.dispatch(json.dumps({"command": "move_in_place", "data": False}))
+
+    assert tool.result(timeout=0) == {"command": "set_end_tool", "data": True}
+    assert first.result(timeout=0).get('data') is True
+    assert second.result(timeout=0).get('data') is False
+
+
+def test_unclaimed_and_discarded_responses():
+    dispatcher = ResponseDispatcher()
+    assert not dispatcher.dispatch('{"command": "get_robot_mode", "data": "SEQ"}')
+    assert not dispatcher.dispatch('{"command": "get_robot_mode"')
+
+    stale = dispatcher.register("get_robot_mode")
+    fresh = dispatcher.register("get_robot_mode")
+    dispatcher.discard(stale)
+    assert dispatcher.pending_count("get_robot_mode") == 1
+    # 已撤销命令的迟到响应被丢弃, 不会交给后面登记的调用方
+    assert not dispatcher.dispatch('{"command": "get_robot_mode", "data": "SEQ"}')
+    assert not fresh.done()
+    assert dispatcher.dispatch('{"command": "get_robot_mode", "data": "INT"}')
+    assert fresh.result(timeout=0).get('data') == "INT"
+
+    unsent = dispatcher.register("get_robot_mode")
+    dispatcher.discard(unsent, reply_expected=False)
+    after = dispatcher.register("get_robot_mode")
+    assert dispatcher.dispatch('{"command": "get_robot_mode", "data": "SEQ"}')
+    assert after.result(timeout=0).get('data') == "SEQ"
+
+
+def test_fail_all_releases_waiters():
+    dispatcher = ResponseDispatcher()
+    future = dispatcher.register("set_robot_mode")
+    dispatcher.fail_all(ConnectionError("closed"))
+    with pytest.raises(ConnectionError):
+        future.result(timeout=0)
+    assert dispatcher.pending_count() == 0
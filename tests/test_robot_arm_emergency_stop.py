@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+# 测试专用急停通道
+import os
+import json
+import time
+import signal
+import socket
+import asyncio
+import threading
+import multiprocessing
+
+import pytest
+
+from blinx_robots.robot_arm_interface import BlxRobotArm
+from blinx_robots.robot_arm_communication import SocketCommunication
+from blinx_robots.robot_arm_emergency_stop import EmergencyStopChannel
+from blinx_robots.robot_arm_simulator import RobotArmSimulator
+
+# 急停帧发送耗时的宽松上限, 单位:秒, 只用于发现急停等待握手或连接重试 (秒级) 的问题.
+# 发送本身只需几十微秒, 但命令连接满负荷时其它线程持有 GIL, 受机器负载影响较大;
+# 实际的发送耗时见 benchmarks/run_benchmarks.py 中的 estop_trigger_us_*
+TYPICAL_SEND_LATENCY = 0.01
+WORST_CASE_SEND_LATENCY = 0.5
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def run_simulator(port_queue):
+    async def main():
+        simulator = RobotArmSimulator(time_scale=0.0, latency=0.001)
+        port_queue.put((await simulator.start())[1])
+        await asyncio.Event().wait()
+
+    asyncio.run(main())
+
+
+def test_worst_case_latency_while_command_link_is_busy():
+    # 模拟器运行在独立进程中, 与真实机械臂一样不和 SDK 争用解释器
+    port_queue = multiprocessing.Queue()
+    simulator_process = multiprocessing.Process(target=run_simulator, args=(port_queue,), daemon=True)
+    simulator_process.start()
+    robot = BlxRobotArm(SocketCommunication('127.0.0.1', port_queue.get(timeout=10)), command_timeout=5)
+    robot.start_communication()
+    try:
+        assert robot.enable_emergency_stop_channel(heartbeat_interval=0.2)
+        channel = robot.emergency_stop_channel
+        busy = threading.Event()
+
+        def flood():
+            while not busy.is_set():
+                robot.submit_batch([("set_joint_angle_all_time", [50, 1, 0, 0, 0, 0, 0])] * 200)
+                time.sleep(0.001)
+
+        flood_thread = threading.Thread(target=flood)
+        flood_thread.start()
+        latencies = []
+        try:
+            for _ in range(200):
+                robot.set_robot_arm_emergency_stop()
+                latencies.append(channel.last_latency)
+                time.sleep(0.001)
+        finally:
+            busy.set()
+            flood_thread.join()
+
+        assert channel.trigger_count == 200
+        assert sorted(latencies)[len(latencies) // 2] < TYPICAL_SEND_LATENCY
+        assert channel.max_latency == max(latencies) < WORST_CASE_SEND_LATENCY
+    finally:
+        robot.end_communication()
+        robot.task_executor.shutdown()
+        simulator_process.terminate()
+        simulator_process.join()
+
+
+def test_heartbeat_reconnects_after_link_loss():
+    with RobotArmSimulator() as simulator:
+        channel = EmergencyStopChannel(simulator.host, simulator.port, heartbeat_interval=0.02, heartbeat_timeout=0.2)
+        try:
+            assert channel.start() and wait_until(lambda: channel.healthy)
+            simulator.drop_connections()
+            assert wait_until(lambda: channel.reconnect_count == 1 and channel.healthy)
+            assert channel.trigger()
+            assert wait_until(lambda: simulator.emergency_stopped)
+        finally:
+            channel.stop()
+    assert not channel.trigger()
+
+
+def test_failed_trigger_drops_the_link_and_keeps_latency_stats():
+    with RobotArmSimulator() as simulator:
+        channel = EmergencyStopChannel(simulator.host, simulator.port, heartbeat_interval=10.0, heartbeat_timeout=0.2)
+        try:
+            assert channel.start() and wait_until(lambda: channel.healthy)
+            channel._socket.shutdown(socket.SHUT_WR)  # 之后的写入失败, 如同只写出了一部分急停帧
+            assert not channel.trigger()
+            assert channel.trigger_count == 0 and channel.last_latency is None and channel.max_latency == 0.0
+            # 心跳线程立即重连, 不等待下一个心跳周期
+            assert wait_until(lambda: channel.reconnect_count == 1 and channel.healthy)
+            assert channel.trigger() and channel.trigger_count == 1
+            assert wait_until(lambda: simulator.emergency_stopped)
+        finally:
+            channel.stop()
+
+
+def test_emergency_stop_never_waits_for_a_new_connection():
+    server = socket.create_server(('127.0.0.1', 0))  # 不接受连接
+    robot = BlxRobotArm(SocketCommunication('127.0.0.1', server.getsockname()[1]))
+    try:
+        start = time.monotonic()
+        result = json.loads(robot.set_robot_arm_emergency_stop())
+        assert time.monotonic() - start < 0.5  # 没有进入连接重试
+        assert result == {"command": "set_joint_emergency_stop", "status": False}
+        assert robot.communication_strategy.connect_count == 0
+    finally:
+        robot.task_executor.shutdown()
+        server.close()
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="需要 POSIX 信号")
+def test_trigger_from_signal_handler():
+    with RobotArmSimulator() as simulator:
+        channel = EmergencyStopChannel(simulator.host, simulator.port)
+        previous = signal.signal(signal.SIGUSR1, lambda signum, frame: channel.trigger())
+        try:
+            assert channel.start()
+            os.kill(os.getpid(), signal.SIGUSR1)
+            assert wait_until(lambda: simulator.emergency_stopped)
+            assert channel.trigger_count == 1
+        finally:
+            signal.signal(signal.SIGUSR1, previous)
+            channel.stop()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# 测试多机械臂集群控制
+import json
+import asyncio
+
+from blinx_robots.robot_arm_fleet import RobotArmFleet
+
+
+def make_handler(log):
+    async def handle_client(reader, writer):
+        """机械臂替身: 记录收到的命令, 运动命令回复 move_in_place"""
+        port = writer.get_extra_info('sockname')[1]
+        while True:
+            try:
+                line = await reader.readuntil(b'\r\n')
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            message = json.loads(line)
+            command = message["command"]
+            log.append((port, command, message.get("data")))
+            if command == "set_joint_emergency_stop":
+                continue
+            if command.startswith("set_joint_angle"):
+                await asyncio.sleep(0.01)
+                reply = {"command": "move_in_place", "data": True}
+            elif command == "get_joint_angle_all":
+                reply = {"command": command, "data": [port % 100, 0, 0, 0, 0, 0]}
+            else:
+                reply = {"command": command, "data": True}
+            writer.write(json.dumps(reply).encode('utf-8') + b'\r\n')
+            await writer.drain()
+    return handle_client
+
+
+def test_fleet_queues_broadcast_and_telemetry():
+    async def main():
+        log = []
+        servers = [await asyncio.start_server(make_handler(log), '127.0.0.1', 0) for _ in range(3)]
+        ports = [server.sockets[0].getsockname()[1] for server in servers]
+        fleet = RobotArmFleet(command_timeout=5)
+        for i, port in enumerate(ports):
+            fleet.add_arm(f"arm{i}", '127.0.0.1', port)
+
+        async with fleet:
+            # 同一台机械臂的命令按提交顺序执行
+            moves = [fleet.submit("arm0", "set_joint_degree_synchronize", i, 0, 0, 0, 0, 0) for i in range(5)]
+            assert fleet.queue_depths()["arm0"] == 5
+            assert all(json.loads(result)["status"] for result in await asyncio.gather(*moves))
+            assert [data[1] for port, command, data in log if port == ports[0]] == list(range(5))
+
+            results = await fleet.broadcast("set_robot_arm_home")
+            assert sorted(results) == ["arm0", "arm1", "arm2"]
+            assert all(json.loads(result)["status"] for result in results.values())
+
+            await fleet.emergency_stop_all()
+            await asyncio.sleep(0.05)
+            assert sum(command == "set_joint_emergency_stop" for _, command, _ in log) == 3
+
+            fleet.start_telemetry(rate=50)
+            await asyncio.sleep(0.2)
+            states = fleet.joint_states(max_age=1.0)
+            assert {name: state[0] for name, state in states.items()} == {f"arm{i}": port % 100 for i, port in enumerate(ports)}
+            assert len(fleet.telemetry["arm1"]) > 3
+
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(main())
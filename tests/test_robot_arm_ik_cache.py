@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# 测试逆解缓存
+import json
+
+import numpy as np
+
+from blinx_robots.robot_arm_ik_cache import InverseSolutionCache
+from blinx_robots.robot_arm_interface import BlxRobotArm
+
+
+def test_quantized_lookup_and_lru_eviction():
+    cache = InverseSolutionCache(maxsize=2, tolerance=1e-3, angle_tolerance=1e-2)
+    pose = [0.2, 0.1, 0.3, 0.0, 0.5, 1.0]
+    cache.put(cache.make_key(pose), [1, 2, 3, 4, 5, 6])
+    assert cache.get(cache.make_key([0.2002, 0.1, 0.3, 0.0, 0.501, 1.0])) == [1, 2, 3, 4, 5, 6]
+    assert cache.get(cache.make_key(pose, branch=(1, 1, -1))) is None
+
+    cache.put(cache.make_key([0.3, 0, 0, 0, 0, 0]), [0] * 6)
+    cache.get(cache.make_key(pose))
+    cache.put(cache.make_key([0.4, 0, 0, 0, 0, 0]), [0] * 6)
+    assert cache.get(cache.make_key([0.3, 0, 0, 0, 0, 0])) is None
+    assert cache.get(cache.make_key(pose)) is not None
+    assert cache.stats()["hits"] == 3 and cache.stats()["misses"] == 2
+
+
+def test_save_and_preload(tmp_path):
+    cache_file = str(tmp_path / "ik_cache.json")
+    cache = InverseSolutionCache()
+    key = cache.make_key([0.2, 0.1, 0.3, 0.0, 0.5, 1.0], branch=(1, 1, -1))
+    cache.put(key, [1.5, 2, 3, 4, 5, 6])
+    cache.save(cache_file)
+
+    preloaded = InverseSolutionCache()
+    assert preloaded.load(cache_file) == 1
+    assert preloaded.get(key) == [1.5, 2, 3, 4, 5, 6]
+    assert InverseSolutionCache(tolerance=1e-2).load(cache_file) == 0
+
+
+def test_arm_reuses_cached_solutions_and_preloads_saved_cache(tmp_path):
+    cache_file = str(tmp_path / "ik_cache.json")
+    joint_degrees = [10, 20, -30, 0, 40, 0]
+    robot = BlxRobotArm(None)
+    robot.enable_ik_cache(cache_file=cache_file)
+    pose = json.loads(robot.get_positive_solution(*joint_degrees))["data"]
+
+    solved = json.loads(robot.get_inverse_solution(*pose))["data"]
+    assert robot.ik_cache.stats()["misses"] == 1 and robot.ik_cache.stats()["hits"] == 0
+    np.testing.assert_allclose(json.loads(robot.get_positive_solution(*solved))["data"], pose, atol=1e-4)
+    assert json.loads(robot.get_inverse_solution(*pose))["data"] == solved
+    assert robot.ik_cache.stats()["hits"] == 1
+
+    # 给出参考关节角度时按参考值所在的解分支单独缓存
+    seeded = json.loads(robot.get_inverse_solution(*pose, q_seed=joint_degrees))["data"]
+    assert robot.ik_cache.stats()["misses"] == 2
+    np.testing.assert_allclose(seeded, joint_degrees, atol=0.5)  # 正解结果保留 3 位小数
+    assert json.loads(robot.get_inverse_solution(*pose, q_seed=joint_degrees))["data"] == seeded
+    assert robot.ik_cache.stats()["hits"] == 2 and robot.ik_cache.stats()["size"] == 2
+
+    robot.save_ik_cache()
+    reloaded = BlxRobotArm(None)
+    reloaded.enable_ik_cache(cache_file=cache_file)
+    assert reloaded.ik_cache.stats()["size"] == 2
+    assert json.loads(reloaded.get_inverse_solution(*pose, q_seed=joint_degrees))["data"] == seeded
+    assert json.loads(reloaded.get_inverse_solution(*pose))["data"] == solved
+    assert reloaded.ik_cache.stats()["hits"] == 2 and reloaded.ik_cache.stats()["misses"] == 0
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+# 测试机械臂 API 与替身服务器之间的命令收发
+import json
+import socket
+import threading
+
+import pytest
+
+from blinx_robots.robot_arm_interface import BlxRobotArm
+from blinx_robots.robot_arm_communication import SocketCommunication
+
+
+class StandInServer(object):
+    """最简单的机械臂替身: 收齐 hold 条命令后才开始回复, 验证命令是连续发出的"""
+
+    def __init__(self, hold: int = 1, fail_index: int = None):
+        self.hold = hold
+        self.fail_index = fail_index
+        self.received = []
+        self.server = socket.create_server(('127.0.0.1', 0))
+        self.port = self.server.getsockname()[1]
+        threading.Thread(target=self.serve, daemon=True).start()
+
+    def reply_for(self, index, message):
+        command = message["command"]
+        if command == "set_time_delay":
+            return None
+        if command.startswith("set_joint_angle"):
+            command = "move_in_place"
+        if command == "get_joint_angle_all":
+            return {"command": command, "data": [1, 2, 3, 4, 5, 6]}
+        return {"command": command, "data": index != self.fail_index}
+
+    def serve(self):
+        client, _ = self.server.accept()
+        buffer, pending = b'', []
+        while True:
+            data = client.recv(4096)
+            if not data:
+                return
+            buffer += data
+            while b'\r\n' in buffer:
+                frame, buffer = buffer.split(b'\r\n', 1)
+                message = json.loads(frame)
+                pending.append(self.reply_for(len(self.received), message))
+                self.received.append(message)
+            if len(self.received) >= self.hold:
+                replies = [reply for reply in pending if reply is not None]
+                client.sendall(b''.join(json.dumps(reply).encode('utf-8') + b'\r\n' for reply in replies))
+                pending = []
+
+
+@pytest.fixture
+def connect():
+    robots = []
+
+    def _connect(server):
+        robot = BlxRobotArm(SocketCommunication('127.0.0.1', server.port), command_timeout=5)
+        robot.start_communication()
+        robots.append(robot)
+        return robot
+
+    yield _connect
+    for robot in robots:
+        robot.end_communication()
+        robot.task_executor.shutdown()
+
+
+def test_submit_batch_pipelines_commands(connect):
+    commands = [("set_joint_angle_all_time", [50, i, 0, 0, 0, 0, 0]) for i in range(10)]
+    commands.insert(5, ("set_time_delay", [100]))
+    commands.append(("set_end_tool", [1, True]))
+    server = StandInServer(hold=len(commands))
+    robot = connect(server)
+
+    futures = robot.submit_batch(commands)
+    result = robot.wait_all(futures)
+    assert result["status"] and result["failed_index"] is None
+    assert [reply["command"] for reply in result["data"]][-2:] == ["move_in_place", "set_end_tool"]
+    assert [message["command"] for message in server.received] == [command for command, _ in commands]
+
+
+def test_wait_all_stops_on_first_failure(connect):
+    robot = connect(StandInServer(hold=4, fail_index=2))
+    futures = robot.submit_batch([("set_end_tool", [1, True])] * 4)
+    result = robot.wait_all(futures)
+    assert not result["status"] and result["failed_index"] == 2 and len(result["data"]) == 2
+
+    with pytest.raises(ValueError):
+        robot.submit_batch([("set_end_tool", [1, True]), ("set_joint_emergency_stop", [0])])
+
+
+def test_async_variants_do_not_use_worker_threads(connect):
+    in_flight = 300
+    robot = connect(StandInServer(hold=in_flight + 2))
+    thread_count = threading.active_count()
+
+    moves = [robot.set_joint_degree_synchronize_async(1, 2, 3, 4, 5, 6) for _ in range(in_flight)]
+    tool = robot.set_robot_end_tool_async(1, True)
+    joints = robot.get_joint_degree_all_async()
+    assert threading.active_count() == thread_count
+    assert not any(move.done() for move in moves)
+
+    assert all(json.loads(move.result(timeout=5))["status"] for move in moves)
+    assert json.loads(tool.result(timeout=5)) == {"command": "set_end_tool", "status": True}
+    assert joints.result(timeout=5)["data"] == [1, 2, 3, 4, 5, 6]
+    assert json.loads(robot.set_joint_degree_synchronize_async(1, 2).result(timeout=0))["status"] is False
+
+
+def test_late_reply_to_timed_out_command_is_dropped(connect):
+    # 替身服务器收到第二条命令后才一起回复, 第一条的响应 data 为 false
+    robot = connect(StandInServer(hold=2, fail_index=0))
+    timed_out = robot.submit_command("get_robot_mode")
+    assert robot.get_command_response(timed_out, timeout=0.2) == {"command": "get_robot_mode", "data": False}
+
+    fresh = robot.submit_command("get_robot_mode")
+    assert robot.get_command_response(fresh, timeout=5) == {"command": "get_robot_mode", "data": True}
+    assert robot.response_dispatcher.pending_count() == 0
+
+
+def test_home_reports_the_arm_reply(connect):
+    robot = connect(StandInServer(fail_index=0))
+    assert json.loads(robot.set_robot_arm_home()) == {"command": "set_robot_arm_home", "status": False}
+    assert json.loads(robot.set_robot_arm_home()) == {"command": "set_robot_arm_home", "status": True}
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+# 测试机械臂正逆解
+import numpy as np
+
+from blinx_robots import robot_arm_kinematics as kinematics
+from blinx_robots.robot_arm_module import BlinxRobotArm, BlinxRobotArmDH
+
+robot = BlinxRobotArm()
+
+
+def random_joints(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(robot.qlim[0], robot.qlim[1], size=(count, robot.n))
+
+
+def test_analytic_ik_recovers_sampled_joints():
+    for q in random_joints(200):
+        T = robot.fkine(q).A
+        solutions = robot.ikine_analytic(T, q0=q)
+        assert len(solutions) > 0
+        np.testing.assert_allclose(solutions[0], q, atol=1e-6)
+        for solution in solutions:
+            assert np.all(solution >= robot.qlim[0] - 1e-9) and np.all(solution <= robot.qlim[1] + 1e-9)
+            np.testing.assert_allclose(robot.fkine(solution).A, T, atol=1e-6)
+
+
+def test_analytic_ik_wrist_singularity_and_unreachable():
+    q = np.array([0.1, 0.2, 0.3, 0.4, -np.pi / 2, 0.5])
+    solutions = robot.ikine_analytic(robot.fkine(q).A, q0=q)
+    np.testing.assert_allclose(robot.fkine(solutions[0]).A, robot.fkine(q).A, atol=1e-6)
+    assert len(robot.ikine_analytic(kinematics.pose_to_transform([2.0, 0, 0, 0, 0, 0]))) == 0
+
+
+def test_inverse_solution_uses_seed():
+    q_seed = [10, 20, -30, 40, -50, 60]
+    pose = kinematics.positive_solution(robot, q_seed)
+    np.testing.assert_allclose(kinematics.inverse_solution(robot, pose, q_seed), q_seed, atol=0.5)
+
+
+def test_batch_positive_solution_matches_fkine():
+    q = random_joints(100, seed=1)
+    transforms = kinematics.batch_positive_solution(robot, np.degrees(q), transforms=True)
+    poses = kinematics.batch_positive_solution(robot, np.degrees(q))
+    for i in range(len(q)):
+        T = robot.fkine(q[i])
+        np.testing.assert_allclose(transforms[i], T.A, atol=1e-12)
+        np.testing.assert_allclose(poses[i], np.r_[T.t, T.rpy(order="zyx")], atol=1e-12)
+
+
+def test_chain_kernel_matches_toolbox():
+    for model in (robot, BlinxRobotArmDH()):
+        qs = random_joints(100, seed=3)
+        transforms, jacobians = model.fkine_fast(qs), model.jacob0_fast(qs)
+        for q, T, J in zip(qs, transforms, jacobians):
+            np.testing.assert_allclose(T, model.fkine(q).A, atol=1e-9)
+            np.testing.assert_allclose(J, model.jacob0(q), atol=1e-9)
+        np.testing.assert_allclose(model.fkine_fast(qs[0]), transforms[0], atol=1e-12)
+
+
+def test_positive_solution_wrist_pitch_singularity():
+    T = kinematics.pose_to_transform([0.2, 0.0, 0.2, 0.3, np.pi / 2, 0.5])
+    pose = kinematics.transforms_to_poses(T[None])[0]
+    np.testing.assert_allclose(kinematics.pose_to_transform(pose), T, atol=1e-9)
+    assert pose[3] == 0.0
+
+
+def test_inverse_solution_path_is_continuous():
+    q_start = np.radians([10, 20, -30, 40, -50, 60])
+    start_pose = kinematics.transforms_to_poses(kinematics.fkine_batch(robot, q_start))[0]
+    poses = start_pose + np.outer(np.linspace(0, 1, 30), [0, 0.02, 0.01, 0, 0, 0.2])
+    path = kinematics.inverse_solution_path(robot, poses, np.degrees(q_start), max_joint_step=5)
+    assert path.success and path.discontinuities == []
+    np.testing.assert_allclose(kinematics.batch_positive_solution(robot, path.q), poses, atol=1e-6)
+
+
+def test_path_discontinuities_are_reported():
+    q = np.radians([[0, 0, 0, 0, -30, 0], [0, 0, 0, 0, -150, 0], [60, 0, 0, 0, -150, 0]])
+    discontinuities = kinematics._path_discontinuities(robot, q, max_joint_step=30)
+    assert (1, "branch_flip") in discontinuities and (2, "joint_jump") in discontinuities
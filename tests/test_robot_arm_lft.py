@@ -2,12 +2,12 @@ import time
 import json
 from loguru import logger
 
+from blinx_robots import configure_logging
 from blinx_robots.robot_arm_interface import BlxRobotArm
 from blinx_robots.robot_arm_communication import SocketCommunication
 
-logger.add("robot_arm_interface.log", rotation="100 MB", level="DEBUG")
-
 if __name__ == "__main__":
+    configure_logging("robot_arm_interface.log", rotation="100 MB")
     try:
         # 连接机械臂
         robot_one_host = "192.168.10.32"
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# 测试运行指标统计
+import json
+
+from blinx_robots.robot_arm_interface import BlxRobotArm
+from blinx_robots.robot_arm_communication import SocketCommunication
+from blinx_robots.robot_arm_metrics import Histogram
+from blinx_robots.robot_arm_simulator import RobotArmSimulator
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram(buckets=(1, 2, 5))
+    for value in (0.5, 1.5, 1.5, 4, 10):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"1": 1, "2": 2, "5": 1, "+Inf": 1}
+    assert snapshot["count"] == 5 and snapshot["sum"] == 17.5 and snapshot["max"] == 10
+    assert snapshot["p50"] == 2 and snapshot["p99"] == 10
+
+
+def test_command_latency_and_prometheus_export():
+    with RobotArmSimulator(time_scale=0.0, latency=0.002) as simulator:
+        robot = BlxRobotArm(SocketCommunication(simulator.host, simulator.port), command_timeout=5)
+        robot.start_communication()
+        try:
+            metrics = robot.enable_metrics()
+            for i in range(5):
+                assert json.loads(robot.set_joint_degree_synchronize(i, 0, 0, 0, 0, 0))["status"]
+            robot.set_time_delay(10)
+            robot.get_joint_degree_all()
+            robot.get_inverse_solution(0.23, 0.084, 0.269, 0.3, -0.0, -0.0)
+            snapshot = robot.get_metrics()
+        finally:
+            robot.end_communication()
+            robot.task_executor.shutdown()
+
+    moves = snapshot["commands"]["set_joint_angle_all_time"]
+    assert moves["round_trip"]["count"] == 5 and moves["ack"]["min"] >= 0.002
+    assert snapshot["commands"]["set_time_delay"]["queue_wait"]["count"] == 1
+    assert snapshot["commands"]["set_time_delay"]["ack"]["count"] == 0
+    assert snapshot["counters"]["commands_sent"] == 7
+    assert snapshot["ik"]["seconds"]["count"] == 1 and snapshot["ik"]["iterations"]["max"] == 0
+    assert snapshot["gauges"] == {"command_queue_depth": 0, "recv_data_buffer_depth": 0, "pending_responses": 0}
+
+    text = metrics.to_prometheus()
+    assert 'blinx_robot_arm_command_round_trip_seconds_count{command="set_joint_angle_all_time"} 5' in text
+    assert 'blinx_robot_arm_command_ack_seconds_bucket{command="get_joint_angle_all",le="+Inf"} 1' in text
+    assert "blinx_robot_arm_commands_sent_total 7" in text
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+# 测试笛卡尔路径插值
+import numpy as np
+import pytest
+
+from blinx_robots import robot_arm_path
+from blinx_robots import robot_arm_kinematics as kinematics
+from blinx_robots.robot_arm_module import BlinxRobotArm
+
+
+def test_quaternion_round_trip_matches_kinematics_convention():
+    robot = BlinxRobotArm()
+    q = np.random.default_rng(0).uniform(robot.qlim[0], robot.qlim[1], size=(50, 6))
+    rpy = kinematics.fkine_batch(robot, q)
+    rpy = kinematics.transforms_to_poses(rpy)[:, 3:]
+    np.testing.assert_allclose(robot_arm_path.quaternion_to_rpy(robot_arm_path.rpy_to_quaternion(rpy)), rpy, atol=1e-9)
+
+
+def test_linear_path_step_and_endpoints():
+    start, end = [0.2, 0.0, 0.2, 0.0, 0.0, 0.0], [0.2, 0.1, 0.3, 0.5, 0.0, 1.0]
+    poses = robot_arm_path.linear_path(start, end, step=0.01)
+    np.testing.assert_allclose(poses[[0, -1]], [start, end], atol=1e-12)
+    assert np.max(np.linalg.norm(np.diff(poses[:, :3], axis=0), axis=1)) <= 0.01 + 1e-12
+    np.testing.assert_allclose(np.cross(poses[:, :3] - start[:3], np.subtract(end[:3], start[:3])), 0, atol=1e-12)
+
+
+def test_arc_path_passes_through_via_point():
+    start, via, end = [0.2, 0.0, 0.2, 0, 0, 0], [0.25, 0.05, 0.2, 0, 0, 0], [0.2, 0.1, 0.2, 0, 0, 1.0]
+    poses = robot_arm_path.arc_path(start, via, end, step=0.001)
+    center = np.array([0.2, 0.05, 0.2])
+    np.testing.assert_allclose(np.linalg.norm(poses[:, :3] - center, axis=1), 0.05, atol=1e-12)
+    assert np.min(np.linalg.norm(poses[:, :3] - via[:3], axis=1)) < 0.001
+    np.testing.assert_allclose(poses[-1], end, atol=1e-12)
+    with pytest.raises(ValueError):
+        robot_arm_path.arc_path(start, [0.25, 0.0, 0.2, 0, 0, 0], [0.3, 0.0, 0.2, 0, 0, 0])
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# 测试示教录制与回放
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+from blinx_robots import robot_arm_recording as recording
+from blinx_robots.robot_arm_interface import BlxRobotArm
+from blinx_robots.robot_arm_communication import SocketCommunication
+from blinx_robots.robot_arm_simulator import RobotArmSimulator
+
+
+def write_log(path, count=10000):
+    joints = np.column_stack([np.linspace(0, 90, count), np.linspace(0, -30, count), np.zeros((count, 4))])
+    with recording.MotionRecorder(path) as recorder:
+        base = recorder._monotonic_start
+        for i, q in enumerate(joints):
+            recorder.record_joints(q, base + i * 0.01)
+            if i == count // 2:
+                recorder.record_io(recording.KIND_END_TOOL, 1, True, base + i * 0.01)
+    return joints
+
+
+def test_log_is_compact_and_memory_mapped(tmp_path):
+    path = str(tmp_path / "teach.bin")
+    joints = write_log(path)
+    assert os.path.getsize(path) == recording.HEADER_SIZE + 10001 * recording.RECORD_DTYPE.itemsize
+
+    motion_log = recording.MotionLog(path)
+    assert isinstance(motion_log.records, np.memmap) and len(motion_log) == 10001
+    assert abs(motion_log.duration - 99.99) < 1e-6
+    t, q = motion_log.joint_states()
+    np.testing.assert_allclose(q, joints, atol=1e-4)
+    assert motion_log.io_events() == [(t[5000], recording.KIND_END_TOOL, 1, True)]
+    window = motion_log.time_slice(9.995, 10.045)
+    np.testing.assert_allclose(window["t"], [10.0, 10.01, 10.02, 10.03, 10.04], atol=1e-9)
+    assert sum(len(chunk) for chunk in motion_log.stream(chunk_size=999)) == 10001
+
+
+def test_partial_tail_is_ignored_and_append_continues(tmp_path):
+    path = str(tmp_path / "teach.bin")
+    write_log(path, count=100)
+    with open(path, 'ab') as f:
+        f.write(b"\x01" * 10)  # 异常退出时留下的半条记录
+    assert len(recording.MotionLog(path)) == 101
+    with recording.MotionRecorder(path) as recorder:
+        recorder.record_joints([1, 2, 3, 4, 5, 6])
+    motion_log = recording.MotionLog(path)
+    assert len(motion_log) == 102
+    np.testing.assert_allclose(motion_log[-1]["joints"], [1, 2, 3, 4, 5, 6])
+
+
+def test_stream_follows_a_file_being_recorded(tmp_path):
+    path = str(tmp_path / "teach.bin")
+    recorder = recording.MotionRecorder(path, flush_interval=0.0)
+    stop = threading.Event()
+    received = []
+
+    def read():
+        for chunk in recording.MotionLog(path).stream(follow=True, poll_interval=0.01, stop_event=stop):
+            received.extend(chunk["joints"][:, 0].tolist())
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for i in range(50):
+        recorder.record_joints([i, 0, 0, 0, 0, 0])
+        time.sleep(0.002)
+    recorder.close()
+    time.sleep(0.05)
+    stop.set()
+    reader.join(timeout=2)
+    assert received == list(range(50))
+
+
+def test_downsample_and_resample():
+    joints = np.zeros((101, 6))
+    joints[:, 0] = np.linspace(0, 10, 101)  # 每步 0.1 度
+    kept = recording.downsample(joints, 1.0)
+    assert kept[0] == 0 and kept[-1] == 100 and len(kept) == 11
+    t = np.array([0.0, 1.0, 3.0])
+    grid, q = recording.resample(t, np.array([[0] * 6, [10] * 6, [30] * 6]), 0.5)
+    np.testing.assert_allclose(grid, np.arange(0, 3.01, 0.5))
+    np.testing.assert_allclose(q[:, 0], grid * 10)
+    # 同一时刻的多条记录
+    grid, q = recording.resample(np.array([2.0, 2.0]), np.array([[0] * 6, [10] * 6]), 0.5)
+    np.testing.assert_allclose(grid, [2.0])
+    np.testing.assert_allclose(q, [[10] * 6])
+
+
+def test_record_and_play_back_through_simulator(tmp_path):
+    path = str(tmp_path / "teach.bin")
+    target = [30, 10, -10, 0, 20, 0]
+    with RobotArmSimulator(max_joint_speed=120) as simulator:
+        robot = BlxRobotArm(SocketCommunication(simulator.host, simulator.port), command_timeout=5)
+        robot.start_communication()
+        try:
+            robot.start_recording(path, rate=50, flush_interval=0.1)
+            assert json.loads(robot.set_joint_degree_synchronize(*target))["status"]
+            assert json.loads(robot.set_robot_end_tool(1, True))["status"]
+            # 异步与批量提交的 IO 命令同样录制
+            assert json.loads(robot.set_robot_end_tool_async(2, True).result(timeout=5))["status"]
+            assert robot.wait_all([robot.submit_command("set_robot_io_interface", [3, True])])["status"]
+            time.sleep(0.1)  # 录下停止后的状态
+            robot.stop_recording()
+            assert robot.telemetry is None
+
+            motion_log = recording.MotionLog(path)
+            t, joints = motion_log.joint_states()
+            assert len(t) > 5 and np.abs(joints[-1] - target).max() < 1e-3
+            assert [event[1:] for event in motion_log.io_events()] == [
+                (recording.KIND_END_TOOL, 1, True), (recording.KIND_END_TOOL, 2, True), (recording.KIND_IO, 3, True),
+            ]
+
+            for mode in ("SEQ", "INT"):
+                assert json.loads(robot.set_robot_arm_init())["status"]
+                simulator.end_tool.clear()
+                simulator.io_status.clear()
+                sent_before = len(simulator.received)
+                assert json.loads(robot.play_recording(path, mode=mode, min_joint_step=2.0, period=0.02))["status"]
+                np.testing.assert_allclose(simulator.joint_degrees(), joints[-1], atol=1e-3)
+                assert simulator.end_tool == {1: True, 2: True} and simulator.io_status == {3: True}
+                # 回放结束后恢复原来的命令执行模式
+                assert robot.robot_cmd_model == "SEQ" and simulator.mode == "SEQ"
+                modes = [message["data"][0] for message in simulator.received[sent_before:] if message["command"] == "set_robot_mode"]
+                assert modes == ([] if mode == "SEQ" else ["INT", "SEQ"])
+                moves = [message for message in simulator.received[sent_before:] if message["command"] == "set_joint_angle_all_time"]
+                assert len(moves) >= 5
+                if mode == "SEQ":
+                    assert len(moves) < len(t)  # 降采样后的路径点
+        finally:
+            robot.end_communication()
+            robot.task_executor.shutdown()
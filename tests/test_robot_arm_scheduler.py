@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+# 测试按优先级发送命令的调度队列
+import time
+import json
+import threading
+from queue import Empty
+
+import pytest
+
+from blinx_robots.robot_arm_interface import BlxRobotArm
+from blinx_robots.robot_arm_communication import SocketCommunication
+from blinx_robots.robot_arm_scheduler import CommandScheduler, PRIORITY_QUERY, PRIORITY_SAFETY, PRIORITY_STATEFUL
+from tests.test_robot_arm_interface import StandInServer
+
+
+def drain(scheduler):
+    items = []
+    while True:
+        try:
+            items.append(scheduler.get_nowait())
+        except Empty:
+            return items
+
+
+def test_priority_classes_keep_submission_order_within_class():
+    scheduler = CommandScheduler()
+    for name, priority in [("move1", "stateful"), ("query1", "query"), ("delay", "stateful"),
+                           ("io1", PRIORITY_STATEFUL), ("stop", "safety"), ("query2", PRIORITY_QUERY), ("move2", "stateful")]:
+        scheduler.put(name, priority)
+    assert drain(scheduler) == ["stop", "query1", "query2", "move1", "delay", "io1", "move2"]
+    with pytest.raises(ValueError):
+        scheduler.put("x", "urgent")
+
+
+def test_cancel_by_id_and_by_class():
+    dropped = []
+    scheduler = CommandScheduler(on_drop=lambda item, reason: dropped.append((item, reason)))
+    ids = [scheduler.put(f"move{i}", PRIORITY_STATEFUL) for i in range(5)]
+    scheduler.put("query", PRIORITY_QUERY)
+    assert scheduler.cancel(ids[1]) and not scheduler.cancel(ids[1])
+    assert scheduler.qsize() == 5 and scheduler.qsize("stateful") == 4
+    assert scheduler.cancel_class("stateful") == 4
+    assert drain(scheduler) == ["query"]
+    assert dropped[0] == ("move1", "cancelled") and len(dropped) == 5
+
+
+def test_expired_commands_are_dropped_before_sending():
+    dropped = []
+    scheduler = CommandScheduler(on_drop=lambda item, reason: dropped.append((item, reason)))
+    scheduler.put("stale", PRIORITY_STATEFUL, deadline=0.01)
+    scheduler.put("fresh", PRIORITY_STATEFUL, deadline=10)
+    time.sleep(0.02)
+    assert scheduler.get(timeout=0.1) == "fresh"
+    assert dropped == [("stale", "expired")]
+
+
+def test_blocking_get_wakes_on_put_and_deadline():
+    dropped = []
+    scheduler = CommandScheduler(on_drop=lambda item, reason: dropped.append(reason))
+    scheduler.put("late", PRIORITY_SAFETY, deadline=0.0)
+    threading.Timer(0.05, scheduler.put, args=("now", PRIORITY_QUERY)).start()
+    start = time.monotonic()
+    assert scheduler.get(timeout=1) == "now"
+    assert time.monotonic() - start < 0.5 and dropped == ["expired"]
+    with pytest.raises(Empty):
+        scheduler.get(timeout=0.01)
+
+
+def test_queries_overtake_stateful_backlog():
+    server = StandInServer(hold=1)
+    robot = BlxRobotArm(SocketCommunication('127.0.0.1', server.port), command_timeout=5)
+    try:
+        # 发送线程启动之前积压 50 条运动命令, 之后提交的查询命令应当先发送, IO 命令仍排在运动命令之后
+        moves = robot.submit_batch([("set_joint_angle_all_time", [50, i, 0, 0, 0, 0, 0]) for i in range(50)])
+        expired = robot.submit_command("set_joint_angle_all_time", [50, 0, 0, 0, 0, 0, 0], deadline=0.0)
+        io = robot.submit_command("set_robot_io_interface", [1, True])
+        query = robot.submit_command("get_joint_angle_all")
+        assert robot.cancel_command(moves[10].command_id)
+        robot.start_communication()
+
+        assert robot.wait_all([query, io])["status"]
+        assert server.received[0]["command"] == "get_joint_angle_all"
+        assert server.received[-1]["command"] == "set_robot_io_interface"
+        assert robot.get_command_response(expired) == {"command": "move_in_place", "data": False}
+        assert robot.get_command_response(moves[10]) == {"command": "move_in_place", "data": False}
+        assert all(robot.get_command_response(move)["data"] for index, move in enumerate(moves) if index != 10)
+        sent_moves = [message["data"][1] for message in server.received[1:-1]]
+        assert sent_moves == [i for i in range(50) if i != 10]
+    finally:
+        robot.end_communication()
+        robot.task_executor.shutdown()
+
+
+def test_async_moves_delay_and_io_keep_submission_order():
+    server = StandInServer(hold=1)
+    robot = BlxRobotArm(SocketCommunication('127.0.0.1', server.port), command_timeout=5)
+    try:
+        # SEQ 模式下的一段程序: 运动 -> 延时 -> 打开气泵 -> 运动 -> 打开 IO -> 切换模式, 中间穿插查询
+        first = robot.set_joint_degree_synchronize_async(10, 0, 0, 0, 0, 0)
+        assert json.loads(robot.set_time_delay(500))["status"]
+        tool = robot.set_robot_end_tool_async(1, True)
+        query = robot.get_joint_degree_all_async()
+        second = robot.set_joint_degree_synchronize_async(20, 0, 0, 0, 0, 0)
+        io = robot.set_robot_io_status_async(2, True)
+        mode = robot.set_robot_cmd_mode_async("INT")
+        robot.start_communication()
+
+        for future in (first, tool, second, io, mode):
+            assert json.loads(future.result(timeout=5))["status"]
+        assert query.result(timeout=5)["data"] == [1, 2, 3, 4, 5, 6]
+        assert [message["command"] for message in server.received] == [
+            "get_joint_angle_all", "set_joint_angle_all_time", "set_time_delay", "set_end_tool",
+            "set_joint_angle_all_time", "set_robot_io_interface", "set_robot_mode",
+        ]
+    finally:
+        robot.end_communication()
+        robot.task_executor.shutdown()
+
+
+def test_emergency_stop_cancels_pending_motion():
+    server = StandInServer(hold=1)
+    robot = BlxRobotArm(SocketCommunication('127.0.0.1', server.port), command_timeout=5)
+    try:
+        robot.communication_strategy.get_connection()  # 急停只通过已建立的连接发送
+        moves = robot.submit_batch([("set_joint_angle_all_time", [50, i, 0, 0, 0, 0, 0]) for i in range(20)])
+        assert json.loads(robot.set_robot_arm_emergency_stop())["status"]
+        assert robot.command_queue.empty()
+        assert robot.wait_all(moves, timeout=1)["failed_index"] == 0
+        robot.start_communication()
+        assert json.loads(robot.set_robot_io_status(1, True))["status"]
+        assert [message["command"] for message in server.received] == ["set_joint_emergency_stop", "set_robot_io_interface"]
+    finally:
+        robot.end_communication()
+        robot.task_executor.shutdown()
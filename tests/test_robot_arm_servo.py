@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# 测试笛卡尔实时伺服
+import time
+from queue import Empty
+
+import numpy as np
+
+from blinx_robots import robot_arm_kinematics as kinematics
+from blinx_robots.robot_arm_interface import BlxRobotArm
+from blinx_robots.robot_arm_communication import SocketCommunication
+from blinx_robots.robot_arm_module import BlinxRobotArm
+from blinx_robots.robot_arm_servo import CartesianServo, servo_step
+from blinx_robots.robot_arm_simulator import RobotArmSimulator
+
+START = [0, 20, -20, 0, 30, 0]
+
+
+def test_servo_step_follows_twist_and_respects_limits():
+    robot = BlinxRobotArm()
+    kernel = kinematics.chain_kernel(robot)
+    qlim, speed = np.asarray(robot.qlim), np.radians(np.full(6, 90.0))
+    q = np.radians(START)
+    twist = np.array([0.02, -0.01, 0.03, 0.0, 0.1, 0.0])
+    dq = servo_step(kernel, q, twist, 0.01, qlim, speed, damping=1e-4)
+    np.testing.assert_allclose(kernel.jacob0(q) @ dq / 0.01, twist, atol=1e-6)
+
+    # 速度超限时整体等比例缩小, 方向不变
+    fast = servo_step(kernel, q, twist * 100, 0.01, qlim, speed, damping=1e-4)
+    assert np.max(np.abs(fast) / (speed * 0.01)) <= 1 + 1e-9
+    np.testing.assert_allclose(fast / np.linalg.norm(fast), dq / np.linalg.norm(dq), atol=1e-6)
+
+    # 关节 3 处在运动方向上的限位时锁定, 其余关节继续运动
+    q_limit = q.copy()
+    q_limit[2] = qlim[1, 2] if dq[2] > 0 else qlim[0, 2]
+    dq_limit = servo_step(kernel, q_limit, twist, 0.01, qlim, speed, damping=1e-4)
+    assert dq_limit[2] == 0 and np.any(dq_limit)
+
+
+def test_late_targets_are_dropped_instead_of_queued():
+    robot = BlxRobotArm(None)  # 未启动发送线程, 关节目标只能在队列中等待
+    servo = CartesianServo(robot, rate=100)
+    assert servo.start(START)
+    try:
+        assert not servo.set_twist([0, 0, 0.01, 0, 0, 0], timestamp=time.monotonic() - 1)
+        for _ in range(20):
+            assert servo.set_twist([0, 0, 0.01, 0, 0, 0])
+            time.sleep(0.01)
+        servo.set_twist([0, 0, 0, 0, 0, 0])
+        time.sleep(0.05)
+    finally:
+        servo.stop()
+    sent = servo.sent_count
+    try:
+        while True:
+            robot.command_queue.get(timeout=0)
+    except Empty:
+        pass
+    assert servo.stale_count == 1 and sent >= 10
+    assert servo.late_count == sent
+
+
+def test_servo_streams_int_targets_to_simulator():
+    with RobotArmSimulator(time_scale=0.0) as simulator:
+        robot = BlxRobotArm(SocketCommunication(simulator.host, simulator.port), command_timeout=5)
+        robot.start_communication()
+        try:
+            robot.set_joint_degree_synchronize(*START)
+            start_z = kinematics.positive_solution(robot.blinx_robot_arm, simulator.joint_degrees())[2]
+            servo = robot.start_servo(rate=100)
+            assert servo is not None and simulator.mode == "INT"
+            deadline = time.monotonic() + 0.4
+            while time.monotonic() < deadline:
+                robot.servo_twist(0, 0, 0.05)  # 相机以 50 Hz 更新速度
+                time.sleep(0.02)
+            robot.servo_twist(0, 0, 0)
+            time.sleep(0.05)
+            robot.stop_servo()
+            end_pose = kinematics.positive_solution(robot.blinx_robot_arm, simulator.joint_degrees())
+        finally:
+            robot.end_communication()
+            robot.task_executor.shutdown()
+
+    assert simulator.mode == "SEQ"
+    assert 0.015 < end_pose[2] - start_z < 0.03
+    # 控制周期只做计算并放入发送队列, 不等待机械臂响应; 宽松的上限只用于发现阻塞等待,
+    # 单个周期的计算耗时见 benchmarks/run_benchmarks.py 中的 servo_step_us_median
+    assert servo.sent_count >= 30 and servo.max_cycle_time < 0.25
+
+
+def test_failed_servo_start_restores_the_previous_mode():
+    with RobotArmSimulator(time_scale=0.0) as simulator:
+        robot = BlxRobotArm(SocketCommunication(simulator.host, simulator.port), command_timeout=5)
+        robot.start_communication()
+        try:
+            robot._current_joint_degree = lambda: None  # 读取当前关节角度失败
+            assert robot.start_servo(rate=100) is None
+            assert robot.servo is None and robot._servo_previous_mode is None
+            assert robot.robot_cmd_model == "SEQ" and simulator.mode == "SEQ"
+        finally:
+            robot.end_communication()
+            robot.task_executor.shutdown()
+
+
+def test_servo_starts_from_a_numpy_joint_array():
+    with RobotArmSimulator(time_scale=0.0) as simulator:
+        robot = BlxRobotArm(SocketCommunication(simulator.host, simulator.port), command_timeout=5)
+        robot.start_communication()
+        try:
+            servo = CartesianServo(robot, 100)
+            assert servo.start(np.array(START, dtype=float))
+            servo.stop()
+            np.testing.assert_allclose(np.degrees(servo.q), START)
+        finally:
+            robot.end_communication()
+            robot.task_executor.shutdown()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# 测试机械臂模拟器与 BlxRobotArm 的协议兼容性
+import json
+import time
+
+import pytest
+
+from blinx_robots.robot_arm_interface import BlxRobotArm
+from blinx_robots.robot_arm_communication import SocketCommunication
+from blinx_robots.robot_arm_simulator import RobotArmSimulator
+
+
+@pytest.fixture
+def connect():
+    opened = []
+
+    def _connect(**options):
+        simulator = RobotArmSimulator(**options)
+        host, port = simulator.start_in_thread()
+        robot = BlxRobotArm(SocketCommunication(host, port), command_timeout=5)
+        robot.start_communication()
+        opened.append((simulator, robot))
+        return simulator, robot
+
+    yield _connect
+    for simulator, robot in opened:
+        robot.end_communication()
+        robot.task_executor.shutdown()
+        simulator.stop_thread()
+
+
+def test_seq_motion_follows_kinematics(connect):
+    simulator, robot = connect(max_joint_speed=900.0)
+    start = time.perf_counter()
+    assert json.loads(robot.set_joint_degree_synchronize(90, 0, -45, 0, 30, 0, speed_percentage=100))["status"]
+    assert 0.08 < time.perf_counter() - start < 0.5
+    assert robot.get_joint_degree_all()["data"] == [90, 0, -45, 0, 30, 0]
+
+    assert json.loads(robot.set_joint_degree_by_number(2, 100, 10))["status"]
+    assert robot.get_joint_degree_all()["data"] == [90, 10, -45, 0, 30, 0]
+    assert json.loads(robot.set_robot_end_tool(1, True))["status"] and simulator.end_tool == {1: True}
+
+
+def test_fragmented_and_coalesced_replies(connect):
+    simulator, robot = connect(time_scale=0.0, latency=0.002, jitter=0.003, fragment_size=7, coalesce_window=0.005, seed=1)
+    commands = [("set_joint_angle_all_time", [50, i, 0, 0, 0, 0, 0]) for i in range(50)]
+    commands += [("set_time_delay", [10]), ("set_robot_io_interface", [2, True]), ("get_joint_angle_all", None)]
+    result = robot.wait_all(robot.submit_batch(commands))
+    assert result["status"]
+    assert result["data"][-1]["data"][0] in range(50)
+    assert len(simulator.received) == len(commands)
+
+
+def test_int_mode_replaces_targets_and_emergency_stop(connect):
+    simulator, robot = connect(max_joint_speed=90.0)
+    assert json.loads(robot.set_robot_cmd_mode("INT"))["status"] and robot.robot_cmd_model == "INT"
+    first = robot.set_joint_degree_synchronize_async(90, 0, 0, 0, 0, 0, speed_percentage=100)
+    second = robot.set_joint_degree_synchronize_async(-90, 0, 0, 0, 0, 0, speed_percentage=100)
+    assert json.loads(first.result(timeout=1))["status"]
+    time.sleep(0.1)
+    robot.set_robot_arm_emergency_stop()
+    assert json.loads(second.result(timeout=1))["status"] is False
+    stopped_at = robot.get_joint_degree_all()["data"][0]
+    assert -90 < stopped_at < 0
+    assert json.loads(robot.set_joint_degree_synchronize(0, 0, 0, 0, 0, 0))["status"] is False
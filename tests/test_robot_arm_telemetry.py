@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# 测试关节状态采集
+import time
+
+import numpy as np
+
+from blinx_robots.robot_arm_telemetry import JointStateBuffer, JointTelemetry
+
+
+def test_ring_buffer_wraps_and_keeps_order():
+    buffer = JointStateBuffer(capacity=4)
+    assert buffer.latest() is None and len(buffer.history()[0]) == 0
+    for i in range(6):
+        buffer.append([i] * 6, timestamp=float(i))
+    timestamps, joints = buffer.history()
+    np.testing.assert_array_equal(timestamps, [2, 3, 4, 5])
+    np.testing.assert_array_equal(joints[:, 0], [2, 3, 4, 5])
+    np.testing.assert_array_equal(buffer.history(2)[0], [4, 5])
+    assert buffer.latest() == (5.0, (5.0,) * 6)
+
+
+def test_window_query():
+    buffer = JointStateBuffer(capacity=16)
+    for i in range(10):
+        buffer.append([i] * 6, timestamp=i * 0.1)
+    timestamps, joints = buffer.window(0.25, now=0.9)
+    np.testing.assert_allclose(timestamps, [0.7, 0.8, 0.9])
+    assert joints.shape == (3, 6)
+
+
+def test_background_polling():
+    counter = iter(range(1000))
+    telemetry = JointTelemetry(lambda: [next(counter)] * 6, rate=200.0, capacity=8)
+    telemetry.start()
+    time.sleep(0.2)
+    telemetry.stop()
+    assert not telemetry.running
+    assert len(telemetry.buffer) == 8
+    latest = telemetry.latest()
+    assert latest[0] >= 20 and latest == [latest[0]] * 6
+    assert telemetry.latest(max_age=0.0) is None
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+# 测试同步梯形 / S 形关节轨迹
+import json
+import time
+
+import numpy as np
+import pytest
+
+from blinx_robots.robot_arm_interface import BlxRobotArm
+from blinx_robots.robot_arm_communication import SocketCommunication
+from blinx_robots.robot_arm_simulator import RobotArmSimulator
+from blinx_robots.robot_arm_trajectory import plan_joint_trajectory
+
+
+def check_limits(trajectory, max_velocity, max_acceleration, max_jerk=None):
+    t = np.linspace(0, trajectory.duration, 20001)
+    q = trajectory.positions(t)
+    np.testing.assert_allclose(q[[0, -1]], [trajectory.q0, trajectory.q1], atol=1e-9)
+    np.testing.assert_allclose(np.gradient(q, t, axis=0), trajectory.velocities(t), atol=1e-2 * max(1, np.max(max_velocity)))
+    assert np.all(np.abs(trajectory.velocities(t)) <= np.asarray(max_velocity) * (1 + 1e-9))
+    a = trajectory.accelerations(t)
+    assert np.all(np.abs(a) <= np.asarray(max_acceleration) * (1 + 1e-9))
+    if max_jerk is not None:
+        jerk = np.abs(np.diff(a, axis=0)) / (t[1] - t[0])
+        assert np.all(jerk <= np.asarray(max_jerk) * (1 + 1e-6))
+    return q
+
+
+def test_trapezoidal_profile_is_time_synchronized():
+    trajectory = plan_joint_trajectory(np.zeros(6), [90, 30, -45, 0, 0, 10], 60, 120)
+    # 关节 1 最受限: 加速 0.5 秒 (15 度), 匀速 1 秒 (60 度), 减速 0.5 秒
+    assert trajectory.duration == pytest.approx(2.0)
+    q = check_limits(trajectory, 60, 120)
+    # 所有关节同时到达, 关节空间中为直线
+    np.testing.assert_allclose(q[:, 1] / 30, q[:, 0] / 90, atol=1e-12)
+
+    short = plan_joint_trajectory(np.zeros(6), [10, 0, 0, 0, 0, 0], 60, 120)
+    assert short.duration == pytest.approx(2 * np.sqrt(10 / 120))
+    check_limits(short, 60, 120)
+
+
+def test_s_curve_profile_respects_jerk_and_is_slower_than_trapezoid():
+    q0, q1 = np.zeros(6), [90, 30, -45, 20, 0, 10]
+    velocity, acceleration = [60, 60, 60, 90, 90, 90], [120, 120, 120, 240, 240, 240]
+    trapezoid = plan_joint_trajectory(q0, q1, velocity, acceleration)
+    for jerk in (200.0, 2000.0, 1e5):
+        s_curve = plan_joint_trajectory(q0, q1, velocity, acceleration, max_jerk=jerk)
+        check_limits(s_curve, velocity, acceleration, jerk)
+        assert s_curve.duration >= trapezoid.duration - 1e-9
+    assert s_curve.duration == pytest.approx(trapezoid.duration, rel=1e-2)
+    for distance in (0.5, 5.0, 50.0):
+        check_limits(plan_joint_trajectory(q0, [distance, 0, 0, 0, 0, 0], 60, 120, max_jerk=500), 60, 120, 500)
+
+
+def test_sampling_and_zero_move():
+    trajectory = plan_joint_trajectory(np.zeros(6), [30, 0, 0, 0, 0, 0], max_jerk=1000)
+    t, q = trajectory.sample(0.02)
+    assert t[-1] == trajectory.duration and np.all(np.diff(t) > 0) and np.all(np.diff(t) <= 0.02 + 1e-12)
+    np.testing.assert_allclose(q[-1], trajectory.q1)
+    still = plan_joint_trajectory([1, 2, 3, 4, 5, 6], [1, 2, 3, 4, 5, 6])
+    assert still.duration == 0.0
+    np.testing.assert_allclose(still.sample(0.02)[1], [[1, 2, 3, 4, 5, 6]])
+    # 起点可以是 numpy 数组, 不需要连接机械臂
+    planned = BlxRobotArm(None).plan_joint_trajectory(30, 0, 0, 0, 0, 0, start=np.zeros(6), max_jerk=1000)
+    assert planned.duration == trajectory.duration
+
+
+def test_streamed_move_takes_the_predicted_duration():
+    with RobotArmSimulator(time_scale=0.0) as simulator:
+        robot = BlxRobotArm(SocketCommunication(simulator.host, simulator.port), command_timeout=5)
+        robot.start_communication()
+        try:
+            assert json.loads(robot.set_robot_cmd_mode("INT"))["status"]
+            trajectory = robot.plan_joint_trajectory(20, 10, -10, 0, 15, 0, max_velocity=90, max_acceleration=360, max_jerk=3000)
+            start = time.perf_counter()
+            future = robot.move_joint_trajectory_async(trajectory, period=0.02)
+            assert json.loads(future.result(timeout=5))["status"]
+            elapsed = time.perf_counter() - start
+        finally:
+            robot.end_communication()
+            robot.task_executor.shutdown()
+    assert trajectory.duration == pytest.approx(elapsed, abs=0.05)
+    np.testing.assert_allclose(simulator.joint_degrees(), [20, 10, -10, 0, 15, 0], atol=1e-3)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# 测试发送前的轨迹检查
+import json
+import time
+
+import numpy as np
+
+from blinx_robots import robot_arm_kinematics as kinematics
+from blinx_robots.robot_arm_interface import BlxRobotArm
+from blinx_robots.robot_arm_module import BlinxRobotArm
+from blinx_robots.robot_arm_servo import CartesianServo
+from blinx_robots.robot_arm_validation import TrajectoryValidator, VALID
+
+
+def test_joint_limit_and_speed_report_first_offending_waypoint():
+    robot = BlinxRobotArm()
+    trajectory = np.zeros((100, 6))
+    trajectory[:, 0] = np.linspace(0, 99, 100)  # 每步 1 度
+    validator = TrajectoryValidator(robot, max_joint_speed=[20, 20, 20, 20, 20, 20])
+    assert validator.validate_joints(trajectory, period=0.1) == VALID
+
+    trajectory[70, 2] = 60  # 关节 3 上限 45 度, 同时产生跳变
+    trajectory[40, 4] = 5
+    assert validator.validate_joints(trajectory, period=0.1) == (False, 40, 5, "joint_speed")
+    assert validator.validate_joints(trajectory) == (False, 70, 3, "joint_limit")
+    assert validator.validate_joints(trajectory[1:], period=0.1, start=[-5, 0, 0, 0, 0, 0]) == (False, 0, 1, "joint_speed")
+
+
+def test_tcp_height_and_keep_out_boxes_use_batch_fk():
+    robot = BlinxRobotArm()
+    q = np.random.default_rng(1).uniform(np.degrees(robot.qlim[0]), np.degrees(robot.qlim[1]), size=(2000, 6))
+    z = kinematics.batch_positive_solution(robot, q)[:, 2]
+    result = TrajectoryValidator(robot, min_tcp_height=0.05).validate_joints(q)
+    assert (result.index, result.joint, result.reason) == (int(np.argmax(z < 0.05)), None, "tcp_height")
+
+    home = kinematics.batch_positive_solution(robot, np.zeros((1, 6)))[0, :3]
+    box = (home - 0.01, home + 0.01)
+    trajectory = np.zeros((5, 6))
+    trajectory[:3, 0] = [90, 60, 30]
+    assert TrajectoryValidator(robot, keep_out_boxes=[box]).validate_joints(trajectory) == (False, 3, None, "keep_out")
+
+
+def test_validate_poses_reports_unreachable_and_workspace():
+    robot = BlinxRobotArm()
+    poses = kinematics.batch_positive_solution(robot, np.column_stack([np.linspace(0, 20, 5), np.zeros((5, 5))]))
+    validator = TrajectoryValidator(robot, min_tcp_height=0.0)
+    assert validator.validate_poses(poses).valid
+    poses[3, :3] = [2.0, 0.0, 0.2]
+    assert validator.validate_poses(poses) == (False, 3, None, "unreachable")
+    poses[1, 2] = -0.1
+    assert validator.validate_poses(poses) == (False, 1, None, "tcp_height")
+
+
+def test_invalid_stream_is_rejected_before_sending():
+    # 未建立连接, 命令若被放入发送队列会留在队列中
+    robot = BlxRobotArm(None)
+    robot.enable_trajectory_validation(max_joint_speed=30)
+    trajectory = np.zeros((10, 6))
+    trajectory[6, 1] = 2
+    assert json.loads(robot.stream_joint_trajectory(trajectory, period=0.05)) == {
+        "command": "stream_joint_trajectory", "status": False, "failed_index": 6, "reason": "joint_speed"}
+    assert json.loads(robot.set_joint_degree_synchronize(0, 80, 0, 0, 0, 0))["status"] is False
+    assert json.loads(robot.validate_trajectory(trajectory, period=0.1))["status"]
+    assert robot.command_queue.empty()
+
+
+def test_every_joint_target_path_goes_through_the_check():
+    robot = BlxRobotArm(None)
+    robot.enable_trajectory_validation(max_joint_speed=30)
+    assert json.loads(robot.set_joint_degree_synchronize_async(0, 80, 0, 0, 0, 0).result(timeout=0))["status"] is False
+    futures = robot.submit_batch([("set_joint_angle_all_time", [50, 10, 0, 0, 0, 0, 0]),
+                                  ("set_joint_angle_all", [50, 0, 80, 0, 0, 0, 0])])
+    assert futures[0].command_id is not None and futures[1].command_id is None
+    assert robot.get_command_response(futures[1], timeout=0)["data"] is False
+    # 单关节目标与最近一次发出的关节目标组合后检查
+    assert json.loads(robot.set_joint_degree_by_number(2, 50, 80))["status"] is False
+    assert robot.command_queue.qsize() == 1
+
+    # 流式发送以最近一次发出的关节目标为起点, 检查到第一个路径点的跳变
+    trajectory = np.zeros((5, 6))
+    assert json.loads(robot.stream_joint_trajectory(trajectory, period=0.05))["failed_index"] == 0
+    assert robot.command_queue.qsize() == 1
+
+
+def test_servo_targets_are_checked_and_held_at_the_boundary():
+    robot = BlxRobotArm(None)
+    start = [0, 20, -20, 0, 30, 0]
+    z0 = kinematics.batch_positive_solution(robot.blinx_robot_arm, [start])[0, 2]
+    robot.enable_trajectory_validation(min_tcp_height=z0 - 0.005)
+    servo = CartesianServo(robot, rate=100, twist_timeout=1.0)
+    assert servo.start(start)
+    try:
+        servo.set_twist([0, 0, -0.05, 0, 0, 0])
+        time.sleep(0.3)
+    finally:
+        servo.stop()
+    z = kinematics.batch_positive_solution(robot.blinx_robot_arm, [servo.joint_target()])[0, 2]
+    assert servo.rejected_count > 0 and z0 - 0.005 <= z < z0 - 0.003
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+# 测试可达空间索引
+import json
+
+import numpy as np
+import pytest
+
+from blinx_robots import robot_arm_kinematics as kinematics
+from blinx_robots import robot_arm_workspace as workspace
+from blinx_robots.robot_arm_interface import BlxRobotArm
+from blinx_robots.robot_arm_module import BlinxRobotArm
+
+
+@pytest.fixture(scope="module")
+def index_file(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("workspace") / "workspace.npy")
+    workspace.build_workspace_index(BlinxRobotArm(), path, samples=400_000, voxel_size=0.02, seed=0)
+    return path
+
+
+def test_approach_bins_match_scalar_path():
+    rpy = np.random.default_rng(2).uniform(-np.pi, np.pi, size=(500, 3))
+    directions = np.array([kinematics.pose_to_transform([0, 0, 0, *angles])[:3, 2] for angles in rpy])
+    bins = workspace.approach_bins(directions)
+    assert bins.tolist() == [workspace._approach_bin(*angles) for angles in rpy]
+    assert 0 <= bins.min() and bins.max() < workspace.ELEVATION_BINS * workspace.AZIMUTH_BINS
+
+
+def test_index_is_memory_mapped_and_covers_sampled_poses(index_file):
+    index = workspace.WorkspaceIndex.load(index_file)
+    assert isinstance(index.grid, np.memmap)
+    robot = BlinxRobotArm()
+    q = np.random.default_rng(7).uniform(robot.qlim[0], robot.qlim[1], size=(5000, 6))
+    poses = kinematics.batch_positive_solution(robot, np.degrees(q))
+    assert index.filter_poses(poses, check_orientation=False).mean() > 0.995
+    assert np.array_equal(index.filter_poses(poses[:200]), [index.pose_reachable(pose) for pose in poses[:200]])
+    assert not index.reachable(1.0, 0.0, 0.2) and index.orientation_coverage(1.0, 0.0, 0.2) == 0.0
+    # 单次查询耗时见 benchmarks/run_benchmarks.py 中的 workspace_query_us_median
+
+
+def test_unreachable_target_is_rejected_without_ik(index_file):
+    robot = BlxRobotArm(None)
+    robot.enable_workspace_index(index_file)
+    robot.enable_metrics()
+    assert robot.is_reachable(*kinematics.positive_solution(robot.blinx_robot_arm, [0, 10, 10, 0, 0, 0]))
+    result = json.loads(robot.set_joint_degree_by_coordinate(1.0, 0.0, 0.2, 0, 0, 0))
+    assert result == {"command": "set_joint_degree_by_coordinate", "status": False}
+    assert robot.get_metrics()["ik"]["seconds"]["count"] == 0 and robot.command_queue.empty()